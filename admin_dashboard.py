@@ -0,0 +1,133 @@
+"""
+관리자 대시보드 회원 목록 (검색 + 커서 기반 페이지네이션)
+
+회원 전체를 읽어 렌더링하지 않고 한 페이지만 읽습니다.
+- 정렬: created_at(가입일) / total_visits(방문 횟수), (정렬 값, id) 키셋 커서로 OFFSET 없이 인덱스 범위 스캔
+- 검색: 이름 / 이메일 / 전화번호 접두사 검색 (LIKE 대신 범위 조건이라 각 컬럼 인덱스 사용, 일치한 행만 정렬)
+통계(성별, 경험, 레이팅, 방문 구간별 회원 수)는 user_stats 롤업 테이블에서 읽습니다 (user_stats.py).
+"""
+import base64
+import json
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from database import User
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+SORT_CREATED_AT = "created_at"
+SORT_TOTAL_VISITS = "total_visits"
+SORT_COLUMNS = {SORT_CREATED_AT: User.created_at, SORT_TOTAL_VISITS: User.total_visits}
+ORDERS = ("desc", "asc")
+
+_PHONE_QUERY = re.compile(r"^[0-9-]+$")
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(user: User, sort: str, order: str) -> str:
+    """마지막 회원의 (정렬 값, id)를 정렬 조건과 함께 불투명한 커서 문자열로 인코딩"""
+    value = getattr(user, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, order, value, user.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str):
+    """커서 문자열을 (정렬 값, id)로 디코딩 (다른 정렬 조건으로 만든 커서면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort == SORT_CREATED_AT:
+            value = datetime.fromisoformat(value)
+        else:
+            value = int(value)
+        user_id = int(user_id)
+    except (ValueError, TypeError):
+        raise _invalid("Invalid pagination cursor")
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise _invalid("Pagination cursor does not match sort order")
+    return value, user_id
+
+
+def search_column(q: str):
+    """
+    검색어 형태로 검색할 컬럼과 접두사를 결정
+    - "@" 포함: 이메일
+    - 숫자/하이픈만: 전화번호 (숫자만 입력하면 010-1234-5678 형식으로 하이픈 삽입)
+    - 그 외: 이름
+    """
+    if "@" in q:
+        return User.email, q
+    if _PHONE_QUERY.match(q):
+        if "-" not in q:
+            q = "-".join(part for part in (q[:3], q[3:7], q[7:]) if part)
+        return User.phone_number, q
+    return User.name, q
+
+
+def prefix_filter(column, prefix: str):
+    """column LIKE 'prefix%'와 같은 범위 조건 (인덱스 범위 스캔 가능)"""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+def list_users(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = SORT_CREATED_AT,
+    order: str = "desc",
+) -> Tuple[List[User], Optional[str]]:
+    """
+    회원 한 페이지를 조회합니다.
+
+    Args:
+        limit: 페이지 크기 (1 ~ MAX_PAGE_SIZE)
+        cursor: 이전 페이지의 next_cursor (같은 sort/order로 만든 것)
+        q: 이름 / 이메일 / 전화번호 접두사
+        sort: "created_at" (가입일) / "total_visits" (방문 횟수)
+        order: "desc" (기본) / "asc"
+
+    Returns:
+        (회원 리스트, 다음 페이지 커서 또는 None)
+    """
+    if sort not in SORT_COLUMNS:
+        raise _invalid("sort must be 'created_at' or 'total_visits'")
+    if order not in ORDERS:
+        raise _invalid("order must be 'desc' or 'asc'")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    column = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    query = db.query(User)
+    q = (q or "").strip()
+    if q:
+        query = query.filter(prefix_filter(*search_column(q)))
+
+    if cursor:
+        after_value, after_id = decode_cursor(cursor, sort, order)
+        if descending:
+            query = query.filter(or_(column < after_value, and_(column == after_value, User.id < after_id)))
+        else:
+            query = query.filter(or_(column > after_value, and_(column == after_value, User.id > after_id)))
+
+    if descending:
+        query = query.order_by(column.desc(), User.id.desc())
+    else:
+        query = query.order_by(column, User.id)
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부 판단
+    users = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(users[limit - 1], sort, order) if len(users) > limit else None
+    return users[:limit], next_cursor
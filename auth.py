@@ -1,14 +1,21 @@
 """
 JWT 토큰 기반 인증 시스템
+
+검증된 토큰은 짧은 TTL 동안 AuthenticatedUser(사용자 컬럼 스냅샷)로 캐시되어
+같은 토큰의 반복 요청은 HMAC 검증과 사용자 조회 없이 처리됩니다.
+사용자 정보가 바뀌는 경로(/register, 소셜 로그인)는 invalidate_user()를 호출합니다.
 """
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 import jwt
 from jwt.exceptions import InvalidTokenError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import User, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import User, get_async_db
 import os
 from dotenv import load_dotenv
 
@@ -19,10 +26,124 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-product
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7일
 
+# 인증 캐시 설정 (TTL 0이면 캐시 비활성화)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "4096"))
+
 # HTTPBearer 스키마 (헤더에서 토큰 추출)
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    인증된 사용자 스냅샷 (세션에 묶이지 않는 가벼운 principal)
+    
+    User ORM 객체와 같은 컬럼 속성을 가지므로 UserOut.model_validate()에 그대로 쓸 수 있습니다.
+    """
+    id: int
+    name: str
+    phone_number: Optional[str]
+    email: str
+    gender: str
+    birth_year: Optional[int]
+    chess_experience: str
+    chess_rating: Optional[str]
+    total_visits: int
+    social_provider: Optional[str]
+    social_id: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            name=user.name,
+            phone_number=user.phone_number,
+            email=user.email,
+            gender=user.gender,
+            birth_year=user.birth_year,
+            chess_experience=user.chess_experience,
+            chess_rating=user.chess_rating,
+            total_visits=user.total_visits,
+            social_provider=user.social_provider,
+            social_id=user.social_id,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class PrincipalCache:
+    """토큰 -> AuthenticatedUser LRU + TTL 캐시 (토큰 만료 시각을 넘겨 보관하지 않음)"""
+
+    def __init__(self, ttl_seconds: float = AUTH_CACHE_TTL_SECONDS, max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # token -> (expires_at, principal)
+        self._entries: "OrderedDict[str, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        # user_id -> 해당 사용자의 캐시된 토큰들 (무효화용)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[AuthenticatedUser]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.time():
+            self._remove(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return principal
+
+    def set(self, token: str, principal: AuthenticatedUser, token_exp: Optional[float] = None):
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        self._entries[token] = (expires_at, principal)
+        self._entries.move_to_end(token)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._remove(oldest)
+
+    def invalidate_user(self, user_id: int):
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_user.get(entry[1].id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry[1].id]
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
+
+
+def invalidate_user(user_id: int):
+    """사용자 정보가 바뀌었을 때 캐시된 principal 제거"""
+    principal_cache.invalidate_user(user_id)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     JWT 액세스 토큰 생성
@@ -77,53 +198,71 @@ def verify_token(token: str) -> dict:
         )
 
 
+async def _authenticate(token: str, db: AsyncSession) -> Optional[AuthenticatedUser]:
+    """
+    토큰으로 사용자 principal 조회 (캐시 우선)
+    
+    Returns:
+        AuthenticatedUser 또는 None (토큰에 user_id가 없거나 사용자가 없는 경우)
+    
+    Raises:
+        HTTPException: 토큰이 유효하지 않거나 만료된 경우
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = verify_token(token)
+    user_id: int = payload.get("user_id")
+    if user_id is None:
+        return None
+
+    # 데이터베이스에서 사용자 조회 (비동기, 이벤트 루프를 막지 않음)
+    user = await db.get(User, user_id)
+    if user is None:
+        return None
+
+    principal = AuthenticatedUser.from_user(user)
+    principal_cache.set(token, principal, payload.get("exp"))
+    return principal
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
     """
     현재 인증된 사용자 가져오기 (의존성 주입용)
     
     Authorization 헤더에서 Bearer 토큰을 추출하고 검증한 후,
     해당 사용자를 데이터베이스에서 조회하여 반환합니다.
+    같은 토큰은 AUTH_CACHE_TTL_SECONDS 동안 캐시에서 바로 반환합니다.
     
     Args:
         credentials: HTTP Authorization 헤더 (Bearer 토큰)
-        db: 데이터베이스 세션
+        db: 비동기 데이터베이스 세션
     
     Returns:
-        인증된 User 객체
+        인증된 사용자 (AuthenticatedUser)
     
     Raises:
         HTTPException: 토큰이 유효하지 않거나 사용자가 존재하지 않는 경우
     """
-    token = credentials.credentials
-    payload = verify_token(token)
-    
-    user_id: int = payload.get("user_id")
-    if user_id is None:
+    principal = await _authenticate(credentials.credentials, db)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 데이터베이스에서 사용자 조회
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return user
+    return principal
 
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[AuthenticatedUser]:
     """
     선택적 인증 (토큰이 있으면 사용자 반환, 없으면 None 반환)
     
@@ -132,24 +271,16 @@ async def get_current_user_optional(
     
     Args:
         credentials: HTTP Authorization 헤더 (Bearer 토큰, 선택)
-        db: 데이터베이스 세션
+        db: 비동기 데이터베이스 세션
     
     Returns:
-        인증된 User 객체 또는 None
+        인증된 사용자 (AuthenticatedUser) 또는 None
     """
     if credentials is None:
         return None
     
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        user_id: int = payload.get("user_id")
-        
-        if user_id is None:
-            return None
-        
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
+        return await _authenticate(credentials.credentials, db)
     except HTTPException:
         return None
 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+관리자 대시보드 렌더링 벤치마크 (회원 수별)
+
+기존 방식 (전체 회원 조회 + 전체 행 렌더링)과
+페이지 방식 (키셋 페이지 1개 + user_stats 롤업 통계)을 회원 수를 늘려가며 비교합니다.
+통계를 매번 users GROUP BY로 계산하는 경우도 함께 측정합니다.
+
+Usage:
+    python benchmarks/bench_admin_dashboard.py [--sizes 1000,10000,100000] [--legacy-max 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.templating import Jinja2Templates
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from admin_dashboard import list_users
+from database import Base, User
+from user_stats import REBUILD_STATEMENTS, read_stats, rebuild
+
+INSERT_BATCH = 50_000
+GENDERS = ("MALE", "FEMALE", "OTHER")
+EXPERIENCES = ("NO_BUT_WANT_TO_LEARN", "KNOW_RULES_ONLY", "OCCASIONALLY_PLAY", "PLAY_WELL")
+RATINGS = (None, "I_DONT_KNOW", "UNDER_1000", "BETWEEN_1000_1500", "BETWEEN_1500_2000", "OVER_2000")
+
+templates = Jinja2Templates(directory=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                   "templates"))
+
+
+def seed(session_factory, start: int, stop: int):
+    """회원 [start, stop) 추가 (Core bulk insert 후 롤업 재집계)"""
+    rng = random.Random(start)
+    base = datetime(2020, 1, 1)
+    session = session_factory()
+    for offset in range(start, stop, INSERT_BATCH):
+        session.execute(insert(User), [
+            dict(name=f"User {i}", phone_number=f"010-{i:08d}", email=f"user{i}@example.com",
+                 gender=rng.choice(GENDERS), chess_experience=rng.choice(EXPERIENCES),
+                 chess_rating=rng.choice(RATINGS), total_visits=1 + int(rng.expovariate(0.3)),
+                 created_at=base + timedelta(minutes=i), updated_at=base)
+            for i in range(offset, min(stop, offset + INSERT_BATCH))
+        ])
+    session.commit()
+    rebuild(session)
+    session.close()
+
+
+def render(users, stats) -> int:
+    html = templates.get_template("dashboard.html").render(
+        {"request": None, "users": users, "stats": stats, "next_url": None, "q": "", "sort": "created_at",
+         "order": "desc", "code": None})
+    return len(html)
+
+
+def timed(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="이보다 많으면 기존 방식은 생략")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        def legacy():
+            session = session_factory()
+            users = session.query(User).all()
+            render(users, read_stats(session))
+            session.close()
+
+        def paged(**params):
+            session = session_factory()
+            users, _ = list_users(session, **params)
+            render(users, read_stats(session))
+            session.close()
+
+        def live_stats():
+            # 롤업 없이 매번 users 전체 GROUP BY (재집계 SQL의 SELECT 부분)
+            with engine.connect() as conn:
+                conn.execute(text(REBUILD_STATEMENTS[1].split("\n", 1)[1])).fetchall()
+
+        print(f"{'users':>9} {'legacy all rows':>16} {'page+rollup':>12} {'visits page':>12} "
+              f"{'search page':>12} {'GROUP BY stats':>15}   (ms)")
+        seeded = 0
+        for size in sizes:
+            seed(session_factory, seeded, size)
+            seeded = size
+            with engine.connect() as conn:
+                conn.exec_driver_sql("ANALYZE")
+            legacy_ms = f"{timed(legacy, 1):>16.1f}" if size <= args.legacy_max else f"{'-':>16}"
+            print(f"{size:>9} {legacy_ms} {timed(paged, args.repeat):>12.2f} "
+                  f"{timed(lambda: paged(sort='total_visits'), args.repeat):>12.2f} "
+                  f"{timed(lambda: paged(q='User 12'), args.repeat):>12.2f} "
+                  f"{timed(live_stats, 3):>15.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+API 전체 부하 테스트 (재현 가능한 합성 데이터 + 커밋 간 비교용 JSON 기준선)
+
+main.app을 httpx.ASGITransport로 직접 호출합니다 (미들웨어, 인증, 캐시, 레이트 리밋, 계측 모두 운영과 같은 경로).
+외부 의존성만 대체합니다.
+  - DB: 임시 SQLite 파일 (운영 프로파일: WAL/PRAGMA, 또는 --database-url로 빈 테스트 DB)
+  - SMS: FakeProvider (--sms-latency-ms), 발송 기록은 실제로 DB에 씀
+  - Gemini: httpx.MockTransport 스텁 (--llm-latency-ms), GeminiClient의 동시 호출 제한/계측은 그대로 사용
+
+데이터셋 (--scale): 1k / 100k / 1m 사용자와 같은 수의 참가 기록 (Core bulk insert, 고정 시드)
+
+단계별로 --requests개 요청을 --concurrency개 워커로 보냅니다.
+  sms_request        POST /sms/request        (번호/IP마다 다른 클라이언트)
+  sms_verify         POST /sms/verify         (미리 넣은 유효한 코드)
+  auth_login         POST /auth/login
+  meetings           GET  /meetings           (다가오는 모임, 여러 커서 페이지)
+  meetings_register  POST /meetings/register  (인증된 사용자가 정원이 넉넉한 모임에 신청)
+  chat               POST /api/chat           (캐시되지 않는 질문, LLM 스텁 호출)
+  mixed              위 요청을 운영 비율에 가깝게 섞음 (신청이 모임 목록 캐시를 무효화)
+
+결과: 단계별 p50/p95/p99/평균 지연(ms), RPS, 오류 수 (기대한 상태 코드가 아니면 오류)
+--output으로 JSON 저장, --compare로 이전 결과와 비교 (--max-regression %를 넘으면 종료 코드 1)
+
+Usage:
+    python benchmarks/bench_api_load.py [--scale 1k] [--requests 500] [--concurrency 16] [--seed 42]
+        [--phases sms_request,auth_login,...] [--output load.json] [--compare baseline.json] [--max-regression 20]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+PHASES = ("sms_request", "sms_verify", "auth_login", "meetings", "meetings_register", "chat", "mixed")
+# mixed 단계의 요청 비율 (모임 목록 조회가 대부분)
+MIXED_WEIGHTS = {"meetings": 50, "auth_login": 10, "sms_request": 10, "sms_verify": 10,
+                 "meetings_register": 15, "chat": 5}
+EXPECTED_STATUS = {"sms_request": 200, "sms_verify": 200, "auth_login": 200, "meetings": 200,
+                   "meetings_register": 201, "chat": 200}
+REGISTER_MEETINGS = 10  # 신청 단계 대상 모임 수 (정원 = 전체 요청 수)
+INSERT_BATCH = 50_000
+VERIFY_CODE = "123456"
+
+# 요청: (엔드포인트 이름, 메서드, URL, httpx 요청 인자)
+Request = Tuple[str, str, str, Dict[str, Any]]
+
+
+def configure_environment(args, tmp_dir: str):
+    """앱 모듈을 import하기 전에 설정 (database / rate_limit / rag_chatbot이 import 시 환경 변수를 읽음)"""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp_dir}/load.db"
+    os.environ.setdefault("GEMINI_API_KEY", "load-test-stub")
+    os.environ.setdefault("LOG_SKIP_PATHS", "/health,/metrics")
+    os.chdir(ROOT)  # knowledge_base.txt, templates
+
+
+def seed(session_factory, users: int, requests: int, rng: random.Random) -> Dict[str, Any]:
+    """사용자 / 모임 / 참가 기록 합성 데이터 (Core bulk insert)"""
+    from sqlalchemy import insert
+
+    from database import Meeting, User, UserMeeting
+    from user_stats import rebuild as rebuild_user_stats
+
+    now = datetime.utcnow()
+    meetings = max(20, users // 100)
+    start = time.perf_counter()
+    session = session_factory()
+    for offset in range(0, users, INSERT_BATCH):
+        session.execute(insert(User), [
+            dict(name=f"User {i}", phone_number=f"010-{i:08d}", email=f"user{i}@example.com",
+                 gender="OTHER", chess_experience="KNOW_RULES_ONLY", total_visits=1 + i % 5,
+                 created_at=now, updated_at=now)
+            for i in range(offset, min(users, offset + INSERT_BATCH))
+        ])
+
+    # 사용자마다 참가 기록 1개 (모임별 인원 ≈ users / meetings), 좌석 카운터도 맞춰 둠
+    attendance = Counter(rng.randrange(meetings) + 1 for _ in range(users))
+    session.execute(insert(Meeting), [
+        dict(title=f"Meeting {j}", date_time=now + timedelta(hours=j - meetings // 2), location="Seoul",
+             capacity=attendance[j + 1] + 50, confirmed_count=attendance[j + 1], pending_count=0,
+             waitlist_seq=0, created_at=now, updated_at=now)
+        for j in range(meetings)
+    ])
+    # 신청 단계 대상 모임: 모든 신청이 201이 되도록 정원을 넉넉히
+    session.execute(insert(Meeting), [
+        dict(title=f"Open Meeting {j}", date_time=now + timedelta(days=30 + j), location="Seoul",
+             capacity=requests * 2, confirmed_count=0, pending_count=0, waitlist_seq=0,
+             created_at=now, updated_at=now)
+        for j in range(REGISTER_MEETINGS)
+    ])
+    meeting_ids = list(itertools.chain.from_iterable([m] * n for m, n in sorted(attendance.items())))
+    rng.shuffle(meeting_ids)
+    for offset in range(0, users, INSERT_BATCH):
+        session.execute(insert(UserMeeting), [
+            dict(user_id=i + 1, meeting_id=meeting_ids[i], status="CONFIRMED", registered_at=now)
+            for i in range(offset, min(users, offset + INSERT_BATCH))
+        ])
+    session.commit()
+    rebuild_user_stats(session)  # Core INSERT는 회원 통계 롤업에 반영되지 않으므로 재집계
+    session.close()
+    return {"users": users, "meetings": meetings + REGISTER_MEETINGS, "registrations": users,
+            "register_meeting_ids": list(range(meetings + 1, meetings + REGISTER_MEETINGS + 1)),
+            "seed_seconds": round(time.perf_counter() - start, 2)}
+
+
+class Planner:
+    """단계별 요청 목록 생성 (시드 고정, 번호/사용자는 단계를 넘어 중복되지 않게 발급)"""
+
+    def __init__(self, rng: random.Random, dataset: Dict[str, Any], cursors: List[Optional[str]]):
+        from auth import create_access_token
+
+        self.rng = rng
+        self.dataset = dataset
+        self.cursors = cursors
+        self.create_access_token = create_access_token
+        self.sms_numbers = itertools.count()
+        self.verify_numbers = itertools.count()
+        self.registrants = itertools.count(1)
+        self.questions = itertools.count()
+        self.pending_codes: List[str] = []  # sms_verify 요청에 쓸 번호 (실행 전에 코드를 DB에 넣음)
+
+    @staticmethod
+    def client_headers(n: int) -> Dict[str, str]:
+        # 요청마다 다른 클라이언트 IP (레이트 리밋은 실제 경로 그대로, 한 IP로 몰리지 않게)
+        return {"X-Forwarded-For": f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}"}
+
+    def request(self, endpoint: str) -> Request:
+        if endpoint == "sms_request":
+            n = next(self.sms_numbers)
+            return endpoint, "POST", "/sms/request", {
+                "json": {"phone_number": f"010-7{n:07d}"}, "headers": self.client_headers(n)}
+        if endpoint == "sms_verify":
+            n = next(self.verify_numbers)
+            phone = f"010-6{n:07d}"
+            self.pending_codes.append(phone)
+            return endpoint, "POST", "/sms/verify", {
+                "json": {"phone_number": phone, "code": VERIFY_CODE}, "headers": self.client_headers(n)}
+        if endpoint == "auth_login":
+            i = self.rng.randrange(self.dataset["users"])
+            return endpoint, "POST", "/auth/login", {"json": {"phone_number": f"010-{i:08d}"}}
+        if endpoint == "meetings":
+            params = {"limit": 20, "when": "upcoming"}
+            cursor = self.rng.choice(self.cursors)
+            if cursor:
+                params["cursor"] = cursor
+            return endpoint, "GET", "/meetings", {"params": params}
+        if endpoint == "meetings_register":
+            # 기존 참가 기록과 겹치지 않는 (사용자, 대상 모임) 조합
+            n = next(self.registrants)
+            user_id = (n - 1) % self.dataset["users"] + 1
+            meeting_ids = self.dataset["register_meeting_ids"]
+            meeting_id = meeting_ids[(n - 1) // self.dataset["users"] % len(meeting_ids)]
+            token = self.create_access_token(data={"user_id": user_id, "phone_number": f"010-{user_id - 1:08d}"})
+            return endpoint, "POST", "/meetings/register", {
+                "params": {"meeting_id": meeting_id}, "headers": {"Authorization": f"Bearer {token}"}}
+        if endpoint == "chat":
+            n = next(self.questions)
+            return endpoint, "POST", "/api/chat", {
+                "json": {"message": f"How much is the membership fee for event number {n}?"}}
+        raise ValueError(endpoint)
+
+    def plan(self, phase: str, requests: int) -> List[Request]:
+        if phase != "mixed":
+            return [self.request(phase) for _ in range(requests)]
+        endpoints, weights = zip(*MIXED_WEIGHTS.items())
+        return [self.request(endpoint) for endpoint in self.rng.choices(endpoints, weights, k=requests)]
+
+
+def insert_verification_codes(session_factory, phones: List[str]):
+    from sqlalchemy import insert
+
+    from database import VerificationCode
+
+    if not phones:
+        return
+    now = datetime.utcnow()
+    session = session_factory()
+    session.execute(insert(VerificationCode), [
+        dict(phone_number=phone, code=VERIFY_CODE, created_at=now, expires_at=now + timedelta(minutes=30))
+        for phone in phones
+    ])
+    session.commit()
+    session.close()
+
+
+def percentile(latencies: List[float], p: float) -> Optional[float]:
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+async def run_phase(client, plan: List[Request], concurrency: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """요청 목록을 concurrency개 워커로 실행 → (단계 요약, 엔드포인트별 요약)"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    error_samples: List[str] = []
+    queue = iter(plan)
+
+    async def worker():
+        for endpoint, method, url, kwargs in queue:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies[endpoint].append(time.perf_counter() - start)
+            if response.status_code != EXPECTED_STATUS[endpoint]:
+                errors[endpoint] += 1
+                if len(error_samples) < 3:
+                    error_samples.append(f"{method} {url} → {response.status_code} {response.text[:120]}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    for sample in error_samples:
+        print(f"    unexpected response: {sample}")
+    everything = [latency for values in latencies.values() for latency in values]
+    endpoints = {endpoint: summarize(values, errors[endpoint], elapsed) for endpoint, values in latencies.items()}
+    return summarize(everything, sum(errors.values()), elapsed), endpoints
+
+
+def install_llm_stub(latency: float):
+    """GeminiClient의 HTTP 클라이언트를 고정 지연 MockTransport로 교체"""
+    import httpx
+
+    from gemini_client import get_gemini_client
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "The fee is 10,000 won."}]}}]})
+
+    get_gemini_client()._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+async def run(args) -> Dict[str, Any]:
+    import httpx
+    import sqlalchemy
+
+    import main
+    import sms_queue
+    from database import Base, SessionLocal, engine
+    from request_logging import start_logging, stop_logging
+    from schema_migrations import ensure_schema
+
+    if args.database_url:
+        Base.metadata.drop_all(bind=engine)  # 빈 테스트 DB 전용
+    ensure_schema(engine)
+    rng = random.Random(args.seed)
+    users = SCALES[args.scale]
+    print(f"seeding {args.scale}: {users} users / {users} registrations ...", flush=True)
+    dataset = seed(SessionLocal, users, args.requests, rng)
+    print(f"  done in {dataset['seed_seconds']} s ({dataset['meetings']} meetings)")
+
+    # 운영 startup과 같은 백그라운드 구성 (스냅샷/만료 코드 정리는 제외)
+    log_stream = open(os.devnull, "w")
+    start_logging(stream=log_stream)
+    sms_queue._sms_queue = sms_queue.SMSQueue(provider=sms_queue.FakeProvider(latency=args.sms_latency_ms / 1000),
+                                              recorder=sms_queue.DeliveryRecorder(SessionLocal))
+    sms_queue.get_sms_queue().start()
+    install_llm_stub(args.llm_latency_ms / 1000)
+
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=main.app, client=("10.0.0.1", 50000))
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+            # 모임 목록 커서 수집 (여러 페이지를 고르게 요청하도록)
+            cursors: List[Optional[str]] = [None]
+            for _ in range(args.meeting_pages - 1):
+                response = await client.get("/meetings", params={"limit": 20, "when": "upcoming",
+                                                                 **({"cursor": cursors[-1]} if cursors[-1] else {})})
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                cursors.append(cursor)
+
+            planner = Planner(rng, dataset, cursors)
+            for _ in range(args.warmup):
+                _, method, url, kwargs = planner.request("auth_login")
+                await client.request(method, url, **kwargs)
+
+            for phase in args.phases:
+                plan = planner.plan(phase, args.requests)
+                insert_verification_codes(SessionLocal, planner.pending_codes)
+                planner.pending_codes.clear()
+                summary, endpoints = await run_phase(client, plan, args.concurrency)
+                if phase == "mixed":
+                    summary["endpoints"] = endpoints
+                results[phase] = summary
+                print(f"  {phase:18s} req/s {summary['rps']:8.1f}   p50 {summary['p50_ms']:7.2f} ms   "
+                      f"p95 {summary['p95_ms']:7.2f} ms   p99 {summary['p99_ms']:7.2f} ms   errors {summary['errors']}",
+                      flush=True)
+    finally:
+        await sms_queue.stop_sms_queue()
+        await main.close_gemini_client()
+        stop_logging()
+        log_stream.close()
+        await main.async_engine.dispose()
+        engine.dispose()
+
+    return {
+        "schema": 1,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "git": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": engine.dialect.name,
+        },
+        "config": {
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "llm_latency_ms": args.llm_latency_ms,
+            "sms_latency_ms": args.sms_latency_ms,
+        },
+        "dataset": {key: value for key, value in dataset.items() if key != "register_meeting_ids"},
+        "phases": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: Optional[float]) -> List[str]:
+    """단계별 변화 출력, max_regression(%)을 넘는 p95 증가 / RPS 감소 목록 반환"""
+    for key in ("config", "environment"):
+        changed = {k: (baseline[key].get(k), v) for k, v in current[key].items() if baseline[key].get(k) != v}
+        if changed:
+            print(f"warning: {key} differs from baseline: {changed}")
+
+    def change(old, new):
+        return (new - old) / old * 100 if old else 0.0
+
+    print(f"\ncompared to {(baseline['git'].get('commit') or 'unknown')[:12]} ({baseline['created_at']})")
+    regressions = []
+    for phase, new in current["phases"].items():
+        old = baseline["phases"].get(phase)
+        if old is None:
+            continue
+        p95, rps = change(old["p95_ms"], new["p95_ms"]), change(old["rps"], new["rps"])
+        print(f"  {phase:18s} p50 {old['p50_ms']:7.2f} → {new['p50_ms']:7.2f} ms   "
+              f"p95 {old['p95_ms']:7.2f} → {new['p95_ms']:7.2f} ms ({p95:+5.1f}%)   "
+              f"p99 {old['p99_ms']:7.2f} → {new['p99_ms']:7.2f} ms   req/s {old['rps']:.1f} → {new['rps']:.1f} ({rps:+5.1f}%)")
+        if max_regression is not None:
+            if p95 > max_regression:
+                regressions.append(f"{phase}: p95 {p95:+.1f}%")
+            if -rps > max_regression:
+                regressions.append(f"{phase}: req/s {rps:+.1f}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--requests", type=int, default=500, help="requests per phase")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--phases", default=",".join(PHASES), help=f"comma-separated subset of {','.join(PHASES)}")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--meeting-pages", type=int, default=5, help="distinct /meetings pages requested")
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--sms-latency-ms", type=float, default=50)
+    parser.add_argument("--database-url", help="empty test database (tables are dropped); default: temp SQLite")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--max-regression", type=float, help="exit 1 if p95 grows / req/s drops by more than this %%")
+    args = parser.parse_args()
+    args.phases = [phase for phase in args.phases.split(",") if phase]
+    unknown = set(args.phases) - set(PHASES)
+    if unknown:
+        parser.error(f"unknown phases: {', '.join(sorted(unknown))}")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    tmp_dir = tempfile.mkdtemp(prefix="scc-load-")
+    try:
+        configure_environment(args, tmp_dir)
+        print(f"scale {args.scale}, {args.requests} requests/phase, concurrency {args.concurrency}, "
+              f"seed {args.seed} (cpus: {os.cpu_count()})")
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.output}")
+    if baseline is not None:
+        regressions = compare(baseline, results, args.max_regression)
+        if regressions:
+            print("\nregressions over {:g}%:\n  {}".format(args.max_regression, "\n  ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+동기 Session vs 비동기 AsyncSession 엔드포인트 부하 테스트 (혼합 트래픽 p99)
+
+같은 핸들러 로직을 두 방식으로 띄워 비교합니다.
+  sync   async def 핸들러 안에서 동기 Session 사용 (기존 방식: 쿼리 동안 이벤트 루프 정지)
+  async  AsyncSession + run_sync (database.get_async_db 방식)
+
+트래픽: 모임 목록 / 사용자 조회(인증 경로)가 대부분이고, 일부 요청은 느린 집계 쿼리를 실행합니다.
+느린 쿼리가 이벤트 루프를 막으면 빠른 요청의 p99가 느린 쿼리 시간만큼 늘어납니다.
+
+Usage:
+    python benchmarks/bench_async_db.py [--requests 1000] [--concurrency 10] [--slow-ratio 0.05]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import Base, Meeting, User
+from db_backends import create_async_db_engine, create_db_engine
+from meeting_listing import list_meetings, serialize_meetings
+
+# 수백 ms 걸리는 집계 쿼리 (관리자 통계 같은 무거운 요청 대용)
+SLOW_QUERY = text("""
+    WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < :rows)
+    SELECT SUM(x % 7) FROM n
+""")
+
+
+def seed(session_factory, users: int = 200, meetings: int = 100):
+    session = session_factory()
+    now = datetime.utcnow()
+    session.add_all([
+        User(name=f"User {i}", phone_number=f"010-{i:08d}", email=f"user{i}@example.com",
+             gender="OTHER", chess_experience="KNOW_RULES_ONLY", total_visits=1)
+        for i in range(users)
+    ])
+    session.add_all([
+        Meeting(title=f"Meeting {i}", date_time=now + timedelta(hours=i + 1), location="Seoul", capacity=20)
+        for i in range(meetings)
+    ])
+    session.commit()
+    session.close()
+
+
+def build_sync_app(session_factory, slow_rows: int) -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/meetings")
+    async def meetings(db: Session = Depends(get_db)):
+        page, _ = list_meetings(db, limit=20, when="upcoming")
+        return serialize_meetings(db, page)
+
+    @app.get("/users/{user_id}")
+    async def user(user_id: int, db: Session = Depends(get_db)):
+        return {"id": db.get(User, user_id).id}
+
+    @app.get("/report")
+    async def report(db: Session = Depends(get_db)):
+        return {"total": db.execute(SLOW_QUERY, {"rows": slow_rows}).scalar()}
+
+    return app
+
+
+def build_async_app(async_session_factory, slow_rows: int) -> FastAPI:
+    app = FastAPI()
+
+    async def get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    @app.get("/meetings")
+    async def meetings(db: AsyncSession = Depends(get_async_db)):
+        page, _ = await db.run_sync(list_meetings, limit=20, when="upcoming")
+        return await db.run_sync(serialize_meetings, page)
+
+    @app.get("/users/{user_id}")
+    async def user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        return {"id": (await db.get(User, user_id)).id}
+
+    @app.get("/report")
+    async def report(db: AsyncSession = Depends(get_async_db)):
+        return {"total": (await db.execute(SLOW_QUERY, {"rows": slow_rows})).scalar()}
+
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int, slow_ratio: float):
+    """혼합 트래픽을 보내고 빠른 요청의 지연 목록과 전체 소요 시간을 반환"""
+    rng = random.Random(42)
+    plan = []
+    for _ in range(requests):
+        roll = rng.random()
+        if roll < slow_ratio:
+            plan.append("/report")
+        elif roll < 0.6:
+            plan.append("/meetings")
+        else:
+            plan.append(f"/users/{rng.randint(1, 200)}")
+
+    fast_latencies = []
+    queue = iter(plan)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for path in queue:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                if path != "/report":
+                    fast_latencies.append(time.perf_counter() - start)
+
+        # 워밍업: 측정 전에 커넥션 풀을 채움 (정상 운영 상태 기준으로 비교)
+        await asyncio.gather(*(client.get("/users/1") for _ in range(concurrency)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return sorted(fast_latencies), elapsed
+
+
+def report_line(name: str, latencies, elapsed: float, requests: int):
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{name:6s} req/s {requests / elapsed:8.1f}   fast p50 {pct(0.50):7.1f} ms   "
+          f"p95 {pct(0.95):7.1f} ms   p99 {pct(0.99):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-rows", type=int, default=500_000, help="rows generated by the slow query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        engine = create_db_engine(url, pool_size=args.concurrency)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        seed(session_factory)
+
+        print(f"requests: {args.requests}, concurrency: {args.concurrency}, slow ratio: {args.slow_ratio}")
+        latencies, elapsed = asyncio.run(drive(build_sync_app(session_factory, args.slow_rows),
+                                               args.requests, args.concurrency, args.slow_ratio))
+        report_line("sync", latencies, elapsed, args.requests)
+        engine.dispose()
+
+        async def run_async():
+            async_engine = create_async_db_engine(url, pool_size=args.concurrency)
+            factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            try:
+                return await drive(build_async_app(factory, args.slow_rows),
+                                   args.requests, args.concurrency, args.slow_ratio)
+            finally:
+                await async_engine.dispose()
+
+        latencies, elapsed = asyncio.run(run_async())
+        report_line("async", latencies, elapsed, args.requests)
+
+
+if __name__ == "__main__":
+    main()
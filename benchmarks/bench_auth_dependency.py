@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+인증 의존성 (auth.get_current_user) 마이크로 벤치마크
+
+캐시 없이 매 요청 JWT 검증 + 사용자 조회를 하는 경우와
+principal 캐시 히트 경로를 비교합니다.
+
+Usage:
+    python benchmarks/bench_auth_dependency.py [--iterations 5000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth import create_access_token, get_current_user, principal_cache
+from database import Base, User
+
+
+def measure(session_factory, credentials, iterations: int, cached: bool) -> float:
+    """요청마다 새 세션으로 의존성을 호출하고 호출당 평균 시간(µs)을 반환"""
+    async def run():
+        principal_cache.clear()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if not cached:
+                principal_cache.clear()
+            session = session_factory()
+            try:
+                await get_current_user(credentials, session)
+            finally:
+                session.close()
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        session = session_factory()
+        user = User(name="Bench", phone_number="010-0000-0000", email="bench@example.com",
+                    gender="OTHER", chess_experience="KNOW_RULES_ONLY", total_visits=1)
+        session.add(user)
+        session.commit()
+        token = create_access_token(data={"user_id": user.id, "phone_number": user.phone_number})
+        session.close()
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        uncached = measure(session_factory, credentials, args.iterations, cached=False)
+        cached = measure(session_factory, credentials, args.iterations, cached=True)
+        engine.dispose()
+
+    print(f"iterations: {args.iterations}")
+    print(f"  JWT decode + user query: {uncached:8.1f} µs/call")
+    print(f"  principal cache hit:     {cached:8.1f} µs/call  ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+지식 베이스 검색 벤치마크
+
+섹션 수를 늘려가며 기존 선형 스캔 방식과 KnowledgeIndex의 질의당 지연 시간을 비교합니다.
+
+Usage:
+    python benchmarks/bench_knowledge_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_index import KnowledgeIndex
+
+SECTION_COUNTS = [100, 1_000, 10_000, 20_000]
+QUERIES = [
+    "how much is the participation fee",
+    "where is the meeting location",
+    "what chess level do members have",
+    "참가비는 얼마인가요",
+]
+QUERIES_PER_RUN = 200
+
+
+def make_sections(count: int, seed: int = 42) -> list:
+    """합성 섹션 생성 (고정 시드, 섹션마다 고유 어휘 + 공통 어휘)"""
+    rng = random.Random(seed)
+    common = ["chess", "club", "meeting", "members", "seoul", "play", "level", "모임", "체스"]
+    sections = []
+    for i in range(count):
+        words = [f"topic{i}", f"detail{i % 997}", f"area{i % 113}"]
+        words += rng.choices(common, k=8)
+        words += [f"w{rng.randint(0, 50_000)}" for _ in range(40)]
+        sections.append(f"Section {i}\n" + " ".join(words))
+    # 실제 지식 베이스와 비슷한 섹션을 하나 섞어 둠
+    sections.append("Payment Information\nThe participation fee is 10,000 won. 참가비는 만원입니다.")
+    return sections
+
+
+def linear_search(sections_lower: list, query: str, top_k: int = 3) -> list:
+    """기존 RAGChatbot._search_knowledge 방식 (문서마다 set 생성 + 부분 문자열 검사)"""
+    query_words = set(query.lower().split())
+    scored = []
+    for content in sections_lower:
+        score = len(query_words.intersection(set(content.split())))
+        for word in query_words:
+            if word in content:
+                score += 2
+        if score > 0:
+            scored.append((score, content))
+    scored.sort(reverse=True, key=lambda x: x[0])
+    return scored[:top_k]
+
+
+def per_query_ms(fn, queries: list) -> float:
+    start = time.perf_counter()
+    for i in range(QUERIES_PER_RUN):
+        fn(queries[i % len(queries)])
+    return (time.perf_counter() - start) * 1000 / QUERIES_PER_RUN
+
+
+def main():
+    print(f"{'sections':>10} {'build (ms)':>12} {'linear (ms/q)':>15} {'index (ms/q)':>14}")
+    for count in SECTION_COUNTS:
+        sections = make_sections(count)
+        lowered = [s.lower() for s in sections]
+
+        start = time.perf_counter()
+        index = KnowledgeIndex(sections)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        linear_ms = per_query_ms(lambda q: linear_search(lowered, q), QUERIES)
+        index_ms = per_query_ms(lambda q: index.search(q), QUERIES)
+        print(f"{count:>10} {build_ms:>12.1f} {linear_ms:>15.3f} {index_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+요청 로그 미들웨어 오버헤드 벤치마크
+
+작은 FastAPI 앱(/ok)을 ASGI로 직접 호출하여(HTTP 서버/네트워크 제외) 미들웨어별 요청당 시간을 비교합니다.
+  none        미들웨어 없음 (기준)
+  legacy      기존 log_requests: @app.middleware("http") + 요청마다 print 3회 (헤더 전체 출력)
+  json        request_logging.RequestLoggingMiddleware, 샘플링 없음
+  json-10%    LOG_SAMPLE_RATE=0.1
+  json-hot    json이지만 쓰기 스레드가 레코드를 꺼내 버리기만 함 (요청 경로 비용만: 레코드 생성 + 큐 삽입)
+  json-slow   json + 쓰기마다 --slow-sink-ms 만큼 걸리는 출력 (stdout이 막힌 상황)
+
+print/로그 출력은 임시 파일로 보냅니다. 요청마다 Authorization 포함 헤더 10개를 보냅니다.
+CPU가 하나뿐이면 쓰기 스레드의 JSON 직렬화도 같은 코어에서 돌기 때문에 json과 json-hot의 차이로 나타납니다.
+
+Usage:
+    python benchmarks/bench_logging_middleware.py [--requests 20000] [--slow-sink-ms 1]
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+
+from request_logging import LogPipeline, RequestLoggingMiddleware
+
+HEADERS = [
+    (b"host", b"api.seoulchess.club"),
+    (b"user-agent", b"Dart/3.5 (dart:io)"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip"),
+    (b"accept-language", b"ko-KR,ko;q=0.9"),
+    (b"authorization", b"Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJ1c2VyX2lkIjoxfQ.signature"),
+    (b"x-forwarded-for", b"203.0.113.7, 10.0.0.2"),
+    (b"x-forwarded-proto", b"https"),
+    (b"x-request-start", b"t=1700000000000"),
+    (b"connection", b"keep-alive"),
+]
+
+
+class SlowStream:
+    """write()마다 지정한 시간만큼 막히는 출력 (느린 stdout 파이프 흉내)"""
+
+    def __init__(self, stream, delay: float):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def make_app(variant: str, logger: logging.Logger):
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    if variant == "legacy":
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            print(f"🔵 Incoming request: {request.method} {request.url.path}")
+            print(f"   Client: {request.client.host if request.client else 'Unknown'}")
+            print(f"   Headers: {dict(request.headers)}")
+            response = await call_next(request)
+            print(f"✅ Response status: {response.status_code}")
+            return response
+    elif variant.startswith("json"):
+        app.add_middleware(RequestLoggingMiddleware, logger=logger,
+                           sample_rate=0.1 if variant == "json-10%" else 1.0)
+    return app
+
+
+async def drive(app, requests: int):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/ok", "raw_path": b"/ok", "root_path": "", "query_string": b"", "headers": HEADERS,
+        "client": ("10.0.0.2", 52000), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # 워밍업
+        await app(dict(scope), receive, send)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await app(dict(scope), receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(variant: str, requests: int, out, slow_sink_ms: float):
+    logger = logging.getLogger(f"bench.access.{variant}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stream = SlowStream(out, slow_sink_ms / 1000) if variant == "json-slow" else out
+    pipeline = LogPipeline(logger=logger, stream=stream, max_size=requests + 1000)
+    if variant == "json-hot":
+        pipeline.writer.handler = logging.NullHandler()
+    pipeline.start()
+    app = make_app(variant, logger)
+    with contextlib.redirect_stdout(out):
+        timings = asyncio.run(drive(app, requests))
+    backlog = pipeline.queue.qsize()
+    flush_start = time.perf_counter()
+    pipeline.stop()
+    return timings, backlog, time.perf_counter() - flush_start, pipeline.handler.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--slow-sink-ms", type=float, default=1.0, help="json-slow: delay per log write (ms)")
+    args = parser.parse_args()
+
+    print(f"requests: {args.requests}, headers per request: {len(HEADERS)}, cpus: {os.cpu_count()}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for variant in ("none", "legacy", "json", "json-10%", "json-hot", "json-slow"):
+            with open(os.path.join(tmp, f"{variant}.log"), "w", encoding="utf-8") as out:
+                timings, backlog, flush, dropped = run(variant, args.requests, out, args.slow_sink_ms)
+            mean = statistics.fmean(timings) * 1e6
+            p99 = sorted(timings)[int(len(timings) * 0.99)] * 1e6
+            baseline = baseline if baseline is not None else mean
+            size = os.path.getsize(os.path.join(tmp, f"{variant}.log"))
+            print(f"{variant:10s} mean {mean:7.1f} us  p99 {p99:7.1f} us  overhead {mean - baseline:+7.1f} us   "
+                  f"log {size / 1024:8.0f} KiB  backlog at end {backlog:6d}  flush {flush * 1000:7.0f} ms  "
+                  f"dropped {dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+모임 목록 API 벤치마크 (10k 모임 × 50 참가자)
+
+기존 방식 (joinedload로 전체 모임 + 전체 참가자 직렬화)과
+커서 페이지네이션 (1페이지, 카운터 + 대기 인원 집계)을 비교합니다.
+
+Usage:
+    python benchmarks/bench_meetings_listing.py [--meetings 10000] [--participants 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from database import Base, Meeting, User, UserMeeting
+from meeting_listing import list_meetings, serialize_meetings
+from schemas import MeetingOut
+
+
+def seed(session_factory, meetings: int, participants: int, users: int):
+    """합성 데이터 생성 (Core bulk insert)"""
+    now = datetime.utcnow()
+    rng = random.Random(7)
+    session = session_factory()
+    session.execute(insert(User), [
+        dict(name=f"User {i}", phone_number=f"010-{i:08d}", email=f"user{i}@example.com",
+             gender="OTHER", chess_experience="KNOW_RULES_ONLY", total_visits=1,
+             created_at=now, updated_at=now)
+        for i in range(users)
+    ])
+    session.execute(insert(Meeting), [
+        dict(title=f"Meeting {i}", date_time=now + timedelta(hours=i - meetings // 2),
+             location="Seoul", capacity=participants, confirmed_count=participants,
+             pending_count=0, waitlist_seq=0, created_at=now)
+        for i in range(meetings)
+    ])
+    rows = []
+    for meeting_id in range(1, meetings + 1):
+        for user_id in rng.sample(range(1, users + 1), participants):
+            rows.append(dict(user_id=user_id, meeting_id=meeting_id, status="CONFIRMED", registered_at=now))
+        if len(rows) >= 50_000:
+            session.execute(insert(UserMeeting), rows)
+            rows = []
+    if rows:
+        session.execute(insert(UserMeeting), rows)
+    session.commit()
+    session.close()
+
+
+def timed(label: str, fn, repeat: int):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    print(f"{label:<48} {elapsed:>10.2f} ms   ({result} items)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meetings", type=int, default=10_000)
+    parser.add_argument("--participants", type=int, default=50)
+    parser.add_argument("--users", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        start = time.perf_counter()
+        seed(session_factory, args.meetings, args.participants, args.users)
+        print(f"Seeded {args.meetings} meetings x {args.participants} participants "
+              f"in {time.perf_counter() - start:.1f}s\n")
+
+        def legacy():
+            session = session_factory()
+            meetings = session.query(Meeting).options(joinedload(Meeting.participants)).all()
+            payload = [MeetingOut.model_validate(m).model_dump() for m in meetings]
+            session.close()
+            return len(payload)
+
+        def paginated(when=None, include_participants=False):
+            session = session_factory()
+            meetings, _ = list_meetings(session, when=when, include_participants=include_participants)
+            payload = [m.model_dump() for m in serialize_meetings(session, meetings, include_participants)]
+            session.close()
+            return len(payload)
+
+        timed("legacy: all meetings + joinedload participants", legacy, repeat=1)
+        timed("paginated: first page (50)", paginated, repeat=20)
+        timed("paginated: upcoming page (50)", lambda: paginated(when="upcoming"), repeat=20)
+        timed("paginated: past page (50)", lambda: paginated(when="past"), repeat=20)
+        timed("paginated: page + include=participants", lambda: paginated(include_participants=True), repeat=20)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+메트릭 기록 비용 벤치마크
+
+1. 기록 연산 1회 비용 (단일 스레드 / --threads개 스레드 동시)
+     sharded   metrics.py 방식: 스레드별 샤드에 락 없이 기록
+     locked    비교용: 기록마다 threading.Lock을 잡는 단순 구현
+2. MetricsMiddleware: 작은 FastAPI 앱(/items/{item_id})을 ASGI로 직접 호출한 요청당 시간 (미들웨어 없음 대비)
+3. instrument_engine: SQLite 기본키 조회 1회당 시간 (계측 없음 / 빈 이벤트 리스너 대비)
+   instrument_queries(query_tracking.py): 요청 밖(추적 안 함) / track_queries() 안
+
+Usage:
+    python benchmarks/bench_metrics.py [--ops 200000] [--threads 4] [--requests 20000] [--queries 20000]
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+
+from metrics import DEFAULT_BUCKETS, MetricsMiddleware, Registry, instrument_engine
+from query_tracking import instrument_queries, track_queries
+
+
+class LockedHistogram:
+    """비교용: 라벨 dict + 전역 락"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def observe(self, labels, value):
+        with self.lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+
+def per_op_ns(fn, ops: int, threads: int) -> float:
+    """threads개 스레드가 각각 ops/threads번 호출했을 때 연산 1회당 벽시계 시간 (ns)"""
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e9
+
+
+def bench_recording(args):
+    registry = Registry()
+    counter = registry.counter("c", "bench", ("route",))
+    histogram = registry.histogram("h", "bench", ("method", "route", "status"))
+    locked = LockedHistogram()
+    labels = ("GET", "/meetings", "200")
+
+    cases = {
+        "counter.inc": lambda: counter.labels("/meetings").inc(),
+        "histogram.observe sharded": lambda: histogram.labels(*labels).observe(0.0123),
+        "histogram.observe locked": lambda: locked.observe(labels, 0.0123),
+    }
+    print(f"recording ({args.ops} ops, cpus: {os.cpu_count()})")
+    for name, fn in cases.items():
+        single = per_op_ns(fn, args.ops, 1)
+        multi = per_op_ns(fn, args.ops, args.threads)
+        print(f"  {name:28s} 1 thread {single:7.0f} ns/op   {args.threads} threads {multi:7.0f} ns/op")
+    render_start = time.perf_counter()
+    registry.render()
+    print(f"  render() with {args.threads + 1} shards: {(time.perf_counter() - render_start) * 1000:.2f} ms")
+
+
+async def drive(app, requests: int):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/items/7", "raw_path": b"/items/7", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await app(dict(scope), receive, send)
+        timings.append(time.perf_counter() - start)
+    return statistics.fmean(timings) * 1e6
+
+
+def bench_middleware(args):
+    def make_app(with_metrics: bool):
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        if with_metrics:
+            registry = Registry()
+            app.add_middleware(MetricsMiddleware,
+                               duration=registry.histogram("d", "bench", ("method", "route", "status")),
+                               in_flight=registry.gauge("f", "bench"))
+        return app
+
+    # 순서에 따른 편차를 줄이려고 번갈아 3번씩 측정하고 최솟값 사용
+    results = {False: [], True: []}
+    for _ in range(3):
+        for with_metrics in (False, True):
+            results[with_metrics].append(asyncio.run(drive(make_app(with_metrics), args.requests)))
+    base, instrumented = min(results[False]), min(results[True])
+    print(f"middleware ({args.requests} requests)\n  none {base:7.1f} us/request   "
+          f"MetricsMiddleware {instrumented:7.1f} us/request   overhead {instrumented - base:+6.1f} us")
+
+
+def bench_engine(args, tmp):
+    def run(variant: str) -> float:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        if variant == "empty listeners":
+            event.listen(engine, "before_cursor_execute", lambda *a: None)
+            event.listen(engine, "after_cursor_execute", lambda *a: None)
+        elif variant == "instrument_engine":
+            registry = Registry()
+            instrument_engine(engine, "bench",
+                              duration=registry.histogram("q", "bench", ("engine", "operation")),
+                              errors=registry.counter("e", "bench", ("engine", "operation")))
+        elif variant.startswith("instrument_queries"):
+            instrument_queries(engine)
+        with engine.connect() as conn, track_queries() if variant.endswith("tracking") else nullcontext():
+            statement = text("SELECT id FROM t WHERE id = :id")
+            start = time.perf_counter()
+            for i in range(args.queries):
+                conn.execute(statement, {"id": i % 1000}).scalar()
+            elapsed = time.perf_counter() - start
+        engine.dispose()
+        return elapsed / args.queries * 1e6
+
+    engine = create_engine(f"sqlite:///{tmp}/bench.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO t (id) VALUES (:id)"), [{"id": i} for i in range(1000)])
+    engine.dispose()
+
+    # 빈 리스너: SQLAlchemy 이벤트 디스패치 자체의 비용 (계측 코드와 구분)
+    variants = ("none", "empty listeners", "instrument_engine", "instrument_queries idle", "instrument_queries tracking")
+    results = {variant: [] for variant in variants}
+    for _ in range(3):
+        for variant in variants:
+            results[variant].append(run(variant))
+    base = min(results["none"])
+    print(f"engine events ({args.queries} primary-key SELECTs)")
+    for variant in variants:
+        best = min(results[variant])
+        print(f"  {variant:27s} {best:7.1f} us/query   overhead {best - base:+6.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench_recording(args)
+    bench_middleware(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_engine(args, tmp)
+
+
+if __name__ == "__main__":
+    main()
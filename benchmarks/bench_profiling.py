@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+요청 프로파일러 비용 벤치마크
+
+작은 FastAPI 앱을 ASGI로 직접 호출하여 요청당 시간을 비교합니다.
+  none         ProfilingMiddleware 없음
+  off          미들웨어는 있지만 프로파일링 꺼짐 (운영 기본 상태)
+  on-<N>ms     모든 요청 프로파일, 샘플 간격 N ms (--work-ms 만큼 CPU를 쓰는 엔드포인트)
+
+Usage:
+    python benchmarks/bench_profiling.py [--requests 20000] [--profiled-requests 100] [--work-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+
+from profiling import Profiler, ProfilingMiddleware
+
+
+def busy_work(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(200))
+
+
+def make_app(profiler, work_ms: float):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        if work_ms:
+            busy_work(work_ms / 1000)
+        return {"id": item_id}
+
+    if profiler is not None:
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return app
+
+
+async def drive(app, requests: int):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/items/7", "raw_path": b"/items/7", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(min(200, requests)):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="requests for none/off")
+    parser.add_argument("--profiled-requests", type=int, default=100)
+    parser.add_argument("--work-ms", type=float, default=20, help="CPU time per profiled request")
+    args = parser.parse_args()
+
+    # 꺼진 상태의 비용: 번갈아 3번씩 측정하고 최솟값
+    results = {"none": [], "off": []}
+    for _ in range(3):
+        results["none"].append(asyncio.run(drive(make_app(None, 0), args.requests)))
+        results["off"].append(asyncio.run(drive(make_app(Profiler(sample_rate=0), 0), args.requests)))
+    base = min(results["none"])
+    print(f"trivial endpoint, {args.requests} requests (cpus: {os.cpu_count()})")
+    for name, values in results.items():
+        print(f"  {name:10s} {min(values):8.1f} us/request   overhead {min(values) - base:+6.1f} us")
+
+    print(f"{args.work_ms:g} ms CPU endpoint, {args.profiled_requests} requests")
+    base = asyncio.run(drive(make_app(None, args.work_ms), args.profiled_requests))
+    print(f"  {'none':10s} {base / 1000:8.2f} ms/request")
+    for interval in (1, 5, 10):
+        profiler = Profiler(interval_ms=interval)
+        profiler.configure(sample_rate=1.0, expires_in_seconds=None)
+        elapsed = asyncio.run(drive(make_app(profiler, args.work_ms), args.profiled_requests))
+        samples = statistics.fmean(profile.samples for profile in profiler.profiles)
+        print(f"  {f'on-{interval}ms':10s} {elapsed / 1000:8.2f} ms/request   overhead {(elapsed - base) / base:+6.1%}"
+              f"   samples/request {samples:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+SMS 발송: 요청 안에서 직접 발송 vs 큐(sms_queue.SMSQueue) 벤치마크
+
+가짜 공급자(FakeProvider)의 지연/실패율을 실제 SMS API처럼 설정하고
+/sms/request 형태의 요청을 동시에 보내 비교합니다.
+  inline  요청 핸들러에서 공급자 호출 완료까지 대기 (재시도 없음, 실패는 그대로 오류)
+  queued  큐에 넣고 즉시 응답, 워커가 재시도/백오프와 함께 발송
+
+측정: 요청 응답 p50/p99, 발송 완료까지 p50/p99(큐), 처리량, 최종 실패 수
+
+Usage:
+    python benchmarks/bench_sms_queue.py [--messages 2000] [--concurrency 50]
+        [--latency 0.2] [--jitter 0.3] [--failure-rate 0.05] [--workers 0] [--provider-concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from db_backends import create_db_engine
+from sms_queue import DeliveryRecorder, FakeProvider, SMSDeliveryError, SMSQueue
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+
+async def drive(handler, messages: int, concurrency: int):
+    latencies, errors = [], 0
+    numbers = iter(range(messages))
+
+    async def client():
+        nonlocal errors
+        for i in numbers:
+            start = time.perf_counter()
+            try:
+                await handler(f"+8210{i:08d}", f"[서울체스클럽] 인증번호 [{i % 1000000:06d}]")
+            except SMSDeliveryError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_inline(args):
+    provider = FakeProvider(args.latency, args.jitter, args.failure_rate, args.provider_concurrency, seed=1)
+    semaphore = asyncio.Semaphore(args.provider_concurrency)
+
+    async def handler(to, body):
+        async with semaphore:
+            await provider.send(to, body)
+
+    latencies, errors, elapsed = await drive(handler, args.messages, args.concurrency)
+    print(f"inline  request p50 {pct(latencies, 0.5):7.1f} ms  p99 {pct(latencies, 0.99):7.1f} ms   "
+          f"sent/s {len(provider.sent) / elapsed:7.1f}   failed {errors}")
+
+
+async def run_queued(args, session_factory):
+    provider = FakeProvider(args.latency, args.jitter, args.failure_rate, args.provider_concurrency, seed=1)
+    queue = SMSQueue(provider=provider, recorder=DeliveryRecorder(session_factory),
+                     workers=args.workers, max_size=args.messages)
+    queue.start()
+
+    async def handler(to, body):
+        queue.enqueue(to, body)
+
+    start = time.perf_counter()
+    latencies, _, _ = await drive(handler, args.messages, args.concurrency)
+    await queue.drain()
+    elapsed = time.perf_counter() - start
+    stats = queue.stats()
+    await queue.stop()
+    print(f"queued  request p50 {pct(latencies, 0.5):7.1f} ms  p99 {pct(latencies, 0.99):7.1f} ms   "
+          f"sent/s {stats['sent'] / elapsed:7.1f}   failed {stats['failed']}   retries {stats['retries']}   "
+          f"delivery p50 {stats['delivery_p50_ms']} ms  p99 {stats['delivery_p99_ms']} ms   "
+          f"db flushes {queue.recorder.flushes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent /sms/request clients")
+    parser.add_argument("--latency", type=float, default=0.2, help="provider base latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="provider random extra latency (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=0, help="0 = provider concurrency")
+    parser.add_argument("--provider-concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"messages: {args.messages}, clients: {args.concurrency}, provider latency "
+          f"{args.latency}+U(0,{args.jitter})s, failure rate {args.failure_rate}, "
+          f"provider concurrency {args.provider_concurrency}")
+    asyncio.run(run_inline(args))
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        asyncio.run(run_queued(args, sessionmaker(bind=engine)))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+SQLite 온라인 스냅샷 비용 벤치마크 (기본 사용자 100k명)
+
+운영 프로파일(WAL)의 DB에 사용자/모임/신청 데이터를 채운 뒤,
+쓰기 스레드가 /sms/request 패턴으로 계속 쓰는 동안 storage.snapshot()을 실행하여
+  - 스냅샷 소요 시간과 크기
+  - 스냅샷 중 / 평소 쓰기 지연 (p50, p99)
+  - 부팅 시 복원(restore_if_missing) 소요 시간
+을 측정합니다. 비교용으로 VACUUM INTO(압축된 사본) 방식도 같은 조건에서 실행합니다.
+
+참고: 백업 API를 페이지 단위로 나눠 실행(backup(pages=N))하면 다른 연결이 쓸 때마다
+백업이 처음부터 다시 시작되어, 쓰기가 계속되는 동안에는 끝나지 않습니다.
+storage.snapshot()이 한 단계로 복사하는 이유입니다.
+
+Usage:
+    python benchmarks/bench_storage_snapshot.py [--users 100000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Meeting, User, UserMeeting, VerificationCode
+from db_backends import create_db_engine
+from storage import restore_if_missing, snapshot
+
+
+def vacuum_into(db_path: str, backup_dir: str) -> str:
+    os.makedirs(backup_dir, exist_ok=True)
+    path = os.path.join(backup_dir, "vacuum-into.db")
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("VACUUM INTO ?", (path,))
+    finally:
+        conn.close()
+    return path
+
+
+def seed(engine, users: int):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, users, 10_000):
+            conn.execute(insert(User), [
+                {"name": f"User {i}", "phone_number": f"010-{i:08d}", "email": f"user{i}@example.com",
+                 "gender": "OTHER", "chess_experience": "KNOW_RULES_ONLY", "total_visits": 1, "created_at": now}
+                for i in range(start, min(users, start + 10_000))
+            ])
+        conn.execute(insert(Meeting), [
+            {"title": f"Meeting {i}", "date_time": now + timedelta(days=i), "location": "Seoul",
+             "capacity": 20, "created_at": now}
+            for i in range(500)
+        ])
+        conn.execute(insert(UserMeeting), [
+            {"user_id": i + 1, "meeting_id": i % 500 + 1, "status": "CONFIRMED", "registered_at": now}
+            for i in range(min(users, 10_000))
+        ])
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+
+def measure(session_factory, take_snapshot, baseline_seconds: float):
+    latencies = {"baseline": [], "snapshot": []}
+    phase = ["baseline"]
+    stop = threading.Event()
+
+    def writer(index: int):
+        while not stop.is_set():
+            session = session_factory()
+            start = time.perf_counter()
+            try:
+                phone = f"010-9{index:03d}{random.randint(0, 9999):04d}"
+                session.query(VerificationCode).filter(VerificationCode.phone_number == phone).delete()
+                now = datetime.utcnow()
+                session.add(VerificationCode(phone_number=phone, code="123456", created_at=now,
+                                             expires_at=now + timedelta(minutes=5)))
+                session.commit()
+                latencies[phase[0]].append(time.perf_counter() - start)
+            finally:
+                session.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(baseline_seconds)
+    phase[0] = "snapshot"
+    start = time.perf_counter()
+    path = take_snapshot()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return path, elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--baseline-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "community_control.db")
+        engine = create_db_engine(f"sqlite:///{db_path}", pool_size=8)
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        seed(engine, args.users)
+        print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s, "
+              f"db {os.path.getsize(db_path) / 1e6:.1f} MB (+ WAL)")
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        backup_dir = os.path.join(tmp, "backups")
+        methods = {
+            "backup api": lambda: snapshot(db_path, backup_dir, keep=1),
+            "vacuum into": lambda: vacuum_into(db_path, os.path.join(tmp, "vacuum")),
+        }
+        for name, take_snapshot in methods.items():
+            path, elapsed, latencies = measure(session_factory, take_snapshot, args.baseline_seconds)
+            print(f"{name:12s} snapshot {elapsed * 1000:8.1f} ms  {os.path.getsize(path) / 1e6:6.1f} MB   "
+                  f"writes p50/p99 baseline {pct(latencies['baseline'], 0.5):5.1f}/{pct(latencies['baseline'], 0.99):6.1f} ms"
+                  f"   during {pct(latencies['snapshot'], 0.5):5.1f}/{pct(latencies['snapshot'], 0.99):6.1f} ms"
+                  f" ({len(latencies['snapshot'])} writes)")
+        engine.dispose()
+
+        restored_path = os.path.join(tmp, "restored", "community_control.db")
+        start = time.perf_counter()
+        restore_if_missing(restored_path, os.path.join(tmp, "backups"))
+        print(f"restore on boot {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
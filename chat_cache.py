@@ -0,0 +1,96 @@
+"""
+챗봇 응답 캐시 (LRU + TTL)
+
+정규화된 질문, 감지된 언어, 검색된 컨텍스트 지문(fingerprint)을 키로
+Gemini 응답을 저장합니다. 같은 질문이 반복되면 LLM 호출 없이 응답합니다.
+지식 베이스가 바뀌면 RAGChatbot이 clear()로 전체 무효화합니다.
+"""
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+CHAT_CACHE_MAX_SIZE = int(os.getenv("CHAT_CACHE_MAX_SIZE", "512"))
+CHAT_CACHE_TTL_SECONDS = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """대소문자, 구두점, 공백 차이를 제거한 질문 문자열"""
+    query = _PUNCTUATION_RE.sub(" ", query.lower())
+    return _WHITESPACE_RE.sub(" ", query).strip()
+
+
+def context_fingerprint(context: str) -> str:
+    """검색된 컨텍스트의 짧은 해시"""
+    return hashlib.sha1(context.encode("utf-8")).hexdigest()[:16]
+
+
+class ChatResponseCache:
+    """크기 제한 LRU + TTL 응답 캐시 (이벤트 루프 단일 스레드에서 사용)"""
+
+    def __init__(self, max_size: int = CHAT_CACHE_MAX_SIZE, ttl_seconds: float = CHAT_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, response)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(query: str, language: str, context: str) -> str:
+        """캐시 키 생성: 정규화된 질문 + 언어 + 컨텍스트 지문"""
+        return f"{language}:{context_fingerprint(context)}:{normalize_query(query)}"
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 반환 (없거나 만료되면 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: str):
+        """응답 저장 (용량 초과 시 가장 오래 사용하지 않은 항목부터 제거)"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """전체 무효화 (지식 베이스 변경 시)"""
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        """히트/미스 카운터 (절약된 LLM 호출 수 = hits)"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,127 @@
+"""
+만료된 인증 코드(VerificationCode) 정리
+
+/sms/request는 같은 번호의 이전 코드만 지우므로, 다시 요청하지 않는 번호의 만료 코드는
+테이블에 계속 쌓입니다. CodeSweeper는 주기적으로 만료된 행을 배치 단위로 삭제합니다.
+
+- ix_verification_codes_expires_at 인덱스로 만료 행만 찾음 (전체 스캔 없음)
+- 배치(SWEEP_BATCH_SIZE)마다 커밋하여 쓰기 잠금을 짧게 유지
+- 동기 Session으로 실행하며, 이벤트 루프를 막지 않도록 스레드에서 호출
+- stats(): 실행 횟수, 마지막 실행에서 삭제한 행 수, 누적 삭제 수 등
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, VerificationCode
+
+SWEEP_INTERVAL_SECONDS = float(os.getenv("VERIFICATION_SWEEP_INTERVAL_SECONDS", "300"))  # 0이면 끔
+SWEEP_BATCH_SIZE = int(os.getenv("VERIFICATION_SWEEP_BATCH_SIZE", "500"))
+
+
+def delete_expired_codes(db: Session, now: Optional[datetime] = None, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """
+    만료된 인증 코드를 배치 단위로 삭제합니다.
+
+    Returns:
+        삭제한 행 수
+    """
+    now = now or datetime.utcnow()
+    expired_ids = (
+        select(VerificationCode.id)
+        .where(VerificationCode.expires_at < now)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    total = 0
+    while True:
+        deleted = db.execute(
+            delete(VerificationCode).where(VerificationCode.id.in_(expired_ids)),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+class CodeSweeper:
+    """만료 인증 코드 주기 삭제 태스크 + 실행 통계"""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 interval: float = SWEEP_INTERVAL_SECONDS, batch_size: int = SWEEP_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.runs = 0
+        self.errors = 0
+        self.rows_swept_total = 0
+        self.last_rows_swept = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """한 번 실행 (동기)"""
+        start = time.perf_counter()
+        db = self.session_factory()
+        try:
+            deleted = delete_expired_codes(db, now=now, batch_size=self.batch_size)
+        except Exception:
+            db.rollback()
+            self.errors += 1
+            raise
+        finally:
+            db.close()
+        self.runs += 1
+        self.last_rows_swept = deleted
+        self.rows_swept_total += deleted
+        self.last_run_at = datetime.utcnow()
+        self.last_duration_ms = (time.perf_counter() - start) * 1000
+        return deleted
+
+    async def _loop(self):
+        while True:
+            try:
+                deleted = await asyncio.to_thread(self.sweep)
+                if deleted:
+                    print(f"🧹 Swept {deleted} expired verification codes")
+            except Exception as e:
+                print(f"⚠️  Verification code sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """백그라운드 태스크 시작 (interval이 0이면 아무것도 하지 않음)"""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_rows_swept": self.last_rows_swept,
+            "rows_swept_total": self.rows_swept_total,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": round(self.last_duration_ms, 2),
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+        }
+
+
+code_sweeper = CodeSweeper()
@@ -0,0 +1,105 @@
+"""
+공용 pytest 픽스처
+
+모든 테스트는 임시 디렉토리의 SQLite DB를 사용합니다.
+(로컬 community_control.db를 건드리지 않도록 database 모듈 import 전에 DATABASE_URL 설정)
+"""
+import asyncio
+import os
+import tempfile
+
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="scc-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DB_DIR}/community_control.db")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from auth import create_access_token, principal_cache
+from database import Base, User, get_async_db, get_db
+from db_backends import create_async_db_engine, create_db_engine
+from http_cache import response_cache
+from query_tracking import instrument_queries
+from rate_limit import get_rate_limiter
+import sms_queue
+from sms_queue import DeliveryRecorder, FakeProvider, SMSQueue
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """테스트마다 새로 만드는 SQLite DB의 세션 팩토리"""
+    engine = create_db_engine(f"sqlite:///{tmp_path}/test.db", busy_timeout_ms=30000)
+    Base.metadata.create_all(bind=engine)
+    instrument_queries(engine)  # 요청별 쿼리 예산 검사용 (test_query_budgets.py)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(session_factory, tmp_path):
+    """같은 테스트 DB를 쓰는 비동기 세션 팩토리
+    (TestClient/asyncio.run 호출마다 이벤트 루프가 바뀌므로 연결을 풀링하지 않음)"""
+    engine = create_async_db_engine(f"sqlite:///{tmp_path}/test.db", busy_timeout_ms=30000, poolclass=NullPool)
+    instrument_queries(engine.sync_engine)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory, async_session_factory):
+    """get_db / get_async_db를 테스트 DB로 바꾼 TestClient"""
+    import main
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    response_cache.clear()
+    principal_cache.clear()
+    asyncio.run(get_rate_limiter().clear())
+    # SMS는 발송 없이 큐에만 쌓이도록 테스트마다 새 큐 사용 (워커는 시작하지 않음)
+    sms_queue._sms_queue = SMSQueue(provider=FakeProvider(latency=0), recorder=DeliveryRecorder(session_factory))
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+    sms_queue._sms_queue = None
+
+
+def make_user(db, index: int = 1, **fields) -> User:
+    """테스트용 사용자 생성"""
+    values = dict(
+        name=f"User {index}",
+        phone_number=f"010-0000-{index:04d}",
+        email=f"user{index}@example.com",
+        gender="OTHER",
+        chess_experience="KNOW_RULES_ONLY",
+        total_visits=1,
+    )
+    values.update(fields)
+    user = User(**values)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def auth_headers(user: User) -> dict:
+    token = create_access_token(data={"user_id": user.id, "phone_number": user.phone_number})
+    return {"Authorization": f"Bearer {token}"}
@@ -1,34 +1,47 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from datetime import datetime
 import os
 
+from db_backends import backend_name, create_async_db_engine, create_db_engine, normalize_url, sync_pool_overrides
+from storage import DB_FILENAME, resolve_data_dir, restore_if_missing, sqlite_path
+
 # 데이터베이스 URL 설정
-# Railway나 다른 클라우드 환경: /tmp 디렉토리 사용 (쓰기 가능)
+# DATA_DIR이 지정되면 그 디렉토리(영구 디스크/볼륨 마운트 경로)에 SQLite DB 저장
+# 지정되지 않은 Railway나 다른 클라우드 환경: /tmp 디렉토리 사용 (재배포 시 초기화됨)
 # 로컬 환경: 현재 디렉토리 사용
 # Railway 환경 감지: RAILWAY_ENVIRONMENT, RAILWAY_STATIC_URL, PORT 등의 변수 확인
 is_production = os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("RAILWAY_STATIC_URL") or (os.getenv("PORT") and not os.path.exists("./venv"))
 
-if is_production:
-    # Railway/클라우드 환경에서는 /tmp 디렉토리에 SQLite DB 저장
-    SQLALCHEMY_DATABASE_URL = "sqlite:////tmp/community_control.db"
-    print(f"🌐 Production environment detected - using /tmp for database")
+if os.getenv("DATABASE_URL"):
+    # 명시적으로 지정된 DB (PostgreSQL 등)
+    SQLALCHEMY_DATABASE_URL = normalize_url(os.environ["DATABASE_URL"])
+    print(f"🗄️  Using DATABASE_URL ({backend_name(SQLALCHEMY_DATABASE_URL)} backend)")
 else:
-    # 로컬 개발 환경
-    SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./community_control.db")
-    print(f"💻 Local environment detected - using local directory for database")
+    DATA_DIR = resolve_data_dir(bool(is_production))
+    SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(DATA_DIR, DB_FILENAME)}"
+    if is_production:
+        print(f"🌐 Production environment detected - using {DATA_DIR} for database")
+    else:
+        print(f"💻 Local environment detected - using {DATA_DIR} for database")
+
+# SQLite 파일 경로 (스냅샷/복원 대상, PostgreSQL이면 None)
+DATABASE_FILE = sqlite_path(SQLALCHEMY_DATABASE_URL)
 
-# DB 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    # SQLite 사용 시 필수 옵션
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
+# DB 엔진 생성 (백엔드별 프로파일: SQLite WAL/PRAGMA, PostgreSQL 커넥션 풀)
+# 동기 엔진은 마이그레이션 / 백그라운드 작업 전용이라 작은 풀 사용 (요청 경로는 아래 비동기 엔진)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL, **sync_pool_overrides(SQLALCHEMY_DATABASE_URL))
 
 # 세션 생성기
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진/세션 (요청 처리 중 이벤트 루프를 막지 않는 경로: 인증, 모임, SMS)
+# expire_on_commit=False: 커밋 후 속성 접근이 지연 로딩(동기 I/O)을 일으키지 않도록 함
+async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # 모델 정의를 위한 기본 클래스
 Base = declarative_base()
 
@@ -37,6 +50,18 @@ Base = declarative_base()
 # --------------------
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # 소셜 로그인 조회 (social_provider, social_id) - 소셜 계정만 담는 부분 인덱스
+        Index(
+            "ix_users_social_provider_id", "social_provider", "social_id", unique=True,
+            sqlite_where=text("social_id IS NOT NULL"),
+            postgresql_where=text("social_id IS NOT NULL"),
+        ),
+        # 관리자 대시보드: 이름 접두사 검색, 방문 횟수 / 가입일 정렬 키셋 페이지네이션 (admin_dashboard.py)
+        Index("ix_users_name", "name"),
+        Index("ix_users_total_visits_id", "total_visits", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -56,7 +81,7 @@ class User(Base):
     social_provider = Column(String, nullable=True)  # 'apple', 'kakao', null (일반 로그인)
     social_id = Column(String, nullable=True, unique=True)  # 소셜 제공자의 고유 ID
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # 가입일 정렬 키셋 커서 (NULL 불가)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계: User와 Meeting의 다대다 관계
@@ -67,13 +92,19 @@ class User(Base):
 # --------------------
 class VerificationCode(Base):
     __tablename__ = "verification_codes"
+    __table_args__ = (
+        # 인증 코드 확인 (phone_number, code)
+        Index("ix_verification_codes_phone_code", "phone_number", "code"),
+        # 만료 코드 정리 (code_sweeper)
+        Index("ix_verification_codes_expires_at", "expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    phone_number = Column(String, index=True, nullable=False)
+    phone_number = Column(String, nullable=False)  # ix_verification_codes_phone_code
     code = Column(String, nullable=False)
     # 💡 쿨다운 로직을 위해 추가된 필드: 코드가 생성된 시간 기록
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False) 
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # ix_verification_codes_expires_at
 
 
 # --------------------
@@ -81,13 +112,24 @@ class VerificationCode(Base):
 # --------------------
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # 목록 키셋 페이지네이션 (date_time, id) 순서 그대로 읽도록 복합 인덱스
+        Index("ix_meetings_date_time_id", "date_time", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)  # 모임 제목
-    date_time = Column(DateTime, nullable=False)  # 모임 날짜 및 시간
+    date_time = Column(DateTime, nullable=False)  # 모임 날짜 및 시간 (ix_meetings_date_time_id)
     location = Column(String, nullable=False)  # 모임 장소
     capacity = Column(Integer, nullable=False)  # 정원
+    # 💡 좌석 카운터 (reservations.py에서 원자적으로 증감, COUNT 쿼리 대체)
+    confirmed_count = Column(Integer, default=0, server_default="0", nullable=False)
+    pending_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # 💡 대기자 순번 발급용 시퀀스 (대기 등록마다 1씩 증가)
+    waitlist_seq = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 💡 행 버전 (모임 또는 참가 기록이 바뀔 때마다 갱신, ETag 계산에 사용)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계: Meeting과 User의 다대다 관계
     participants = relationship("UserMeeting", back_populates="meeting")
@@ -98,11 +140,19 @@ class Meeting(Base):
 # --------------------
 class UserMeeting(Base):
     __tablename__ = "user_meetings"
+    # 한 사용자는 모임당 하나의 참가 기록만 가질 수 있음
+    __table_args__ = (
+        UniqueConstraint("user_id", "meeting_id", name="uq_user_meetings_user_meeting"),
+        # 다음 대기자 조회 (meeting_id, status='WAITLISTED' ORDER BY waitlist_position)
+        # (meeting_id, status) 조회와 meeting_id 단독 조회도 이 인덱스의 앞부분을 사용
+        Index("ix_user_meetings_waitlist", "meeting_id", "status", "waitlist_position"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # User 테이블 외래키
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)  # Meeting 테이블 외래키
-    status = Column(String, default="CONFIRMED", nullable=False)  # 참가 상태 (CONFIRMED, CANCELLED)
+    status = Column(String, default="CONFIRMED", nullable=False)  # 참가 상태 (CONFIRMED, PENDING, WAITLISTED, CANCELLED)
+    waitlist_position = Column(Integer, nullable=True)  # 대기 순번 (WAITLISTED일 때만 사용)
     registered_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # 관계 정의
@@ -110,16 +160,61 @@ class UserMeeting(Base):
     meeting = relationship("Meeting", back_populates="participants")
 
 
+# --------------------
+# 5. SMS 발송 기록 모델 (SMSDelivery Model)
+# --------------------
+class SMSDelivery(Base):
+    __tablename__ = "sms_deliveries"
+    __table_args__ = (
+        # 번호별 최근 발송 기록 조회
+        Index("ix_sms_deliveries_phone_created", "phone_number", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    message_id = Column(String, nullable=False, unique=True)  # 큐에서 발급한 메시지 ID
+    phone_number = Column(String, nullable=False)  # 수신 번호 (국가코드 포함)
+    provider = Column(String, nullable=False)  # twilio, console, fake
+    status = Column(String, nullable=False)  # SENT, FAILED
+    attempts = Column(Integer, nullable=False)
+    provider_message_id = Column(String, nullable=True)  # 예: Twilio Message SID
+    error = Column(String, nullable=True)  # 마지막 실패 사유
+    created_at = Column(DateTime, nullable=False)  # 큐에 들어간 시각
+    completed_at = Column(DateTime, nullable=False)  # 발송 완료 / 최종 실패 시각
+
+
+# --------------------
+# 6. 회원 통계 롤업 모델 (UserStat Model)
+# --------------------
+class UserStat(Base):
+    """성별 / 체스 경험 / 레이팅 / 방문 횟수 구간별 회원 수 (user_stats.py가 User 변경과 같은 트랜잭션에서 갱신)"""
+    __tablename__ = "user_stats"
+
+    dimension = Column(String, primary_key=True)  # total, gender, chess_experience, chess_rating, total_visits
+    bucket = Column(String, primary_key=True)  # 값 또는 구간 이름 (예: MALE, 2-4)
+    count = Column(Integer, nullable=False, default=0)
+
+
 # --------------------
 # 데이터베이스 초기화 및 유틸리티 함수
 # --------------------
 def init_db():
-    """데이터베이스에 정의된 모든 테이블을 생성합니다."""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
-
-# FastAPI의 의존성 주입(Dependency Injection)을 위한 함수 
+    """
+    DB 파일이 없으면 스냅샷에서 복원하고, 스키마를 최신 버전으로 맞춥니다 (schema_migrations).
+    이미 최신이면 schema_version 조회 한 번으로 끝납니다.
+    """
+    from schema_migrations import ensure_schema
+
+    # 재배포 등으로 DB 파일이 없으면 최근 스냅샷에서 복원 (엔진이 연결하기 전에 실행)
+    if DATABASE_FILE:
+        restored = restore_if_missing(DATABASE_FILE)
+        if restored:
+            print(f"💾 Database restored from snapshot {restored}")
+
+    applied = ensure_schema(engine)
+    if applied:
+        print(f"Database schema migrated: {applied}")
+
+# 동기 세션 의존성 (스크립트 / 테스트용, API 엔드포인트는 get_async_db 사용)
 def get_db():
     db = SessionLocal()
     try:
@@ -127,5 +222,14 @@ def get_db():
     finally:
         db.close()
 
+# 비동기 엔드포인트용 의존성
+# 동기 Session 기반 도메인 함수(reservations, meeting_listing)는 db.run_sync(...)로 호출합니다.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# User 추가/수정/삭제 시 회원 통계 롤업(user_stats)을 같은 트랜잭션에서 갱신하는 세션 리스너 등록
+import user_stats  # noqa: E402,F401
+
 if __name__ == "__main__":
     init_db()
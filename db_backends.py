@@ -0,0 +1,177 @@
+"""
+데이터베이스 백엔드 프로파일
+
+DATABASE_URL의 스킴에 따라 엔진 설정을 고릅니다.
+- SQLite: 연결마다 WAL, synchronous=NORMAL, busy_timeout, mmap 등 PRAGMA 적용
+  (동시 쓰기 시 "database is locked" 대신 잠금 해제를 기다리고, 읽기는 쓰기를 막지 않음)
+- PostgreSQL: 커넥션 풀 크기/오버플로, pre-ping, 재활용 주기, statement_timeout 설정
+  요청 처리는 비동기 엔진만 사용하고 동기 엔진은 시작 시 마이그레이션과 백그라운드 작업
+  (SMS 발송 기록, 만료 코드 정리)만 쓰므로 동기 풀은 작게 둡니다.
+  최대 연결 수 = DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_SYNC_POOL_SIZE + DB_SYNC_MAX_OVERFLOW
+
+create_async_db_engine()은 같은 프로파일을 비동기 드라이버(aiosqlite, asyncpg)로 적용합니다.
+"""
+import os
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+# SQLite 프로파일
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("DB_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("DB_SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+# PostgreSQL 프로파일
+POSTGRES_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POSTGRES_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POSTGRES_SYNC_POOL_SIZE = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+POSTGRES_SYNC_MAX_OVERFLOW = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "1"))
+POSTGRES_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+POSTGRES_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+POSTGRES_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+
+def normalize_url(url: str) -> str:
+    """Render/Heroku 형식의 postgres:// URL을 SQLAlchemy 형식으로 변환"""
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def backend_name(url: str) -> str:
+    """URL의 백엔드 이름 ("sqlite", "postgresql", ...)"""
+    return make_url(normalize_url(url)).get_backend_name()
+
+
+def is_memory_sqlite(url: str) -> bool:
+    database = make_url(normalize_url(url)).database
+    return not database or database == ":memory:"
+
+
+def sqlite_pragmas(busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS, memory: bool = False) -> Dict[str, Any]:
+    """연결마다 실행할 PRAGMA (메모리 DB는 WAL/mmap을 지원하지 않음)"""
+    pragmas: Dict[str, Any] = {
+        "busy_timeout": busy_timeout_ms,
+        "temp_store": "MEMORY",
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+    }
+    if not memory:
+        pragmas.update({
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": SQLITE_MMAP_SIZE,
+        })
+    return pragmas
+
+
+def postgres_engine_options(
+    pool_size: int = POSTGRES_POOL_SIZE,
+    max_overflow: int = POSTGRES_MAX_OVERFLOW,
+    statement_timeout_ms: int = POSTGRES_STATEMENT_TIMEOUT_MS,
+) -> Dict[str, Any]:
+    """PostgreSQL 엔진 옵션 (psycopg2 기준)"""
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {"options": f"-c statement_timeout={statement_timeout_ms}"},
+    }
+
+
+def sync_pool_overrides(url: str) -> Dict[str, Any]:
+    """동기(백그라운드 작업용) 엔진의 풀 크기 (PostgreSQL만 해당)"""
+    if backend_name(url) != "postgresql":
+        return {}
+    return {"pool_size": POSTGRES_SYNC_POOL_SIZE, "max_overflow": POSTGRES_SYNC_MAX_OVERFLOW}
+
+
+def async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환 (sqlite -> aiosqlite, postgresql -> asyncpg)"""
+    parsed = make_url(normalize_url(url))
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    return parsed.render_as_string(hide_password=False)
+
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str, **overrides) -> Engine:
+    """
+    백엔드 프로파일을 적용한 엔진 생성
+
+    Args:
+        url: 데이터베이스 URL (postgres:// 형식도 허용)
+        overrides: 프로파일 값 덮어쓰기
+            SQLite - busy_timeout_ms
+            PostgreSQL - pool_size, max_overflow, statement_timeout_ms
+            그 외 키워드는 create_engine()에 그대로 전달
+    """
+    url = normalize_url(url)
+    backend = backend_name(url)
+
+    if backend == "sqlite":
+        memory = is_memory_sqlite(url)
+        pragmas = sqlite_pragmas(overrides.pop("busy_timeout_ms", SQLITE_BUSY_TIMEOUT_MS), memory=memory)
+        # busy_timeout PRAGMA가 잠금 대기를 담당하므로 드라이버 timeout도 같은 값으로 맞춤
+        connect_args = {"check_same_thread": False, "timeout": pragmas["busy_timeout"] / 1000}
+        connect_args.update(overrides.pop("connect_args", {}))
+        engine = create_engine(url, connect_args=connect_args, **overrides)
+        _install_sqlite_pragmas(engine, pragmas)
+        return engine
+
+    if backend == "postgresql":
+        options = postgres_engine_options(
+            pool_size=overrides.pop("pool_size", POSTGRES_POOL_SIZE),
+            max_overflow=overrides.pop("max_overflow", POSTGRES_MAX_OVERFLOW),
+            statement_timeout_ms=overrides.pop("statement_timeout_ms", POSTGRES_STATEMENT_TIMEOUT_MS),
+        )
+        options.update(overrides)
+        return create_engine(url, **options)
+
+    return create_engine(url, **overrides)
+
+
+def create_async_db_engine(url: str, **overrides) -> AsyncEngine:
+    """
+    백엔드 프로파일을 적용한 비동기 엔진 생성 (create_db_engine과 같은 overrides 사용)
+    """
+    url = normalize_url(url)
+    backend = backend_name(url)
+
+    if backend == "sqlite":
+        memory = is_memory_sqlite(url)
+        pragmas = sqlite_pragmas(overrides.pop("busy_timeout_ms", SQLITE_BUSY_TIMEOUT_MS), memory=memory)
+        connect_args = {"check_same_thread": False, "timeout": pragmas["busy_timeout"] / 1000}
+        connect_args.update(overrides.pop("connect_args", {}))
+        engine = create_async_engine(async_url(url), connect_args=connect_args, **overrides)
+        _install_sqlite_pragmas(engine.sync_engine, pragmas)
+        return engine
+
+    if backend == "postgresql":
+        statement_timeout_ms = overrides.pop("statement_timeout_ms", POSTGRES_STATEMENT_TIMEOUT_MS)
+        options = postgres_engine_options(
+            pool_size=overrides.pop("pool_size", POSTGRES_POOL_SIZE),
+            max_overflow=overrides.pop("max_overflow", POSTGRES_MAX_OVERFLOW),
+        )
+        # asyncpg는 libpq options 대신 server_settings로 세션 설정을 받음
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout_ms)}}
+        options.update(overrides)
+        return create_async_engine(async_url(url), **options)
+
+    return create_async_engine(async_url(url), **overrides)
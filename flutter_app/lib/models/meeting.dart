@@ -13,6 +13,16 @@ class Meeting {
   final int capacity;
   @JsonKey(name: 'created_at')
   final DateTime createdAt;
+  // 확정 + 신청 중 인원 (서버 좌석 카운터)
+  @JsonKey(name: 'participant_count', defaultValue: 0)
+  final int participantCount;
+  @JsonKey(name: 'confirmed_count', defaultValue: 0)
+  final int confirmedCount;
+  @JsonKey(name: 'pending_count', defaultValue: 0)
+  final int pendingCount;
+  @JsonKey(name: 'waitlist_count', defaultValue: 0)
+  final int waitlistCount;
+  // include=participants로 요청한 경우에만 채워짐
   final List<UserMeeting>? participants;
 
   Meeting({
@@ -22,6 +32,10 @@ class Meeting {
     required this.location,
     required this.capacity,
     required this.createdAt,
+    this.participantCount = 0,
+    this.confirmedCount = 0,
+    this.pendingCount = 0,
+    this.waitlistCount = 0,
     this.participants,
   });
 
@@ -29,13 +43,8 @@ class Meeting {
       _$MeetingFromJson(json);
   Map<String, dynamic> toJson() => _$MeetingToJson(this);
 
-  // 현재 참가자 수 계산
-  int get currentParticipants {
-    if (participants == null) return 0;
-    return participants!
-        .where((p) => p.status == 'CONFIRMED' || p.status == 'PENDING')
-        .length;
-  }
+  // 현재 참가자 수 (목록 응답의 participants는 기본적으로 비어 있으므로 participant_count 사용)
+  int get currentParticipants => participantCount;
 
   // 참가 가능 여부
   bool get isAvailable {
@@ -49,6 +58,58 @@ class Meeting {
   }
 }
 
+// 모임 참가 신청 결과 (201: 참가 확정, 202: 정원 초과로 대기자 등록)
+@JsonSerializable()
+class MeetingRegistration {
+  final String message;
+  @JsonKey(name: 'registration_id')
+  final int registrationId;
+  final String? status;
+  @JsonKey(name: 'waitlist_position')
+  final int? waitlistPosition;
+  @JsonKey(name: 'waitlist_size')
+  final int? waitlistSize;
+
+  MeetingRegistration({
+    required this.message,
+    required this.registrationId,
+    this.status,
+    this.waitlistPosition,
+    this.waitlistSize,
+  });
+
+  factory MeetingRegistration.fromJson(Map<String, dynamic> json) =>
+      _$MeetingRegistrationFromJson(json);
+  Map<String, dynamic> toJson() => _$MeetingRegistrationToJson(this);
+
+  // 대기자 명단에 등록되었는지 여부
+  bool get isWaitlisted => status == 'WAITLISTED';
+}
+
+// 대기 순번 조회 결과 (승격되면 status가 CONFIRMED, position은 null)
+@JsonSerializable()
+class WaitlistPosition {
+  @JsonKey(name: 'meeting_id')
+  final int meetingId;
+  final String status;
+  final int? position;
+  @JsonKey(name: 'waitlist_size')
+  final int waitlistSize;
+
+  WaitlistPosition({
+    required this.meetingId,
+    required this.status,
+    this.position,
+    required this.waitlistSize,
+  });
+
+  factory WaitlistPosition.fromJson(Map<String, dynamic> json) =>
+      _$WaitlistPositionFromJson(json);
+  Map<String, dynamic> toJson() => _$WaitlistPositionToJson(this);
+
+  bool get isWaitlisted => status == 'WAITLISTED';
+}
+
 // 모임 생성 요청 모델
 @JsonSerializable()
 class MeetingCreate {
@@ -13,6 +13,10 @@ Meeting _$MeetingFromJson(Map<String, dynamic> json) => Meeting(
       location: json['location'] as String,
       capacity: (json['capacity'] as num).toInt(),
       createdAt: DateTime.parse(json['created_at'] as String),
+      participantCount: (json['participant_count'] as num?)?.toInt() ?? 0,
+      confirmedCount: (json['confirmed_count'] as num?)?.toInt() ?? 0,
+      pendingCount: (json['pending_count'] as num?)?.toInt() ?? 0,
+      waitlistCount: (json['waitlist_count'] as num?)?.toInt() ?? 0,
       participants: (json['participants'] as List<dynamic>?)
           ?.map((e) => UserMeeting.fromJson(e as Map<String, dynamic>))
           .toList(),
@@ -25,9 +29,48 @@ Map<String, dynamic> _$MeetingToJson(Meeting instance) => <String, dynamic>{
       'location': instance.location,
       'capacity': instance.capacity,
       'created_at': instance.createdAt.toIso8601String(),
+      'participant_count': instance.participantCount,
+      'confirmed_count': instance.confirmedCount,
+      'pending_count': instance.pendingCount,
+      'waitlist_count': instance.waitlistCount,
       'participants': instance.participants,
     };
 
+MeetingRegistration _$MeetingRegistrationFromJson(Map<String, dynamic> json) =>
+    MeetingRegistration(
+      message: json['message'] as String,
+      registrationId: (json['registration_id'] as num).toInt(),
+      status: json['status'] as String?,
+      waitlistPosition: (json['waitlist_position'] as num?)?.toInt(),
+      waitlistSize: (json['waitlist_size'] as num?)?.toInt(),
+    );
+
+Map<String, dynamic> _$MeetingRegistrationToJson(
+        MeetingRegistration instance) =>
+    <String, dynamic>{
+      'message': instance.message,
+      'registration_id': instance.registrationId,
+      'status': instance.status,
+      'waitlist_position': instance.waitlistPosition,
+      'waitlist_size': instance.waitlistSize,
+    };
+
+WaitlistPosition _$WaitlistPositionFromJson(Map<String, dynamic> json) =>
+    WaitlistPosition(
+      meetingId: (json['meeting_id'] as num).toInt(),
+      status: json['status'] as String,
+      position: (json['position'] as num?)?.toInt(),
+      waitlistSize: (json['waitlist_size'] as num).toInt(),
+    );
+
+Map<String, dynamic> _$WaitlistPositionToJson(WaitlistPosition instance) =>
+    <String, dynamic>{
+      'meeting_id': instance.meetingId,
+      'status': instance.status,
+      'position': instance.position,
+      'waitlist_size': instance.waitlistSize,
+    };
+
 MeetingCreate _$MeetingCreateFromJson(Map<String, dynamic> json) =>
     MeetingCreate(
       title: json['title'] as String,
@@ -33,17 +33,35 @@ class MeetingProvider with ChangeNotifier {
     }
   }
 
-  /// 모임 참가 신청
-  Future<void> registerForMeeting(int meetingId) async {
+  /// 모임 참가 신청 (정원이 찼으면 대기자로 등록된 결과 반환)
+  Future<MeetingRegistration> registerForMeeting(int meetingId) async {
     try {
-      await _meetingService.registerForMeeting(meetingId);
+      final registration =
+          await _meetingService.registerForMeeting(meetingId);
       // 성공 후 모임 목록 새로고침
       await fetchMeetings();
+      return registration;
     } catch (e) {
       rethrow;
     }
   }
 
+  /// 모임 참가 취소
+  Future<void> cancelRegistration(int meetingId) async {
+    try {
+      await _meetingService.cancelRegistration(meetingId);
+      // 취소 후 모임 목록 새로고침 (대기자 승격 반영)
+      await fetchMeetings();
+    } catch (e) {
+      rethrow;
+    }
+  }
+
+  /// 대기 순번 조회
+  Future<WaitlistPosition?> getWaitlistPosition(int meetingId) {
+    return _meetingService.getWaitlistPosition(meetingId);
+  }
+
   /// 모임 관심 등록
   Future<void> registerInterest(int meetingId) async {
     try {
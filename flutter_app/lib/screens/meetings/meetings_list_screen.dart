@@ -42,14 +42,21 @@ class _MeetingsListScreenState extends State<MeetingsListScreen> {
     if (confirmed != true) return;
 
     try {
-      await context.read<MeetingProvider>().registerForMeeting(meeting.id);
+      final registration =
+          await context.read<MeetingProvider>().registerForMeeting(meeting.id);
       
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
-          const SnackBar(
-            content: Text('모임 참가 신청이 완료되었습니다'),
-            backgroundColor: Colors.green,
-          ),
+          registration.isWaitlisted
+              ? SnackBar(
+                  content: Text(
+                      '정원이 찼습니다. 대기자 명단에 등록되었습니다 (대기 ${registration.waitlistPosition}번)'),
+                  backgroundColor: Colors.orange,
+                )
+              : const SnackBar(
+                  content: Text('모임 참가 신청이 완료되었습니다'),
+                  backgroundColor: Colors.green,
+                ),
         );
       }
     } catch (e) {
@@ -287,9 +294,10 @@ class _MeetingCard extends StatelessWidget {
                 ),
                 const SizedBox(width: 12),
                 Expanded(
+                  // 정원이 차도 신청 가능 (대기자 명단에 등록)
                   child: ElevatedButton(
-                    onPressed: meeting.isAvailable ? onRegister : null,
-                    child: const Text('참가 신청'),
+                    onPressed: onRegister,
+                    child: Text(meeting.isAvailable ? '참가 신청' : '대기 신청'),
                   ),
                 ),
               ],
@@ -7,40 +7,55 @@ class MeetingService {
 
   MeetingService({required ApiService apiService}) : _apiService = apiService;
 
-  /// 모든 모임 목록 조회
+  /// 다가오는 모임 목록 조회
+  ///
+  /// 서버는 페이지 단위로 응답하므로 X-Next-Cursor 헤더가 없을 때까지 다음 페이지를 이어서 읽습니다.
   Future<List<Meeting>> getAllMeetings() async {
     try {
-      final response = await _apiService.get('/meetings');
+      final meetings = <Meeting>[];
+      String? cursor;
+      do {
+        final response = await _apiService.get(
+          '/meetings',
+          queryParameters: {
+            'when': 'upcoming',
+            if (cursor != null) 'cursor': cursor,
+          },
+        );
 
-      if (response.statusCode == 200) {
+        if (response.statusCode != 200) {
+          throw Exception('모임 목록 조회 실패');
+        }
         final List<dynamic> data = response.data;
-        return data.map((json) => Meeting.fromJson(json)).toList();
-      } else {
-        throw Exception('모임 목록 조회 실패');
-      }
+        meetings.addAll(data.map((json) => Meeting.fromJson(json)));
+        cursor = response.headers.value('x-next-cursor');
+      } while (cursor != null);
+      return meetings;
     } on DioException catch (e) {
       throw Exception('모임 목록 조회 중 오류가 발생했습니다: ${e.message}');
     }
   }
 
   /// 모임 참가 신청 (인증 필요)
-  Future<Map<String, dynamic>> registerForMeeting(int meetingId) async {
+  ///
+  /// 정원이 찬 모임은 202와 함께 대기자 명단에 등록됩니다 (isWaitlisted, waitlistPosition).
+  Future<MeetingRegistration> registerForMeeting(int meetingId) async {
     try {
       final response = await _apiService.post(
         '/meetings/register',
         queryParameters: {'meeting_id': meetingId},
       );
 
-      if (response.statusCode == 201) {
-        return response.data;
+      if (response.statusCode == 201 || response.statusCode == 202) {
+        return MeetingRegistration.fromJson(response.data);
       } else {
         throw Exception('모임 참가 신청 실패');
       }
     } on DioException catch (e) {
       if (e.response?.statusCode == 401) {
         throw Exception('로그인이 필요합니다.');
-      } else if (e.response?.statusCode == 403) {
-        throw Exception('모임 정원이 초과되었습니다.');
+      } else if (e.response?.statusCode == 404) {
+        throw Exception('모임을 찾을 수 없습니다.');
       } else if (e.response?.statusCode == 409) {
         throw Exception('이미 참가 신청한 모임입니다.');
       }
@@ -48,6 +63,50 @@ class MeetingService {
     }
   }
 
+  /// 모임 참가 취소 (인증 필요, 대기자 명단에서 빠지는 경우 포함)
+  Future<Map<String, dynamic>> cancelRegistration(int meetingId) async {
+    try {
+      final response = await _apiService.post(
+        '/meetings/cancel',
+        queryParameters: {'meeting_id': meetingId},
+      );
+
+      if (response.statusCode == 200) {
+        return response.data;
+      } else {
+        throw Exception('모임 참가 취소 실패');
+      }
+    } on DioException catch (e) {
+      if (e.response?.statusCode == 401) {
+        throw Exception('로그인이 필요합니다.');
+      } else if (e.response?.statusCode == 404) {
+        throw Exception('취소할 참가 신청이 없습니다.');
+      }
+      throw Exception('모임 참가 취소 중 오류가 발생했습니다: ${e.message}');
+    }
+  }
+
+  /// 대기 순번 조회 (인증 필요, 신청 내역이 없으면 null)
+  Future<WaitlistPosition?> getWaitlistPosition(int meetingId) async {
+    try {
+      final response =
+          await _apiService.get('/meetings/$meetingId/waitlist/position');
+
+      if (response.statusCode == 200) {
+        return WaitlistPosition.fromJson(response.data);
+      } else {
+        throw Exception('대기 순번 조회 실패');
+      }
+    } on DioException catch (e) {
+      if (e.response?.statusCode == 404) {
+        return null;
+      } else if (e.response?.statusCode == 401) {
+        throw Exception('로그인이 필요합니다.');
+      }
+      throw Exception('대기 순번 조회 중 오류가 발생했습니다: ${e.message}');
+    }
+  }
+
   /// 모임 관심 등록 (인증 필요)
   Future<Map<String, dynamic>> registerInterest(int meetingId) async {
     try {
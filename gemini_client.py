@@ -0,0 +1,228 @@
+"""
+Gemini REST API 비동기 클라이언트
+
+/api/chat (RAGChatbot)과 /parse_cs가 함께 사용하는 프로세스 공용 클라이언트입니다.
+- httpx.AsyncClient 하나로 커넥션 풀과 HTTP/2 keep-alive 재사용
+- asyncio.Semaphore로 동시 호출 수 제한
+- 요청마다 전체 데드라인 (대기 + 전송 + 응답) 적용
+"""
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from metrics import track_upstream
+
+load_dotenv()
+
+GEMINI_API_URL = os.getenv(
+    "GEMINI_API_URL",
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent",
+)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+
+
+class GeminiError(Exception):
+    """Gemini API 호출 실패 (HTTP 오류, 응답 형식 오류, 네트워크 오류)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GeminiTimeoutError(GeminiError):
+    """요청 데드라인 초과"""
+
+
+class GeminiNetworkError(GeminiError):
+    """연결 실패 등 응답을 받지 못한 네트워크 오류"""
+
+
+class GeminiClient:
+    """커넥션 풀을 공유하는 Gemini generateContent 클라이언트"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        api_url: str = GEMINI_API_URL,
+        max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+        timeout: float = GEMINI_TIMEOUT_SECONDS,
+        http2: bool = True,
+    ):
+        self.api_key = api_key
+        self.api_url = api_url
+        # 스트리밍 엔드포인트 (Server-Sent Events)
+        self.stream_url = api_url.replace(":generateContent", ":streamGenerateContent") + "?alt=sse"
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._http2 = http2
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """지연 생성되는 공용 httpx.AsyncClient"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self._http2,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=60.0,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # 이벤트 루프 안에서 생성해야 하므로 지연 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def _build_payload(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        return payload
+
+    @staticmethod
+    def _candidate_text(result: Dict[str, Any]) -> str:
+        return result["candidates"][0]["content"]["parts"][0]["text"]
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.semaphore:
+            with track_upstream("gemini") as call:
+                response = await self.client.post(
+                    self.api_url,
+                    json=payload,
+                    headers={"x-goog-api-key": self.api_key or ""},
+                )
+                call.status_code = response.status_code
+        if response.status_code != 200:
+            raise GeminiError(
+                f"Gemini API error: {response.status_code} - {response.text}",
+                status_code=response.status_code,
+            )
+        return response.json()
+
+    async def generate(self, payload: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        generateContent 호출 후 JSON 응답을 반환합니다.
+
+        Args:
+            payload: generateContent 요청 본문
+            deadline: 세마포어 대기 시간을 포함한 전체 제한 시간 (초, 기본값: timeout)
+
+        Raises:
+            GeminiTimeoutError: 데드라인 초과
+            GeminiNetworkError: 네트워크 오류
+            GeminiError: HTTP 오류
+        """
+        try:
+            return await asyncio.wait_for(self._post(payload), timeout=deadline or self.timeout)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            raise GeminiTimeoutError("Gemini API request timed out")
+        except httpx.RequestError as e:
+            raise GeminiNetworkError(f"Gemini API request failed: {e}")
+
+    async def generate_text(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                            deadline: Optional[float] = None) -> str:
+        """
+        단일 프롬프트로 generateContent를 호출하고 첫 번째 후보의 텍스트를 반환합니다.
+
+        Raises:
+            GeminiError: 응답에 텍스트 후보가 없는 경우 포함
+        """
+        result = await self.generate(self._build_payload(prompt, generation_config), deadline=deadline)
+        try:
+            return self._candidate_text(result).strip()
+        except (KeyError, IndexError, TypeError):
+            raise GeminiError(f"Unexpected Gemini response structure: {result}")
+
+    async def stream_text(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                          first_chunk_deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        streamGenerateContent(SSE)를 호출하고 텍스트 조각을 도착하는 대로 반환합니다.
+
+        Args:
+            first_chunk_deadline: 세마포어 대기부터 응답 헤더 수신까지의 제한 시간 (초, 기본값: timeout).
+                                  이후 조각 사이의 대기는 httpx read timeout이 제한합니다.
+
+        Raises:
+            GeminiTimeoutError: 데드라인 초과
+            GeminiNetworkError: 네트워크 오류
+            GeminiError: HTTP 오류
+        """
+        deadline = first_chunk_deadline or self.timeout
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise GeminiTimeoutError("Gemini API request timed out")
+
+        try:
+            request = self.client.build_request(
+                "POST",
+                self.stream_url,
+                json=self._build_payload(prompt, generation_config),
+                headers={"x-goog-api-key": self.api_key or ""},
+            )
+            # 스트리밍은 응답 헤더 수신까지(첫 조각 대기 포함 전 구간이 아님)를 기록
+            with track_upstream("gemini_stream") as call:
+                response = await asyncio.wait_for(self.client.send(request, stream=True), timeout=deadline)
+                call.status_code = response.status_code
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise GeminiError(
+                        f"Gemini API error: {response.status_code} - {response.text}",
+                        status_code=response.status_code,
+                    )
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        text = self._candidate_text(json.loads(line[5:]))
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        continue
+                    if text:
+                        yield text
+            finally:
+                await response.aclose()
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            raise GeminiTimeoutError("Gemini API request timed out")
+        except httpx.RequestError as e:
+            raise GeminiNetworkError(f"Gemini API request failed: {e}")
+        finally:
+            self.semaphore.release()
+
+
+# Singleton instance
+_gemini_client: Optional[GeminiClient] = None
+
+
+def get_gemini_client() -> GeminiClient:
+    """Get shared Gemini client (singleton)"""
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = GeminiClient(api_key=os.getenv("GEMINI_API_KEY"))
+    return _gemini_client
+
+
+async def close_gemini_client():
+    """Close the shared client's connection pool (it is reopened lazily on next use)"""
+    if _gemini_client is not None:
+        await _gemini_client.aclose()
@@ -0,0 +1,139 @@
+"""
+읽기 위주 엔드포인트용 ETag / 조건부 GET / 응답 캐시
+
+- ETag는 행 버전(updated_at)과 요청 파라미터로 계산한 강한 ETag입니다.
+- If-None-Match가 일치하면 직렬화 없이 304를 반환합니다.
+- 직렬화된 본문은 (캐시 키, ETag) 단위로 짧은 TTL 동안 프로세스 메모리에 보관합니다.
+  ETag가 내용을 결정하므로 다른 워커의 쓰기가 있어도 잘못된 본문을 반환하지 않으며,
+  이 프로세스의 쓰기 경로는 invalidate(tag)로 관련 항목을 즉시 비웁니다.
+"""
+import hashlib
+import inspect
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from fastapi import Request, Response
+
+HTTP_CACHE_TTL_SECONDS = float(os.getenv("HTTP_CACHE_TTL_SECONDS", "10"))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "1024"))
+
+# 캐시 태그
+TAG_MEETINGS = "meetings"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def make_etag(*parts) -> str:
+    """행 버전 등으로부터 강한 ETag 생성"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인 (목록, *, W/ 접두어 지원)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """(캐시 키, ETag) -> 직렬화된 본문, 태그 기반 무효화를 지원하는 LRU + TTL 캐시"""
+
+    def __init__(self, ttl_seconds: float = HTTP_CACHE_TTL_SECONDS, max_entries: int = HTTP_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (etag, expires_at, body, tags)
+        self._entries: "OrderedDict[str, Tuple[str, float, bytes, Set[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != etag or entry[1] <= time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, key: str, etag: str, body: bytes, tags: Iterable[str] = ()):
+        self._entries[key] = (etag, time.monotonic() + self.ttl_seconds, body, set(tags))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *tags: str):
+        """태그가 하나라도 겹치는 항목 제거 (쓰기 경로에서 호출)"""
+        tag_set = set(tags)
+        for key in [key for key, entry in self._entries.items() if entry[3] & tag_set]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "size": len(self._entries),
+        }
+
+
+# Singleton instance
+response_cache = ResponseCache()
+
+
+def invalidate(*tags: str):
+    """공용 응답 캐시에서 태그에 해당하는 항목 제거"""
+    response_cache.invalidate(*tags)
+
+
+async def conditional_response(
+    request: Request,
+    cache_key: str,
+    etag: str,
+    render: Callable[[], Union[bytes, str, Awaitable[Union[bytes, str]]]],
+    tags: Iterable[str] = (),
+    media_type: str = "application/json",
+    cache_control: str = "no-cache",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    ETag 기반 조건부 응답.
+
+    1. If-None-Match 일치 -> 304 (render 호출 안 함)
+    2. 캐시에 같은 ETag의 본문이 있음 -> 캐시된 본문
+    3. 그 외 -> render() 결과를 캐시에 저장 후 반환 (render는 코루틴 함수여도 됨)
+    """
+    response_headers = {"ETag": etag, "Cache-Control": cache_control}
+    if headers:
+        response_headers.update(headers)
+
+    if etag_matches(request, etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=response_headers)
+
+    body = response_cache.get(cache_key, etag)
+    if body is None:
+        rendered = render()
+        if inspect.isawaitable(rendered):
+            rendered = await rendered
+        body = rendered.encode("utf-8") if isinstance(rendered, str) else rendered
+        response_cache.set(cache_key, etag, body, tags)
+
+    return Response(content=body, media_type=media_type, headers=response_headers)
@@ -0,0 +1,124 @@
+"""
+지식 베이스 검색용 역색인 (Inverted Index)
+
+knowledge_base.txt 섹션을 로드 시점에 한 번만 토큰화하여
+postings 리스트와 BM25 가중치를 미리 계산해 둡니다.
+질의 시에는 질의 토큰의 postings만 읽으므로 문서 수에 비례하는 전체 스캔이 없습니다.
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 접두어 확장(예: "fee" -> "fees") 시 부여하는 가중치
+PREFIX_MATCH_WEIGHT = 0.5
+# 한 질의 토큰이 접두어 확장으로 끌어올 수 있는 최대 어휘 수
+MAX_PREFIX_EXPANSIONS = 8
+# 한 용어에 대해 읽을 최대 postings 수 (가중치 내림차순으로 정렬되어 있음)
+MAX_POSTINGS_PER_TERM = 2000
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    텍스트를 색인용 토큰 리스트로 변환합니다.
+
+    영문/숫자는 단어 단위로, 한글이 포함된 단어는 단어 자체와 함께
+    2-gram 음절을 추가로 생성합니다. ("회비는" -> "회비는", "회비", "비는")
+    한국어 조사가 붙은 질의도 본문 단어와 매칭되도록 하기 위함입니다.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2 and _HANGUL_RE.search(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class KnowledgeIndex:
+    """BM25 가중치가 미리 계산된 postings 기반 역색인"""
+
+    def __init__(self, documents: List[str]):
+        """
+        Args:
+            documents: 색인할 섹션 본문 리스트 (리스트 순서가 문서 ID)
+        """
+        self.documents = documents
+        # term -> [(weight, doc_id), ...] (weight 내림차순)
+        self.postings: Dict[str, List[Tuple[float, int]]] = {}
+        self._build()
+        # 접두어 확장을 위한 정렬된 어휘 목록
+        self.vocabulary = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _build(self):
+        """문서를 토큰화하고 용어별 BM25 가중치를 postings에 저장합니다."""
+        term_freqs = []
+        doc_lengths = []
+        doc_freq: Counter = Counter()
+
+        for text in self.documents:
+            tf = Counter(tokenize(text))
+            term_freqs.append(tf)
+            doc_lengths.append(sum(tf.values()))
+            doc_freq.update(tf.keys())
+
+        n_docs = len(self.documents)
+        avg_len = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+
+        postings = defaultdict(list)
+        for doc_id, tf in enumerate(term_freqs):
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[doc_id] / avg_len) if avg_len else BM25_K1
+            for term, freq in tf.items():
+                df = doc_freq[term]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                weight = idf * freq * (BM25_K1 + 1) / (freq + length_norm)
+                postings[term].append((weight, doc_id))
+
+        for term, plist in postings.items():
+            plist.sort(reverse=True)
+            self.postings[term] = plist
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """질의 토큰을 (색인 용어, 가중치) 목록으로 확장합니다."""
+        expanded = []
+        if token in self.postings:
+            expanded.append((token, 1.0))
+
+        # 접두어 매칭: 정렬된 어휘에서 이분 탐색
+        start = bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                expanded.append((term, PREFIX_MATCH_WEIGHT))
+        return expanded
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[float, int]]:
+        """
+        질의와 관련된 상위 문서를 반환합니다.
+
+        Args:
+            query: 사용자 질의
+            top_k: 반환할 문서 수
+
+        Returns:
+            (score, doc_id) 튜플 리스트 (점수 내림차순)
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            for term, boost in self._expand(token):
+                for weight, doc_id in self.postings[term][:MAX_POSTINGS_PER_TERM]:
+                    scores[doc_id] += weight * boost
+
+        return heapq.nlargest(top_k, ((score, doc_id) for doc_id, score in scores.items()))
@@ -1,46 +1,53 @@
 from fastapi import FastAPI, HTTPException, status, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi import Request
+from fastapi import Request, Response, Query
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.middleware.cors import CORSMiddleware
 import secrets
 import uvicorn
-from twilio.rest import Client
 import os
 from datetime import datetime, timedelta
+from typing import Union
 import random
 from dotenv import load_dotenv
-from sqlalchemy.orm import Session, joinedload
-from database import VerificationCode, SessionLocal, User, Meeting, UserMeeting, get_db, init_db
-from schemas import SMSRequest, SMSVerify, UserCreate, UserOut, CSParseRequest, CSParseResponse, MeetingCreate, MeetingOut, UserMeetingInterest, LoginRequest, LoginResponse, AppleLoginRequest, KakaoLoginRequest, SocialLoginResponse, ChatRequest, ChatResponse, AdminLoginRequest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
+from database import VerificationCode, User, Meeting, UserMeeting, get_async_db, init_db, engine, async_engine, DATABASE_FILE
+from schemas import SMSRequest, SMSVerify, UserCreate, UserOut, CSParseRequest, CSParseResponse, MeetingCreate, MeetingOut, UserMeetingInterest, LoginRequest, LoginResponse, AppleLoginRequest, KakaoLoginRequest, SocialLoginResponse, ChatRequest, ChatResponse, AdminLoginRequest, WaitlistPositionOut, ProfilingConfigIn, UserStatsOut
 from sqlalchemy.exc import IntegrityError # For handling database integrity errors
 import json
-import requests
-from auth import create_access_token, get_current_user, get_current_user_optional
-from social_auth import verify_apple_token, get_kakao_user_info, extract_apple_user_info
+from urllib.parse import urlencode
+from auth import AuthenticatedUser, create_access_token, get_current_user, get_current_user_optional, invalidate_user
+from social_auth import verify_apple_token, get_kakao_user_info, extract_apple_user_info, init_kakao_client, close_kakao_client
+from http_cache import conditional_response, make_etag, invalidate, user_tag, TAG_MEETINGS
+from meeting_listing import list_meetings, serialize_meetings, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, WHEN_UPCOMING
+from admin_dashboard import list_users, DEFAULT_PAGE_SIZE as USERS_PAGE_SIZE, MAX_PAGE_SIZE as USERS_MAX_PAGE_SIZE
+from user_stats import read_stats, rebuild as rebuild_user_stats
+from reservations import reserve_seat, cancel_registration, get_waitlist_position, STATUS_CONFIRMED, STATUS_PENDING, STATUS_WAITLISTED
+from gemini_client import GeminiError, GeminiTimeoutError, get_gemini_client, close_gemini_client
+from storage import start_snapshots, stop_snapshots
+from code_sweeper import code_sweeper
+from request_logging import RequestLoggingMiddleware, logging_stats, start_logging, stop_logging
+from metrics import REGISTRY, MetricsMiddleware, instrument_engine
+from profiling import ProfilingMiddleware, get_profiler
+from query_tracking import QueryTrackingMiddleware, instrument_queries
+from sms_queue import SMSQueueFull, get_sms_queue, start_sms_queue, stop_sms_queue
+from rate_limit import (Decision, client_ip, close_rate_limiter, get_rate_limiter, SMS_REQUEST_COOLDOWN_SECONDS,
+                        SMS_REQUEST_IP_LIMIT, SMS_REQUEST_PHONE_LIMIT, SMS_REQUEST_WINDOW_SECONDS,
+                        SMS_VERIFY_IP_LIMIT, SMS_VERIFY_WINDOW_SECONDS)
 
 # .env 파일 로드
 load_dotenv()
 
-# Twilio 클라이언트 초기화
-TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
-TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
-TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# Check Twilio credentials
-if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN or not TWILIO_PHONE_NUMBER:
+# Check Twilio credentials (SMS is sent by the async queue in sms_queue.py)
+if not os.getenv("TWILIO_ACCOUNT_SID") or not os.getenv("TWILIO_AUTH_TOKEN") or not os.getenv("TWILIO_PHONE_NUMBER"):
     print("WARNING: Twilio environment variables are not fully set.")
-    twilio_client = None
-else:
-    twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
-# Gemini API configuration (REST API)
+# Gemini API configuration (REST API, shared async client in gemini_client.py)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
 if not GEMINI_API_KEY:
     print("WARNING: GEMINI_API_KEY environment variable is not set.")
@@ -55,8 +62,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],  # 웹 클라이언트가 페이지 커서를 읽을 수 있도록
 )
 
+# 목록 응답 직렬화용 (response_model 검증을 거치지 않고 JSON 바이트로 바로 변환)
+MEETING_LIST_ADAPTER = TypeAdapter(list[MeetingOut])
+
 # Basic Auth 설정 (운영자 페이지 보호용)
 security_basic = HTTPBasic()
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
@@ -64,16 +75,49 @@ ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 ADMIN_PHONE_NUMBER = os.getenv("ADMIN_PHONE_NUMBER")
 ADMIN_ACCESS_CODE = os.getenv("ADMIN_ACCESS_CODE")
+# Prometheus 스크레이퍼용 Bearer 토큰 (GET /metrics, 없으면 관리자 인증만 허용)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    print(f"🔵 Incoming request: {request.method} {request.url.path}")
-    print(f"   Client: {request.client.host if request.client else 'Unknown'}")
-    print(f"   Headers: {dict(request.headers)}")
-    response = await call_next(request)
-    print(f"✅ Response status: {response.status_code}")
-    return response
+def is_admin(admin_code: Union[str, None], current_user: Union[AuthenticatedUser, None]) -> bool:
+    """관리자 코드(ADMIN_ACCESS_CODE) 또는 관리자 계정(ADMIN_EMAIL / ADMIN_PHONE_NUMBER)의 JWT인지 확인"""
+    if ADMIN_ACCESS_CODE and admin_code and secrets.compare_digest(admin_code, ADMIN_ACCESS_CODE):
+        return True
+    if current_user is None:
+        return False
+    is_admin_email = ADMIN_EMAIL and current_user.email == ADMIN_EMAIL
+    is_admin_phone = ADMIN_PHONE_NUMBER and current_user.phone_number == ADMIN_PHONE_NUMBER
+    return bool(is_admin_email or is_admin_phone)
+
+
+async def require_admin(request: Request, current_user: AuthenticatedUser = Depends(get_current_user_optional)):
+    """관리자 API 의존성 (X-Admin-Code 헤더 또는 관리자 JWT, 아니면 401/403)"""
+    if is_admin(request.headers.get("X-Admin-Code"), current_user):
+        return
+    if current_user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Admin authentication required")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access restricted to admin")
+
+
+async def require_metrics_access(request: Request, current_user: AuthenticatedUser = Depends(get_current_user_optional)):
+    """GET /metrics 의존성 (Authorization: Bearer METRICS_TOKEN 또는 관리자 인증, 아니면 401/403)"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if METRICS_TOKEN and scheme.lower() == "bearer" and secrets.compare_digest(token, METRICS_TOKEN):
+        return
+    await require_admin(request, current_user)
+
+# Request logging middleware (JSON lines, 샘플링/헤더 가림은 request_logging.py)
+app.add_middleware(RequestLoggingMiddleware)
+# 라우트별 지연/처리 중 요청 수, SQL 실행 시간 (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+# 요청별 쿼리 수 / N+1 감지 (RequestLoggingMiddleware보다 바깥에 두어 액세스 로그에 db_queries 기록)
+app.add_middleware(QueryTrackingMiddleware)
+instrument_queries(engine)
+instrument_queries(async_engine.sync_engine)
+# 관리자가 켤 때만 동작하는 요청 프로파일러 (/admin/profiling, 꺼져 있으면 통과만 함)
+app.add_middleware(ProfilingMiddleware)
 
 # Health check endpoint
 @app.get("/health")
@@ -90,6 +134,7 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """Initialize database tables on application startup"""
+    start_logging()
     try:
         print("=" * 60)
         print("🚀 Starting Seoul Chess Club API...")
@@ -107,6 +152,10 @@ async def startup_event():
 
         # Initialize database
         init_db()
+        if DATABASE_FILE:
+            start_snapshots(DATABASE_FILE)
+        code_sweeper.start()
+        start_sms_queue()
         print("✅ Database initialized successfully!")
         print("=" * 60)
 
@@ -124,6 +173,9 @@ async def startup_event():
             print(f"⚠️  RAG Chatbot initialization failed: {chatbot_error}")
             print("   App will continue running but chatbot features will be disabled")
 
+        # Shared Kakao connection pool (reused by every /auth/kakao request)
+        init_kakao_client()
+
         print("=" * 60)
         print("✅ Application startup completed successfully!")
         print("=" * 60)
@@ -135,6 +187,18 @@ async def startup_event():
         # Don't raise - let the app start even if there are issues
         print("⚠️  Application will continue but some features may not work")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled upstream connections on application shutdown"""
+    await close_gemini_client()
+    await close_kakao_client()
+    await stop_sms_queue()
+    await code_sweeper.stop()
+    await close_rate_limiter()
+    await stop_snapshots()
+    await async_engine.dispose()
+    stop_logging()
+
 # Static files serving (check directory exists)
 try:
     if os.path.exists("static"):
@@ -178,33 +242,34 @@ async def root(request: Request):
 async def dashboard(
     request: Request,
     code: str = None,
-    current_user: User = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    q: str = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    cursor: str = None,
+    current_user: AuthenticatedUser = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Admin dashboard page"""
-    # 1) Check admin code in query param or header
-    admin_code_header = request.headers.get("X-Admin-Code")
-    admin_code = code or admin_code_header
-
-    if ADMIN_ACCESS_CODE and admin_code and secrets.compare_digest(admin_code, ADMIN_ACCESS_CODE):
-        # Admin code valid - allow access
-        pass
-    elif current_user is not None:
-        # 2) JWT-based admin check
-        is_admin_email = ADMIN_EMAIL and current_user.email == ADMIN_EMAIL
-        is_admin_phone = ADMIN_PHONE_NUMBER and current_user.phone_number == ADMIN_PHONE_NUMBER
-        if not (is_admin_email or is_admin_phone):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access restricted to admin"
-            )
-    else:
-        # No valid auth - redirect to login
-        return RedirectResponse(url="/admin-login", status_code=302)
+    """Admin dashboard page - 회원 한 페이지(검색/정렬) + 롤업 통계만 읽어서 렌더링"""
+    # 관리자 코드(쿼리 파라미터 또는 X-Admin-Code 헤더) 또는 관리자 JWT
+    if not is_admin(code or request.headers.get("X-Admin-Code"), current_user):
+        if current_user is None:
+            # No valid auth - redirect to login
+            return RedirectResponse(url="/admin-login", status_code=302)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access restricted to admin"
+        )
 
-    # Get all users
-    users = db.query(User).all()
-    return templates.TemplateResponse("dashboard.html", {"request": request, "users": users})
+    users, next_cursor = await db.run_sync(list_users, cursor=cursor, q=q, sort=sort, order=order)
+    stats = await db.run_sync(read_stats)
+    next_url = None
+    if next_cursor:
+        next_params = {"code": code, "q": q, "sort": sort, "order": order, "cursor": next_cursor}
+        next_url = "/dashboard?" + urlencode({key: value for key, value in next_params.items() if value})
+    return templates.TemplateResponse("dashboard.html", {
+        "request": request, "users": users, "stats": stats, "next_url": next_url,
+        "q": q or "", "sort": sort, "order": order, "code": code,
+    })
 
 @app.get("/register_form", response_class=HTMLResponse)
 async def register_form(request: Request):
@@ -232,22 +297,43 @@ async def admin_login_page(request: Request):
     return templates.TemplateResponse("admin-login.html", {"request": request})
 
 @app.get("/meetings_list", response_class=HTMLResponse)
-async def meetings_list(request: Request, db: Session = Depends(get_db)):
-    """모임 목록 페이지 - 모든 활성화된 모임을 표시"""
-    # 모든 활성화된 모임 조회
-    meetings = db.query(Meeting).all()
-    return templates.TemplateResponse("meetings_list.html", {"request": request, "meetings": meetings})
+async def meetings_list(request: Request, cursor: str = None, db: AsyncSession = Depends(get_async_db)):
+    """모임 목록 페이지 - 다가오는 모임만 페이지 단위로 표시 (지난 모임은 GET /meetings?when=past)"""
+    meetings, next_cursor = await db.run_sync(list_meetings, cursor=cursor, when=WHEN_UPCOMING)
+    
+    # 페이지에 포함된 모임의 행 버전으로 ETag 계산 (변경 없으면 304, 렌더링 생략)
+    etag = make_etag("meetings_list", cursor, [(m.id, m.updated_at) for m in meetings], next_cursor)
+    return await conditional_response(
+        request,
+        cache_key=f"meetings_list:{cursor}",
+        etag=etag,
+        render=lambda: templates.get_template("meetings_list.html").render(
+            {"request": request, "meetings": meetings, "next_cursor": next_cursor}
+        ),
+        tags=[TAG_MEETINGS],
+        media_type="text/html"
+    )
+
+async def user_response(request: Request, user: Union[User, AuthenticatedUser]) -> Response:
+    """UserOut 조건부 응답 (ETag = 사용자 행 버전)"""
+    return await conditional_response(
+        request,
+        cache_key=f"user:{user.id}",
+        etag=make_etag("user", user.id, user.updated_at),
+        render=lambda: UserOut.model_validate(user).model_dump_json(),
+        tags=[user_tag(user.id)],
+        cache_control="private, no-cache"
+    )
 
 @app.get("/get_user_by_phone", response_model=UserOut)
-async def get_user_by_phone(phone_number: str, db: Session = Depends(get_db)):
+async def get_user_by_phone(request: Request, phone_number: str, db: AsyncSession = Depends(get_async_db)):
     """
     전화번호로 사용자 조회 API - 재방문 고객 인식용
     쿼리 파라미터로 phone_number를 받아 사용자를 조회합니다.
     사용자가 없으면 404 에러를 반환합니다.
-    attended_meetings 리스트도 함께 반환합니다.
+    ETag(사용자 행 버전)를 지원하며 If-None-Match가 일치하면 304를 반환합니다.
     """
-    # 전화번호로 사용자 검색 (attended_meetings 관계 포함)
-    user = db.query(User).options(joinedload(User.meetings)).filter(User.phone_number == phone_number).first()
+    user = await db.scalar(select(User).where(User.phone_number == phone_number))
     
     if not user:
         raise HTTPException(
@@ -255,40 +341,48 @@ async def get_user_by_phone(phone_number: str, db: Session = Depends(get_db)):
             detail="User not found"
         )
     
-    return user
+    return await user_response(request, user)
+
+def too_many_requests(detail: str, decision: Decision) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(decision.retry_after_seconds)},
+    )
+
 
 @app.post("/sms/request")
-async def send_sms(request: SMSRequest, db: Session = Depends(get_db)):
+async def send_sms(request: SMSRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)):
     """SMS verification code request API: generates, saves, and sends the code."""
     
+    # 0. Rate limits (checked before touching the database)
+    limiter = get_rate_limiter()
+    decision = await limiter.hit(f"sms:ip:{client_ip(http_request)}", SMS_REQUEST_IP_LIMIT, SMS_REQUEST_WINDOW_SECONDS)
+    if not decision.allowed:
+        raise too_many_requests("Too many verification requests. Please try again later.", decision)
+
+    # Cool-down period per phone number (30 seconds)
+    decision = await limiter.cooldown(f"sms:{request.phone_number}", SMS_REQUEST_COOLDOWN_SECONDS)
+    if not decision.allowed:
+        raise too_many_requests(
+            f"Please wait {decision.retry_after_seconds} seconds before requesting a new code.", decision
+        )
+
+    decision = await limiter.hit(f"sms:phone:{request.phone_number}", SMS_REQUEST_PHONE_LIMIT, SMS_REQUEST_WINDOW_SECONDS)
+    if not decision.allowed:
+        raise too_many_requests("Too many verification requests for this number. Please try again later.", decision)
+
     # 1. Generate 6-digit random verification code
     verification_code = str(random.randint(100000, 999999))
     
     try:
-        # --- DB TRANSACTION START: CHECK COOL-DOWN AND SAVE NEW CODE ---
+        # --- DB TRANSACTION START: REPLACE EXISTING CODE ---
         
-        # 1.1. Check Cool-down period and clean up existing records
-        existing_records = db.query(VerificationCode).filter(
+        # 1.1. Delete all existing records for this phone number (single statement)
+        await db.execute(delete(VerificationCode).where(
             VerificationCode.phone_number == request.phone_number
-        ).all()
-
-        if existing_records:
-            # Check if any existing record is within cooldown period
-            for record in existing_records:
-                time_since_creation = datetime.utcnow() - record.created_at
-                
-                # If requested too soon (within 30 seconds)
-                if time_since_creation < timedelta(seconds=30):
-                    remaining_time = 30 - int(time_since_creation.total_seconds())
-                    raise HTTPException(
-                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                        detail=f"Please wait {remaining_time} seconds before requesting a new code."
-                    )
-            
-            # Delete all existing records for this phone number
-            for record in existing_records:
-                db.delete(record)
-            
+        ))
+
         # 1.2. Save new verification code record (5 minutes expiry)
         verification_record = VerificationCode(
             phone_number=request.phone_number,
@@ -297,23 +391,23 @@ async def send_sms(request: SMSRequest, db: Session = Depends(get_db)):
             expires_at=datetime.utcnow() + timedelta(minutes=5)
         )
         db.add(verification_record)
-        db.commit()
-        db.refresh(verification_record)
+        await db.commit()
         
-    except HTTPException:
-        # Re-raise explicit HTTP exceptions (e.g., 429)
-        raise
     except Exception as e:
-        # Handle DB/Internal errors
-        db.rollback()
+        # Handle DB/Internal errors (the code was not issued, so allow an immediate retry)
+        await db.rollback()
+        await limiter.release_cooldown(f"sms:{request.phone_number}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal database error during code request: {str(e)}"
         )
+
+    # 새 코드가 발급되었으므로 검증 시도 횟수 초기화
+    await limiter.reset_attempts(request.phone_number)
         
     # 2. SEND SMS (ONLY after successful DB save)
     # 국가코드 자동 추가 (한국: +82)
-    phone_number = request.phone_number.strip()
+    phone_number = request.phone_number.strip().replace("-", "").replace(" ", "")  # E.164 형식을 위해 구분자 제거
     
     # 이미 +로 시작하는 경우 그대로 사용
     if phone_number.startswith('+'):
@@ -328,21 +422,40 @@ async def send_sms(request: SMSRequest, db: Session = Depends(get_db)):
     else:
         formatted_number = f"+82{phone_number}"
     
-    # 개발 환경에서는 Twilio 없이도 테스트 가능하도록 모킹
-    print(f"[개발 모드] SMS 모킹: {formatted_number}로 인증 코드 {verification_code} 전송됨")
+    # 발송 큐에 넣고 바로 응답 (워커가 재시도/백오프와 함께 발송, Twilio 미설정 시 콘솔 출력)
+    try:
+        get_sms_queue().enqueue(formatted_number, f"[서울체스클럽] 인증번호 [{verification_code}]를 입력해주세요.")
+    except SMSQueueFull:
+        # 코드를 보내지 못했으므로 쿨다운 없이 바로 다시 요청할 수 있게 함
+        await limiter.release_cooldown(f"sms:{request.phone_number}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SMS service is busy. Please try again shortly.",
+            headers={"Retry-After": "30"},
+        )
     
     # 3. Return success response
     return {"message": "SMS sent successfully"}
 
 @app.post("/sms/verify")
-async def verify_sms(request: SMSVerify, db: Session = Depends(get_db)):
+async def verify_sms(request: SMSVerify, http_request: Request, db: AsyncSession = Depends(get_async_db)):
     """SMS verification code verification API"""
+    # 0. Rate limits / attempt cap per issued code (checked before touching the database)
+    limiter = get_rate_limiter()
+    decision = await limiter.hit(f"verify:ip:{client_ip(http_request)}", SMS_VERIFY_IP_LIMIT, SMS_VERIFY_WINDOW_SECONDS)
+    if not decision.allowed:
+        raise too_many_requests("Too many verification attempts. Please try again later.", decision)
+
+    decision = await limiter.verify_attempt(request.phone_number)
+    if not decision.allowed:
+        raise too_many_requests("Too many incorrect attempts. Please request a new code.", decision)
+
     try:
         # 1. Find matching VerificationCode record in DB
-        verification_record = db.query(VerificationCode).filter(
+        verification_record = await db.scalar(select(VerificationCode).where(
             VerificationCode.phone_number == request.phone_number,
             VerificationCode.code == request.code
-        ).first()
+        ))
         
         # 2. If code is not found or is invalid
         if not verification_record:
@@ -354,8 +467,8 @@ async def verify_sms(request: SMSVerify, db: Session = Depends(get_db)):
         # 3. Check if code has expired (5 minutes)
         if datetime.utcnow() > verification_record.expires_at:
             # Delete expired code
-            db.delete(verification_record)
-            db.commit()
+            await db.delete(verification_record)
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Verification code has expired."
@@ -363,8 +476,9 @@ async def verify_sms(request: SMSVerify, db: Session = Depends(get_db)):
         
         # 4. Delete VerificationCode record after successful verification
         # 이 시점에서 인증이 성공했고, verification_record가 삭제됩니다.
-        db.delete(verification_record)
-        db.commit()
+        await db.delete(verification_record)
+        await db.commit()
+        await limiter.reset_attempts(request.phone_number)
         
         return {"message": "Verification successful."}
             
@@ -373,18 +487,163 @@ async def verify_sms(request: SMSVerify, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         # Handle DB/Internal errors
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal error during verification: {str(e)}"
         )
 
 
+def _cache_samples():
+    """캐시별 히트/미스 (수집 시점에 각 모듈의 카운터를 읽음)"""
+    import rag_chatbot
+    from auth import principal_cache
+    from http_cache import response_cache
+    from social_auth import _kakao_client
+
+    caches = {"http_response": response_cache.stats(), "auth_principal": principal_cache.stats()}
+    if rag_chatbot._chatbot_instance is not None:
+        caches["chatbot"] = rag_chatbot._chatbot_instance.cache.stats()
+    if _kakao_client is not None:
+        caches["kakao_user"] = {"hits": _kakao_client.cache_hits, "misses": _kakao_client.upstream_calls}
+    for name, stats in caches.items():
+        yield "cache_requests_total", {"cache": name, "result": "hit"}, stats["hits"]
+        yield "cache_requests_total", {"cache": name, "result": "miss"}, stats["misses"]
+
+
+def _sms_queue_samples():
+    stats = get_sms_queue().stats()
+    for key in ("enqueued", "sent", "failed", "retries", "rejected", "pending"):
+        yield "sms_queue_messages", {"state": key}, stats[key]
+
+
+REGISTRY.register_collector("cache_requests", "counter", "Cache lookups by cache and result", _cache_samples)
+REGISTRY.register_collector("sms_queue_messages", "gauge", "SMS queue counters by state", _sms_queue_samples)
+REGISTRY.register_collector(
+    "request_log_records", "gauge", "Access log records waiting in the queue / dropped",
+    lambda: [("request_log_records", {"state": key}, value) for key, value in logging_stats().items()])
+
+
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_metrics_access)])
+async def metrics_endpoint():
+    """
+    Prometheus 텍스트 형식 메트릭 (라우트별 지연, SQL 실행 시간, 외부 API 호출 시간, 캐시 히트 등)
+
+    스크레이퍼는 Authorization: Bearer <METRICS_TOKEN>, 그 외에는 관리자 인증이 필요합니다.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def profiling_status(limit: int = Query(20, ge=1, le=100)):
+    """
+    프로파일링 설정과 최근 프로파일 목록 (느린 순)
+    """
+    profiler = get_profiler()
+    return {"config": profiler.config(), "profiles": [profile.summary() for profile in profiler.slowest(limit)]}
+
+
+@app.put("/admin/profiling", dependencies=[Depends(require_admin)])
+async def configure_profiling(config: ProfilingConfigIn):
+    """
+    요청 프로파일링 켜기/끄기 (sample_rate=0이면 끔, expires_in_seconds 뒤 자동으로 꺼짐)
+    """
+    profiler = get_profiler()
+    profiler.configure(
+        sample_rate=config.sample_rate,
+        routes=config.routes,
+        interval_ms=config.interval_ms,
+        min_duration_ms=config.min_duration_ms,
+        expires_in_seconds=config.expires_in_seconds,
+    )
+    return profiler.config()
+
+
+@app.get("/admin/profiling/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str, format: str = Query("speedscope", pattern="^(speedscope|collapsed)$")):
+    """
+    프로파일 다운로드
+    - speedscope: https://www.speedscope.app 에서 바로 열 수 있는 JSON
+    - collapsed: flamegraph.pl 입력 형식 ("a;b;c 횟수")
+    """
+    profile = get_profiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    filename = f"profile-{profile.id}"
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed(),
+                                 headers={"Content-Disposition": f'attachment; filename="{filename}.collapsed"'})
+    return JSONResponse(profile.speedscope(),
+                        headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'})
+
+
+@app.get("/admin/dashboard/users", response_model=list[UserOut], dependencies=[Depends(require_admin)])
+async def admin_dashboard_users(
+    response: Response,
+    q: str = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    limit: int = Query(USERS_PAGE_SIZE, ge=1, le=USERS_MAX_PAGE_SIZE),
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    관리자 대시보드 회원 목록 (페이지 단위)
+
+    Query Parameters:
+        q: 이름 / 이메일("@" 포함) / 전화번호(숫자, 하이픈) 접두사 검색
+        sort: "created_at" (가입일, 기본) / "total_visits" (방문 횟수)
+        order: "desc" (기본) / "asc"
+        limit: 페이지 크기 (기본 50, 최대 200)
+        cursor: 이전 응답의 X-Next-Cursor 헤더 값 (같은 sort/order에서만 유효)
+    """
+    users, next_cursor = await db.run_sync(list_users, limit=limit, cursor=cursor, q=q, sort=sort, order=order)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_params = {"q": q, "sort": sort, "order": order, "limit": limit, "cursor": next_cursor}
+        query_string = urlencode({key: value for key, value in next_params.items() if value is not None})
+        response.headers["Link"] = f'</admin/dashboard/users?{query_string}>; rel="next"'
+    return [UserOut.model_validate(user) for user in users]
+
+
+@app.get("/admin/dashboard/stats", response_model=UserStatsOut, dependencies=[Depends(require_admin)])
+async def admin_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    회원 통계 (성별 / 체스 경험 / 레이팅 / 방문 횟수 구간별 회원 수, user_stats 롤업 테이블 한 번 조회)
+    """
+    return await db.run_sync(read_stats)
+
+
+@app.post("/admin/dashboard/stats/rebuild", response_model=UserStatsOut, dependencies=[Depends(require_admin)])
+async def admin_dashboard_stats_rebuild(db: AsyncSession = Depends(get_async_db)):
+    """
+    users 전체를 다시 집계해 통계 롤업을 교체 (ORM을 거치지 않고 users를 직접 바꾼 뒤 사용)
+    """
+    await db.run_sync(rebuild_user_stats)
+    return await db.run_sync(read_stats)
+
+
+@app.get("/sms/queue_stats", dependencies=[Depends(require_admin)])
+async def sms_queue_stats():
+    """
+    SMS 발송 큐 통계 (발송/실패/재시도 수, 대기 메시지 수, 발송 지연 p50/p99, 관리자 전용)
+    """
+    return get_sms_queue().stats()
+
+
+@app.get("/sms/sweeper_stats", dependencies=[Depends(require_admin)])
+async def sms_sweeper_stats():
+    """
+    만료 인증 코드 정리 통계 (실행 횟수, 실행별/누적 삭제 행 수, 관리자 전용)
+    """
+    return code_sweeper.stats()
+
+
 # =========================================================================
 # 💡 2-1. 로그인 엔드포인트 (JWT 토큰 발급)
 # =========================================================================
 @app.post("/auth/login", response_model=LoginResponse)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     로그인 API (전화번호 기반)
     
@@ -399,9 +658,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
         JWT 액세스 토큰과 사용자 정보
     """
     # 1. 전화번호로 사용자 조회
-    user = db.query(User).options(joinedload(User.meetings)).filter(
-        User.phone_number == request.phone_number
-    ).first()
+    user = await db.scalar(select(User).where(User.phone_number == request.phone_number))
     
     if not user:
         raise HTTPException(
@@ -426,7 +683,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/auth/me", response_model=UserOut)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(request: Request, current_user: AuthenticatedUser = Depends(get_current_user)):
     """
     현재 로그인한 사용자 정보 조회 API
     
@@ -437,16 +694,16 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
         current_user: 인증된 사용자 (의존성 주입)
     
     Returns:
-        사용자 정보
+        사용자 정보 (ETag 지원, If-None-Match 일치 시 304)
     """
-    return current_user
+    return await user_response(request, current_user)
 
 
 # =========================================================================
 # 💡 2-2. 소셜 로그인 엔드포인트 (Apple, Kakao)
 # =========================================================================
 @app.post("/auth/apple", response_model=SocialLoginResponse)
-async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db)):
+async def apple_login(request: AppleLoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Apple 로그인 API
     
@@ -470,10 +727,10 @@ async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db))
         name = user_info["name"]
         
         # 3. 기존 사용자 확인 (Apple ID로)
-        existing_user = db.query(User).filter(
+        existing_user = await db.scalar(select(User).where(
             User.social_provider == "apple",
             User.social_id == apple_id
-        ).first()
+        ))
         
         is_new_user = False
         
@@ -481,8 +738,8 @@ async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db))
             # 기존 사용자: total_visits 증가
             existing_user.total_visits += 1
             existing_user.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(existing_user)
+            await db.commit()
+            await db.refresh(existing_user)
             user = existing_user
         else:
             # 신규 사용자: 기본 정보로 회원 생성
@@ -499,10 +756,13 @@ async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db))
             )
             
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             user = new_user
         
+        invalidate(user_tag(user.id))
+        invalidate_user(user.id)
+        
         # 4. JWT 토큰 생성
         access_token = create_access_token(
             data={
@@ -522,7 +782,7 @@ async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Apple login failed: {str(e)}"
@@ -530,7 +790,7 @@ async def apple_login(request: AppleLoginRequest, db: Session = Depends(get_db))
 
 
 @app.post("/auth/kakao", response_model=SocialLoginResponse)
-async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db)):
+async def kakao_login(request: KakaoLoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     카카오 로그인 API
     
@@ -555,10 +815,10 @@ async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db))
             email = f"kakao_{kakao_id}@kakao.local"
         
         # 2. 기존 사용자 확인 (Kakao ID로)
-        existing_user = db.query(User).filter(
+        existing_user = await db.scalar(select(User).where(
             User.social_provider == "kakao",
             User.social_id == kakao_id
-        ).first()
+        ))
         
         is_new_user = False
         
@@ -566,8 +826,8 @@ async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db))
             # 기존 사용자: total_visits 증가
             existing_user.total_visits += 1
             existing_user.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(existing_user)
+            await db.commit()
+            await db.refresh(existing_user)
             user = existing_user
         else:
             # 신규 사용자: 기본 정보로 회원 생성
@@ -584,10 +844,13 @@ async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db))
             )
             
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             user = new_user
         
+        invalidate(user_tag(user.id))
+        invalidate_user(user.id)
+        
         # 3. JWT 토큰 생성
         access_token = create_access_token(
             data={
@@ -607,7 +870,7 @@ async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Kakao login failed: {str(e)}"
@@ -618,13 +881,13 @@ async def kakao_login(request: KakaoLoginRequest, db: Session = Depends(get_db))
 # 💡 3. 사용자 등록 엔드포인트 (/register)
 # =========================================================================
 @app.post("/register", status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     User registration API - returns user data and access token.
     """
     # 1. Auto-close registration at 30 users
     MAX_CAPACITY = 30
-    current_count = db.query(User).count()
+    current_count = await db.scalar(select(func.count()).select_from(User))
     if current_count >= MAX_CAPACITY:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -632,7 +895,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # 2. Check for existing user by phone number
-    existing_user = db.query(User).filter(User.phone_number == user_data.phone_number).first()
+    existing_user = await db.scalar(select(User).where(User.phone_number == user_data.phone_number))
 
     # 3. Register or update user
     try:
@@ -647,8 +910,8 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             existing_user.total_visits += 1
             existing_user.updated_at = datetime.utcnow()
 
-            db.commit()
-            db.refresh(existing_user)
+            await db.commit()
+            await db.refresh(existing_user)
             user = existing_user
         else:
             # Create new user
@@ -664,10 +927,13 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             )
 
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             user = new_user
 
+        invalidate(user_tag(user.id))
+        invalidate_user(user.id)
+
         # Generate access token
         access_token = create_access_token(
             data={"user_id": user.id, "phone_number": user.phone_number}
@@ -688,13 +954,13 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         }
             
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Registration failed due to a database integrity constraint (phone or email duplication)."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred during registration: {str(e)}"
@@ -730,30 +996,8 @@ async def parse_cs_text(request: CSParseRequest):
         intent는 다음 중 하나여야 합니다: GREETING, QUESTION, COMPLAINT, REQUEST, COMPLIMENT, APOLOGY, THANK_YOU, GOODBYE, OTHER
         """
         
-        # Gemini REST API 호출
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }]
-        }
-        
-        api_response = requests.post(
-            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        
-        if api_response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Gemini API error: {api_response.status_code}"
-            )
-        
-        result = api_response.json()
-        response_text = result['candidates'][0]['content']['parts'][0]['text'].strip()
+        # Gemini REST API 호출 (공용 비동기 클라이언트)
+        response_text = await get_gemini_client().generate_text(prompt)
         
         # JSON 부분만 추출 (```json ... ``` 형태일 수 있음)
         if "```json" in response_text:
@@ -784,6 +1028,16 @@ async def parse_cs_text(request: CSParseRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse Gemini API response as JSON: {str(e)}"
         )
+    except GeminiTimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Gemini API request timed out"
+        )
+    except GeminiError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gemini API error: {e.status_code}" if e.status_code else f"Gemini API error: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -796,7 +1050,7 @@ async def parse_cs_text(request: CSParseRequest):
 # =========================================================================
 
 @app.post("/meetings/create", response_model=MeetingOut, status_code=status.HTTP_201_CREATED)
-async def create_meeting(meeting_data: MeetingCreate, db: Session = Depends(get_db)):
+async def create_meeting(meeting_data: MeetingCreate, db: AsyncSession = Depends(get_async_db)):
     """
     새 모임 생성 API (운영자용).
     모임 제목, 날짜/시간, 장소, 정원을 받아 새 모임을 생성합니다.
@@ -810,13 +1064,21 @@ async def create_meeting(meeting_data: MeetingCreate, db: Session = Depends(get_
         )
         
         db.add(new_meeting)
-        db.commit()
-        db.refresh(new_meeting)
+        await db.commit()
+        invalidate(TAG_MEETINGS)
         
-        return new_meeting
+        # 새 모임은 참가자가 없으므로 participants 관계를 지연 로딩하지 않고 바로 변환
+        return MeetingOut(
+            id=new_meeting.id,
+            title=new_meeting.title,
+            date_time=new_meeting.date_time,
+            location=new_meeting.location,
+            capacity=new_meeting.capacity,
+            created_at=new_meeting.created_at
+        )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating meeting: {str(e)}"
@@ -824,15 +1086,63 @@ async def create_meeting(meeting_data: MeetingCreate, db: Session = Depends(get_
 
 
 @app.get("/meetings", response_model=list[MeetingOut])
-async def get_all_meetings(db: Session = Depends(get_db)):
+async def get_all_meetings(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = None,
+    when: str = WHEN_UPCOMING,
+    include: str = None,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    모든 활성화된 모임 리스트를 반환하는 API.
-    participants 관계를 포함하여 각 모임의 참가자 정보도 함께 반환합니다.
+    모임 리스트를 페이지 단위로 반환하는 API.
+    
+    Query Parameters:
+        limit: 페이지 크기 (기본 50, 최대 200)
+        cursor: 이전 응답의 X-Next-Cursor 헤더 값
+        when: "upcoming" (기본, 다가오는 모임) / "past" (지난 모임, 최신순) / "all" (전체)
+        include: "participants"이면 각 모임의 참가자 목록을 함께 반환
+    
+    응답 본문은 기존과 같은 모임 배열이며, 다음 페이지가 있으면
+    X-Next-Cursor / Link 헤더로 커서를 전달합니다.
+    참가 인원은 participant_count / confirmed_count / pending_count / waitlist_count로 제공됩니다.
+    페이지 모임들의 행 버전으로 ETag를 계산하며, If-None-Match가 일치하면 304를 반환합니다.
     """
     try:
-        meetings = db.query(Meeting).options(joinedload(Meeting.participants)).all()
-        return meetings
+        include_participants = include == "participants"
+        meetings, next_cursor = await db.run_sync(
+            list_meetings, limit=limit, cursor=cursor, when=when, include_participants=include_participants
+        )
+        
+        headers = {}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+            next_params = {"limit": limit, "cursor": next_cursor, "when": when, "include": include}
+            query_string = urlencode({key: value for key, value in next_params.items() if value is not None})
+            headers["Link"] = f'</meetings?{query_string}>; rel="next"'
+        
+        # Meeting.updated_at은 모임과 그 참가 기록이 바뀔 때마다 갱신되는 행 버전
+        etag = make_etag(
+            "meetings", limit, cursor, when, include_participants,
+            [(m.id, m.updated_at) for m in meetings], next_cursor
+        )
         
+        async def render():
+            return MEETING_LIST_ADAPTER.dump_json(
+                await db.run_sync(serialize_meetings, meetings, include_participants)
+            )
+        
+        return await conditional_response(
+            request,
+            cache_key=f"meetings:{limit}:{cursor}:{when}:{include_participants}",
+            etag=etag,
+            render=render,
+            tags=[TAG_MEETINGS],
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -843,14 +1153,16 @@ async def get_all_meetings(db: Session = Depends(get_db)):
 @app.post("/meetings/register", status_code=status.HTTP_201_CREATED)
 async def register_for_meeting(
     meeting_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     모임 참가 신청 API (인증 필요).
     
     JWT 토큰으로 인증된 사용자가 지정된 모임에 참가 신청합니다.
     user_id는 토큰에서 자동으로 추출됩니다.
+    정원이 찬 경우 대기자 명단에 등록되고 202와 함께 대기 순번을 반환합니다.
+    순번은 GET /meetings/{meeting_id}/waitlist/position 으로 확인할 수 있습니다.
     
     Args:
         meeting_id: 참가할 모임 ID
@@ -860,86 +1172,126 @@ async def register_for_meeting(
     try:
         user_id = current_user.id
         
-        # 1. 사용자는 이미 인증되어 current_user로 제공됨
+        # 좌석 확보 + 참가 기록 생성을 하나의 원자적 트랜잭션으로 처리
+        # (정원 초과 시 대기자 등록, 중복 신청 409, 모임 없음 404)
+        registration, reactivated = await db.run_sync(reserve_seat, user_id, meeting_id, STATUS_CONFIRMED, waitlist=True)
+        invalidate(TAG_MEETINGS)
         
-        # 2. 모임 존재 확인
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if not meeting:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Meeting with id {meeting_id} not found"
-            )
-        
-        # 3. 이미 참가 신청했는지 확인
-        existing_registration = db.query(UserMeeting).filter(
-            UserMeeting.user_id == user_id,
-            UserMeeting.meeting_id == meeting_id
-        ).first()
-        
-        if existing_registration:
-            # 이미 참가 신청한 경우, 상태가 CANCELLED면 CONFIRMED로 변경
-            if existing_registration.status == "CANCELLED":
-                existing_registration.status = "CONFIRMED"
-                existing_registration.registered_at = datetime.utcnow()
-                db.commit()
-                return {
-                    "message": "Meeting registration reactivated successfully",
-                    "registration_id": existing_registration.id
+        if registration.status == STATUS_WAITLISTED:
+            _, position, waitlist_size = await db.run_sync(get_waitlist_position, user_id, meeting_id, registration)
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "message": "Meeting is full. You have been added to the waitlist",
+                    "registration_id": registration.id,
+                    "user_id": user_id,
+                    "meeting_id": meeting_id,
+                    "status": registration.status,
+                    "waitlist_position": position,
+                    "waitlist_size": waitlist_size
                 }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="User is already registered for this meeting"
-                )
-        
-        # 4. 모임 정원 확인
-        current_participants = db.query(UserMeeting).filter(
-            UserMeeting.meeting_id == meeting_id,
-            UserMeeting.status == "CONFIRMED"
-        ).count()
-        
-        if current_participants >= meeting.capacity:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Meeting is full. Capacity: {meeting.capacity}"
             )
         
-        # 5. 새로운 참가 기록 생성
-        new_registration = UserMeeting(
-            user_id=user_id,
-            meeting_id=meeting_id,
-            status="CONFIRMED",
-            registered_at=datetime.utcnow()
-        )
-        
-        db.add(new_registration)
-        db.commit()
-        db.refresh(new_registration)
+        if reactivated:
+            # 취소했던 신청을 다시 활성화한 경우
+            return {
+                "message": "Meeting registration reactivated successfully",
+                "registration_id": registration.id,
+                "user_id": user_id,
+                "meeting_id": meeting_id,
+                "status": registration.status
+            }
         
         return {
             "message": "Meeting registration successful",
-            "registration_id": new_registration.id,
+            "registration_id": registration.id,
             "user_id": user_id,
             "meeting_id": meeting_id,
-            "status": new_registration.status
+            "status": registration.status
         }
         
     except HTTPException:
         # Re-raise explicit HTTP exceptions
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error registering for meeting: {str(e)}"
         )
 
 
+@app.post("/meetings/cancel")
+async def cancel_meeting_registration(
+    meeting_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    모임 참가 취소 API (인증 필요).
+    
+    확정/신청 중/대기 상태의 신청을 취소합니다.
+    좌석이 반납되면 같은 트랜잭션에서 다음 대기자가 자동으로 CONFIRMED로 승격됩니다.
+    
+    Args:
+        meeting_id: 취소할 모임 ID
+        current_user: 인증된 사용자 (토큰에서 자동 추출)
+        db: 데이터베이스 세션
+    """
+    try:
+        registration, promoted = await db.run_sync(cancel_registration, current_user.id, meeting_id)
+        invalidate(TAG_MEETINGS)
+        
+        return {
+            "message": "Meeting registration cancelled successfully",
+            "registration_id": registration.id,
+            "meeting_id": meeting_id,
+            "status": registration.status,
+            "waitlist_promoted": promoted is not None
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error cancelling meeting registration: {str(e)}"
+        )
+
+
+@app.get("/meetings/{meeting_id}/waitlist/position", response_model=WaitlistPositionOut)
+async def get_meeting_waitlist_position(
+    meeting_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    대기 순번 조회 API (인증 필요).
+    
+    정원이 찬 모임에 재신청을 반복하는 대신 이 엔드포인트로 순번을 확인합니다.
+    승격되면 status가 CONFIRMED로 바뀌고 position은 null이 됩니다.
+    """
+    registration, position, waitlist_size = await db.run_sync(get_waitlist_position, current_user.id, meeting_id)
+    if registration is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No registration found for this meeting"
+        )
+    
+    return WaitlistPositionOut(
+        meeting_id=meeting_id,
+        status=registration.status,
+        position=position,
+        waitlist_size=waitlist_size
+    )
+
+
 @app.post("/meetings/register_interest", status_code=status.HTTP_201_CREATED)
 async def register_interest_for_meeting(
     meeting_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     모임 관심 등록 API (인증 필요, 결제 의사 표시).
@@ -955,84 +1307,23 @@ async def register_interest_for_meeting(
     try:
         user_id = current_user.id
         
-        # 1. 사용자는 이미 인증되어 current_user로 제공됨
-        
-        # 2. 모임 존재 확인
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if not meeting:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Meeting with id {meeting_id} not found"
-            )
-        
-        # 3. 이미 관심 등록 또는 참가 신청했는지 확인
-        existing_interest = db.query(UserMeeting).filter(
-            UserMeeting.user_id == user_id,
-            UserMeeting.meeting_id == meeting_id
-        ).first()
-        
-        if existing_interest:
-            # 이미 등록된 경우, 상태에 따라 다른 메시지 반환
-            if existing_interest.status == "CONFIRMED":
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="User is already confirmed for this meeting"
-                )
-            elif existing_interest.status == "PENDING":
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="User has already expressed interest in this meeting"
-                )
-            elif existing_interest.status == "CANCELLED":
-                # 취소된 경우 PENDING으로 재활성화
-                existing_interest.status = "PENDING"
-                existing_interest.registered_at = datetime.utcnow()
-                db.commit()
-                return {
-                    "message": "Meeting interest reactivated successfully",
-                    "registration_id": existing_interest.id,
-                    "user_id": user_id,
-                    "meeting_id": meeting_id,
-                    "status": "PENDING"
-                }
-        
-        # 4. 모임 정원 확인 (CONFIRMED + PENDING 상태 합산)
-        current_participants = db.query(UserMeeting).filter(
-            UserMeeting.meeting_id == meeting_id,
-            UserMeeting.status.in_(["CONFIRMED", "PENDING"])
-        ).count()
-        
-        if current_participants >= meeting.capacity:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Meeting is full. Capacity: {meeting.capacity}"
-            )
-        
-        # 5. 새로운 관심 등록 기록 생성 (status='PENDING')
-        new_interest = UserMeeting(
-            user_id=user_id,
-            meeting_id=meeting_id,
-            status="PENDING",
-            registered_at=datetime.utcnow()
-        )
-        
-        db.add(new_interest)
-        db.commit()
-        db.refresh(new_interest)
+        # 좌석 확보(확정 + 신청 중 인원 기준) + PENDING 기록 생성을 원자적으로 처리
+        registration, reactivated = await db.run_sync(reserve_seat, user_id, meeting_id, STATUS_PENDING)
+        invalidate(TAG_MEETINGS)
         
         return {
-            "message": "Meeting interest registered successfully",
-            "registration_id": new_interest.id,
+            "message": "Meeting interest reactivated successfully" if reactivated else "Meeting interest registered successfully",
+            "registration_id": registration.id,
             "user_id": user_id,
             "meeting_id": meeting_id,
-            "status": new_interest.status
+            "status": registration.status
         }
         
     except HTTPException:
         # Re-raise explicit HTTP exceptions
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error registering interest for meeting: {str(e)}"
@@ -1042,12 +1333,12 @@ async def register_interest_for_meeting(
 # --------------------
 # Chatbot API (RAG-based LLM)
 # --------------------
-from rag_chatbot import get_chatbot
+from rag_chatbot import ChatStreamError, get_chatbot
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_with_bot(
     request: ChatRequest,
-    current_user: User = Depends(get_current_user_optional)
+    current_user: AuthenticatedUser = Depends(get_current_user_optional)
 ):
     """
     RAG-based chatbot API
@@ -1069,7 +1360,7 @@ async def chat_with_bot(
         ]
 
         # Generate chatbot response
-        response_text = chatbot.chat(
+        response_text = await chatbot.chat(
             user_message=request.message,
             conversation_history=conversation_history
         )
@@ -1086,11 +1377,59 @@ async def chat_with_bot(
         )
 
 
+@app.post("/api/chat/stream")
+async def chat_with_bot_stream(
+    request: ChatRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user_optional)
+):
+    """
+    RAG-based chatbot API (streaming, Server-Sent Events)
+
+    Gemini가 생성하는 텍스트 조각을 도착하는 즉시 전달합니다.
+    - `data: {"delta": "..."}` 이벤트가 조각마다 전송됩니다.
+    - 마지막에 `event: done` 이벤트와 함께 timestamp가 전송됩니다.
+    - 생성이 실패하면 (조각이 일부 전송된 뒤라도) done 대신 `event: error`와
+      `{"message": "..."}`가 전송되며, 그때까지 받은 조각은 완성된 답변이 아닙니다.
+    기존 클라이언트는 /api/chat (전체 응답 JSON)을 계속 사용할 수 있습니다.
+    """
+    chatbot = get_chatbot()
+    conversation_history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ]
+
+    async def event_stream():
+        try:
+            async for chunk in chatbot.chat_stream(
+                user_message=request.message,
+                conversation_history=conversation_history
+            ):
+                yield f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+        except ChatStreamError as e:
+            yield f"event: error\ndata: {json.dumps({'message': e.message}, ensure_ascii=False)}\n\n"
+            return
+        yield f"event: done\ndata: {json.dumps({'timestamp': datetime.utcnow().isoformat()})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/chat/cache_stats", dependencies=[Depends(require_admin)])
+async def chat_cache_stats():
+    """
+    챗봇 응답 캐시 통계 (hits = 절약된 Gemini 호출 수)
+    """
+    return get_chatbot().cache.stats()
+
+
 # =========================================================================
 # 💡 관리자 코드 로그인 엔드포인트 (/auth/admin_login)
 # =========================================================================
 @app.post("/auth/admin_login", response_model=LoginResponse)
-async def admin_login(request: AdminLoginRequest, db: Session = Depends(get_db)):
+async def admin_login(request: AdminLoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     관리자 코드로 로그인하여 JWT 발급.
     - 환경변수 ADMIN_ACCESS_CODE 와 요청의 code 일치 시 성공
@@ -1110,9 +1449,9 @@ async def admin_login(request: AdminLoginRequest, db: Session = Depends(get_db))
     # 관리자 사용자 조회 (이메일 우선, 없으면 전화번호)
     admin_user = None
     if ADMIN_EMAIL:
-        admin_user = db.query(User).filter(User.email == ADMIN_EMAIL).first()
+        admin_user = await db.scalar(select(User).where(User.email == ADMIN_EMAIL))
     if admin_user is None and ADMIN_PHONE_NUMBER:
-        admin_user = db.query(User).filter(User.phone_number == ADMIN_PHONE_NUMBER).first()
+        admin_user = await db.scalar(select(User).where(User.phone_number == ADMIN_PHONE_NUMBER))
 
     if admin_user is None:
         raise HTTPException(
@@ -0,0 +1,143 @@
+"""
+모임 목록 조회 (커서 기반 페이지네이션)
+
+(date_time, id) 키셋 커서로 페이지를 나누므로 OFFSET 없이 인덱스 범위 스캔만 합니다.
+참가 인원은 Meeting의 좌석 카운터를, 대기 인원은 현재 페이지 모임에 대한
+GROUP BY 집계 한 번으로 계산하며 참가자 행은 include=participants일 때만 읽습니다.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, selectinload
+
+from database import Meeting, UserMeeting
+from reservations import STATUS_WAITLISTED
+from schemas import MeetingOut, UserMeetingOut
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+WHEN_UPCOMING = "upcoming"
+WHEN_PAST = "past"
+WHEN_ALL = "all"
+
+
+def encode_cursor(meeting: Meeting) -> str:
+    """마지막 모임의 (date_time, id)를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps([meeting.date_time.isoformat(), meeting.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 문자열을 (date_time, id)로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_time, meeting_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_time), int(meeting_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def list_meetings(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    when: Optional[str] = None,
+    include_participants: bool = False,
+) -> Tuple[List[Meeting], Optional[str]]:
+    """
+    모임 한 페이지를 조회합니다.
+
+    Args:
+        limit: 페이지 크기 (1 ~ MAX_PAGE_SIZE)
+        cursor: 이전 페이지의 next_cursor
+        when: "upcoming" (지금 이후, 오름차순), "past" (지금 이전, 내림차순), "all" / None (전체, 오름차순)
+        include_participants: 참가자 목록을 함께 로드할지 여부 (selectinload, 쿼리 1회 추가)
+
+    Returns:
+        (모임 리스트, 다음 페이지 커서 또는 None)
+    """
+    if when not in (None, WHEN_UPCOMING, WHEN_PAST, WHEN_ALL):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="when must be 'upcoming', 'past' or 'all'"
+        )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    descending = when == WHEN_PAST
+
+    query = db.query(Meeting)
+    now = datetime.utcnow()
+    if when == WHEN_UPCOMING:
+        query = query.filter(Meeting.date_time >= now)
+    elif when == WHEN_PAST:
+        query = query.filter(Meeting.date_time < now)
+
+    if cursor:
+        after_time, after_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(
+                Meeting.date_time < after_time,
+                and_(Meeting.date_time == after_time, Meeting.id < after_id)
+            ))
+        else:
+            query = query.filter(or_(
+                Meeting.date_time > after_time,
+                and_(Meeting.date_time == after_time, Meeting.id > after_id)
+            ))
+
+    if descending:
+        query = query.order_by(Meeting.date_time.desc(), Meeting.id.desc())
+    else:
+        query = query.order_by(Meeting.date_time, Meeting.id)
+
+    if include_participants:
+        query = query.options(selectinload(Meeting.participants))
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부 판단
+    meetings = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(meetings[limit - 1]) if len(meetings) > limit else None
+    return meetings[:limit], next_cursor
+
+
+def waitlist_counts(db: Session, meeting_ids: List[int]) -> Dict[int, int]:
+    """주어진 모임들의 대기 인원 (GROUP BY 집계 1회)"""
+    if not meeting_ids:
+        return {}
+    rows = (
+        db.query(UserMeeting.meeting_id, func.count(UserMeeting.id))
+        .filter(UserMeeting.meeting_id.in_(meeting_ids), UserMeeting.status == STATUS_WAITLISTED)
+        .group_by(UserMeeting.meeting_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def serialize_meetings(db: Session, meetings: List[Meeting], include_participants: bool = False) -> List[MeetingOut]:
+    """
+    MeetingOut 리스트로 변환합니다.
+    include_participants가 아니면 participants 관계에 접근하지 않아 지연 로딩이 발생하지 않습니다.
+    """
+    waitlisted = waitlist_counts(db, [meeting.id for meeting in meetings])
+    return [
+        MeetingOut(
+            id=meeting.id,
+            title=meeting.title,
+            date_time=meeting.date_time,
+            location=meeting.location,
+            capacity=meeting.capacity,
+            confirmed_count=meeting.confirmed_count,
+            pending_count=meeting.pending_count,
+            participant_count=meeting.confirmed_count + meeting.pending_count,
+            waitlist_count=waitlisted.get(meeting.id, 0),
+            created_at=meeting.created_at,
+            participants=[UserMeetingOut.model_validate(p) for p in meeting.participants] if include_participants else [],
+        )
+        for meeting in meetings
+    ]
@@ -0,0 +1,414 @@
+"""
+프로세스 내 메트릭 레지스트리 (Prometheus 텍스트 형식, GET /metrics)
+
+- Counter / Gauge / Histogram (라벨별 자식 메트릭)
+- 기록 경로에 락이 없음: 값은 스레드별 샤드(list)에 쓰고, /metrics 수집 시 샤드를 합산
+  (이벤트 루프 스레드와 동기 엔드포인트/DB 작업용 스레드 풀이 서로의 값을 덮어쓰지 않음)
+  락은 라벨 조합 또는 스레드 샤드를 처음 만들 때만 잡음
+- 이미 다른 모듈에 있는 통계(챗봇 캐시 히트 등)는 수집 시점에 읽는 collector로 노출 (기록 비용 없음)
+
+계측 지점:
+- MetricsMiddleware: 라우트(경로 템플릿)별 요청 지연 히스토그램, 처리 중 요청 수
+- instrument_engine(): SQLAlchemy 엔진 이벤트로 쿼리 수/지연 (문장 종류별)
+- track_upstream(): Gemini / Kakao / Apple 외부 호출 지연 (결과별)
+"""
+import asyncio
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 요청/쿼리/외부 호출 지연용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Sharded:
+    """
+    스레드별 값 배열 (기록은 자기 스레드 배열에만, 읽기는 전체 합산)
+
+    종료된 스레드의 배열은 새 스레드 등록 / 합산 시 base에 더한 뒤 버리므로
+    스레드가 계속 바뀌어도(스레드 풀 교체 등) 배열 수는 살아 있는 스레드 수로 유지됩니다.
+    """
+
+    def __init__(self, size: int, lock: threading.Lock):
+        self._size = size
+        self._lock = lock
+        self._local = threading.local()
+        self._base = [0] * size  # 종료된 스레드들이 남긴 값
+        self._shards: List[Tuple[threading.Thread, List[float]]] = []
+
+    def _fold_dead_locked(self):
+        alive = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                alive.append((thread, values))
+            else:
+                # 종료된 스레드는 더 이상 기록하지 않으므로 안전하게 합침
+                for i, value in enumerate(values):
+                    self._base[i] += value
+        self._shards = alive
+
+    def shard(self) -> List[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self._size
+            with self._lock:
+                self._fold_dead_locked()
+                self._shards.append((threading.current_thread(), values))
+            self._local.values = values
+            return values
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            self._fold_dead_locked()
+            totals = list(self._base)
+            shards = [values for _, values in self._shards]
+        for values in shards:
+            for i, value in enumerate(values):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_values",)
+
+    def __init__(self, lock: threading.Lock):
+        self._values = _Sharded(1, lock)
+
+    def inc(self, amount: float = 1):
+        self._values.shard()[0] += amount
+
+    def value(self) -> float:
+        return self._values.totals()[0]
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1):
+        self._values.shard()[0] -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("_buckets", "_values")
+
+    def __init__(self, buckets: Sequence[float], lock: threading.Lock):
+        self._buckets = buckets
+        # [버킷별 개수..., +Inf 개수, 합계]
+        self._values = _Sharded(len(buckets) + 2, lock)
+
+    def observe(self, value: float):
+        values = self._values.shard()
+        values[bisect.bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """(누적 버킷 개수, 합계, 전체 개수)"""
+        totals = self._values.totals()
+        cumulative, running = [], 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """라벨 값 조합별 자식 메트릭 (처음 보는 조합일 때만 락)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild(threading.Lock())
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self) -> List[Sample]:
+        return [(self.name + "_total", self._label_dict(values), child.value()) for values, child in self._items()]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild(threading.Lock())
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def samples(self) -> List[Sample]:
+        return [(self.name, self._label_dict(values), child.value()) for values, child in self._items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets, threading.Lock())
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for values, child in self._items():
+            labels = self._label_dict(values)
+            cumulative, total, count = child.snapshot()
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), cumulative):
+                samples.append((self.name + "_bucket", {**labels, "le": _format_value(bound)}, bucket_count))
+            samples.append((self.name + "_sum", labels, total))
+            samples.append((self.name + "_count", labels, count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different type/labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, name: str, type_name: str, documentation: str,
+                           collect: Callable[[], Iterable[Sample]]):
+        """
+        수집 시점에 값을 읽어 오는 메트릭 (collect()는 (샘플 이름, 라벨, 값) 목록을 반환)
+
+        같은 이름으로 다시 등록하면 교체합니다.
+        """
+        with self._lock:
+            self._collectors = [c for c in self._collectors if c[0] != name]
+            self._collectors.append((name, type_name, documentation, collect))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        families = [(m.name, m.type_name, m.documentation, m.samples) for m in metrics] + collectors
+        for name, type_name, documentation, collect in families:
+            try:
+                samples = list(collect())
+            except Exception as e:  # collector 하나가 실패해도 나머지는 노출
+                lines.append(f"# collector {name} failed: {type(e).__name__}")
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_name}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Singleton registry
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed")
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("engine", "operation"), buckets=DB_BUCKETS)
+DB_QUERY_ERRORS = REGISTRY.counter(
+    "db_query_errors", "SQL statements that raised", ("engine", "operation"))
+UPSTREAM_REQUEST_DURATION = REGISTRY.histogram(
+    "upstream_request_duration_seconds", "Outbound API call latency", ("service", "outcome"))
+
+UNMATCHED_ROUTE = "other"
+STATEMENT_CACHE_SIZE = 1000
+
+
+class MetricsMiddleware:
+    """라우트별 지연 히스토그램 + 처리 중 요청 수 (순수 ASGI)"""
+
+    def __init__(self, app, duration: Histogram = HTTP_REQUEST_DURATION, in_flight: Gauge = HTTP_REQUESTS_IN_FLIGHT):
+        self.app = app
+        self.duration = duration
+        self.in_flight = in_flight.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            # 라우터가 scope에 남긴 경로 템플릿 사용 (/meetings/{meeting_id}) → 라벨 수가 라우트 수로 제한됨
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.duration.labels(scope["method"], route, str(status_code)).observe(time.perf_counter() - start)
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:8].split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine: Engine, name: str, duration: Histogram = DB_QUERY_DURATION,
+                      errors: Counter = DB_QUERY_ERRORS):
+    """
+    엔진의 모든 SQL 실행 시간을 기록 (비동기 엔진은 async_engine.sync_engine을 넘김)
+
+    같은 엔진에 여러 번 호출해도 한 번만 등록합니다.
+    """
+    if engine.__dict__.get("_metrics_instrumented"):
+        return
+    engine._metrics_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    # SQL 문자열 → 히스토그램 자식 (컴파일 캐시 덕분에 같은 문장은 같은 문자열이라 문장 파싱/라벨 조회를 한 번만)
+    children: Dict[str, _HistogramChild] = {}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        child = children.get(statement)
+        if child is None:
+            if len(children) >= STATEMENT_CACHE_SIZE:
+                children.clear()
+            child = children[statement] = duration.labels(name, _operation(statement))
+        child.observe(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        stack = context.connection.info.get("query_start") if context.connection is not None else None
+        if stack:
+            stack.pop()
+        errors.labels(name, _operation(context.statement or "")).inc()
+
+
+class track_upstream:
+    """
+    외부 API 호출 시간 기록
+
+        with track_upstream("kakao") as call:
+            response = await client.get(...)
+            call.status_code = response.status_code
+
+    outcome 라벨: 상태 코드 계열(2xx/4xx/5xx), 예외면 timeout / cancelled / error
+    """
+
+    __slots__ = ("service", "status_code", "_start")
+
+    def __init__(self, service: str):
+        self.service = service
+        self.status_code: Optional[int] = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            if issubclass(exc_type, asyncio.CancelledError):
+                outcome = "cancelled"  # asyncio.wait_for 데드라인 초과 포함
+            elif "Timeout" in exc_type.__name__:
+                outcome = "timeout"
+            else:
+                outcome = "error"
+        elif self.status_code is not None:
+            outcome = f"{self.status_code // 100}xx"
+        else:
+            outcome = "ok"
+        UPSTREAM_REQUEST_DURATION.labels(self.service, outcome).observe(time.perf_counter() - self._start)
+        return False
@@ -1,96 +1,60 @@
 #!/usr/bin/env python3
 """
-Database migration script to add missing columns
+Database migration CLI (schema_migrations 실행기)
+
+Usage:
+    python migrate_database.py             # 남은 마이그레이션 모두 적용
+    python migrate_database.py --dry-run   # 실행할 SQL만 출력
+    python migrate_database.py --status    # 현재/최신 스키마 버전 출력
+    python migrate_database.py --target 3  # 3번까지만 적용
 """
 
-import sqlite3
-import os
+import argparse
+import sys
 
-def get_db_path():
-    """Get the correct database path"""
-    is_production = os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("RAILWAY_STATIC_URL") or (os.getenv("PORT") and not os.path.exists("./venv"))
+from database import engine
+from schema_migrations import BACKFILL_BATCH_SIZE, LATEST_VERSION, MIGRATIONS, current_version, migrate
 
-    if is_production:
-        return "/tmp/community_control.db"
-    else:
-        return "./community_control.db"
 
-def migrate_users_table():
-    """Add missing columns to users table"""
-    db_path = get_db_path()
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without changing the database")
+    parser.add_argument("--status", action="store_true", help="show schema version and exit")
+    parser.add_argument("--target", type=int, default=None, help="migrate up to this version")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="rows per backfill batch")
+    args = parser.parse_args()
 
     print(f"\n{'='*60}")
-    print("Database Migration Script")
+    print("Database Migration")
     print(f"{'='*60}")
-    print(f"Database path: {db_path}")
-
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Check existing columns
-        cursor.execute("PRAGMA table_info(users);")
-        columns = [row[1] for row in cursor.fetchall()]
-        print(f"\nExisting columns in users table:")
-        for col in columns:
-            print(f"  - {col}")
-
-        # Add missing columns
-        migrations = []
-
-        if 'social_provider' not in columns:
-            migrations.append("ALTER TABLE users ADD COLUMN social_provider VARCHAR")
-
-        if 'social_id' not in columns:
-            migrations.append(("ALTER TABLE users ADD COLUMN social_id VARCHAR",
-                             "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_social_id ON users (social_id)"))
-
-        if migrations:
-            print(f"\n{'='*60}")
-            print("Applying migrations:")
-            print(f"{'='*60}")
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
 
-            for migration in migrations:
-                if isinstance(migration, tuple):
-                    # Execute multiple statements
-                    for stmt in migration:
-                        print(f"\n✅ Executing: {stmt}")
-                        cursor.execute(stmt)
-                else:
-                    # Execute single statement
-                    print(f"\n✅ Executing: {migration}")
-                    cursor.execute(migration)
+    with engine.connect() as conn:
+        version = current_version(conn)
+    print(f"Schema version: {version} (latest {LATEST_VERSION})\n")
 
-            conn.commit()
-            print(f"\n✅ Migration completed successfully!")
-        else:
-            print(f"\n✅ No migrations needed - all columns exist")
-
-        # Verify final schema
-        print(f"\n{'='*60}")
-        print("Final table schema:")
-        print(f"{'='*60}")
-        cursor.execute("PRAGMA table_info(users);")
-        for row in cursor.fetchall():
-            print(f"  {row[0]:2d}. {row[1]:20s} {row[2]:10s} (NOT NULL: {row[3]}, DEFAULT: {row[4] or 'None'})")
-
-        conn.close()
-        return True
+    if args.status:
+        for migration in MIGRATIONS:
+            mark = "✅" if migration.version <= version else "⏳"
+            print(f"  {mark} {migration.version}: {migration.description}")
+        return 0
 
+    try:
+        applied = migrate(engine, dry_run=args.dry_run, target=args.target, batch_size=args.batch_size)
     except Exception as e:
         print(f"\n❌ Migration failed: {str(e)}")
         import traceback
         traceback.print_exc()
-        return False
-
-if __name__ == "__main__":
-    success = migrate_users_table()
+        return 1
 
-    if success:
-        print(f"\n{'='*60}")
-        print("✅ Database migration completed successfully!")
-        print(f"{'='*60}\n")
+    print(f"\n{'='*60}")
+    if args.dry_run:
+        print(f"🔍 Dry run: {len(applied)} migration(s) pending, nothing changed")
     else:
-        print(f"\n{'='*60}")
-        print("❌ Database migration failed!")
-        print(f"{'='*60}\n")
+        print(f"✅ Database migration completed successfully! (applied: {applied or 'none'})")
+    print(f"{'='*60}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+요청 단위 프로파일링 (관리자가 켤 때만 동작)
+
+/meetings, /register 등이 느려졌을 때 운영 환경에서 시간이 어디에 쓰이는지 확인하기 위한 통계적 샘플러입니다.
+- 꺼져 있으면 ProfilingMiddleware는 속성 하나만 확인하고 그대로 통과
+- 켜면 routes(fnmatch 패턴, 비어 있으면 전체)에 맞는 요청을 sample_rate 비율로 프로파일
+- 프로파일 중에는 별도 스레드가 interval_ms마다 sys._current_frames()로 모든 스레드의 스택을 읽음 (wall-clock)
+  이벤트 루프 스레드가 I/O를 기다리는 구간은 "(idle)"로, 스레드 풀(동기 엔드포인트/DB 작업)의 스택은 스레드 이름 아래에 기록
+- 한 번에 한 요청만 프로파일 (동시에 들어온 다른 요청은 그대로 처리)
+- 결과: collapsed stacks(flamegraph.pl / speedscope 입력) 또는 speedscope JSON, 최근 PROFILE_KEEP개 보관
+  PROFILE_DIR이 있으면 파일로도 저장
+- 켠 상태는 expires_in_seconds(기본 PROFILE_TTL_SECONDS) 뒤 자동으로 꺼짐
+
+환경 변수로 시작 시부터 켤 수 있음: PROFILE_SAMPLE_RATE, PROFILE_ROUTES(쉼표 구분)
+"""
+import asyncio
+import fnmatch
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0이면 꺼진 상태로 시작
+PROFILE_ROUTES = [route for route in os.getenv("PROFILE_ROUTES", "").split(",") if route]
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_TTL_SECONDS = float(os.getenv("PROFILE_TTL_SECONDS", "600"))
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+
+IDLE_FRAME = "(idle)"
+# 스택 맨 위(leaf)가 이 함수면 그 스레드는 대기 중 (스레드 풀 워커의 작업 대기, 이벤트 루프의 select 등)
+IDLE_FUNCTIONS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("runners.py", "run"),  # uvloop: 루프가 C 코드에서 대기하면 asyncio.run이 맨 위 파이썬 프레임
+}
+
+
+class StackSampler:
+    """별도 스레드에서 interval마다 모든 스레드의 스택을 읽어 collapsed stack별로 집계"""
+
+    def __init__(self, interval: float, loop_thread_id: int):
+        self.interval = interval
+        self.loop_thread_id = loop_thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopping.set()
+        self._thread.join()
+        return self.stacks
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stopping.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                leaf = frame.f_code
+                idle = (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FUNCTIONS
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                thread_name = names.get(thread_id, str(thread_id))
+                if idle:
+                    if thread_id == self.loop_thread_id:
+                        self.stacks[f"{thread_name};{IDLE_FRAME}"] += 1
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                frames.append(thread_name)
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    route: Optional[str]
+    status: int
+    started_at: datetime
+    duration_ms: float
+    interval_ms: float
+    samples: int
+    stacks: Dict[str, int] = field(repr=False)
+
+    def top_frames(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """자기 시간(self time) 기준 상위 함수 ((idle) 제외)"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            if leaf != IDLE_FRAME:
+                leaves[leaf] += count
+        return [{"frame": frame, "samples": count} for frame, count in leaves.most_common(limit)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 1),
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "top_frames": self.top_frames(),
+        }
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope가 읽는 collapsed stacks ("a;b;c 횟수" 한 줄씩)"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def speedscope(self) -> Dict[str, Any]:
+        """speedscope sampled 프로파일 (가중치 단위: 밀리초)"""
+        frame_index: Dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in sorted(self.stacks.items()):
+            samples.append([frame_index.setdefault(name, len(frame_index)) for name in stack.split(";")])
+            weights.append(count * self.interval_ms)
+        name = f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frame_index]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "seoulchess-profiling",
+        }
+
+    def write(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{self.started_at:%Y%m%dT%H%M%S}-{self.id}")
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(), f)
+
+
+class Profiler:
+    """프로파일링 설정 + 최근 프로파일 보관"""
+
+    def __init__(self, sample_rate: float = PROFILE_SAMPLE_RATE, routes: Sequence[str] = PROFILE_ROUTES,
+                 interval_ms: float = PROFILE_INTERVAL_MS, keep: int = PROFILE_KEEP,
+                 output_dir: Optional[str] = PROFILE_DIR, rand: Callable[[], float] = random.random):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.routes: List[str] = []
+        self.interval_ms = interval_ms
+        self.min_duration_ms = 0.0
+        self.expires_at: Optional[float] = None
+        self.output_dir = output_dir
+        self.rand = rand
+        self.profiles: Deque[Profile] = deque(maxlen=keep)
+        self._active = False
+        if sample_rate > 0:
+            self.configure(sample_rate=sample_rate, routes=routes, expires_in_seconds=None)
+
+    def configure(self, sample_rate: float, routes: Sequence[str] = (), interval_ms: Optional[float] = None,
+                  min_duration_ms: float = 0.0, expires_in_seconds: Optional[float] = PROFILE_TTL_SECONDS):
+        """sample_rate > 0이면 켜고 0이면 끔 (expires_in_seconds=None이면 자동으로 꺼지지 않음)"""
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.routes = list(routes)
+        if interval_ms is not None:
+            self.interval_ms = interval_ms
+        self.min_duration_ms = min_duration_ms
+        self.expires_at = time.monotonic() + expires_in_seconds if expires_in_seconds else None
+        self.enabled = sample_rate > 0
+
+    def disable(self):
+        self.configure(sample_rate=0.0)
+
+    def should_profile(self, path: str) -> bool:
+        if self._active:
+            return False
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            self.disable()
+            return False
+        if self.routes and not any(fnmatch.fnmatchcase(path, pattern) for pattern in self.routes):
+            return False
+        return self.rand() < self.sample_rate
+
+    def config(self) -> Dict[str, Any]:
+        expires_in = None
+        if self.enabled and self.expires_at is not None:
+            expires_in = max(0.0, round(self.expires_at - time.monotonic(), 1))
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "routes": self.routes,
+            "interval_ms": self.interval_ms,
+            "min_duration_ms": self.min_duration_ms,
+            "expires_in_seconds": expires_in,
+            "kept": len(self.profiles),
+        }
+
+    def slowest(self, limit: int = 20) -> List[Profile]:
+        return sorted(self.profiles, key=lambda profile: profile.duration_ms, reverse=True)[:limit]
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+    def clear(self):
+        self.profiles.clear()
+
+
+class ProfilingMiddleware:
+    """Profiler가 켜져 있을 때 선택된 요청을 샘플링 프로파일 (순수 ASGI)"""
+
+    def __init__(self, app, profiler: Optional["Profiler"] = None):
+        self.app = app
+        self.profiler = profiler if profiler is not None else get_profiler()
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if not profiler.enabled or scope["type"] != "http" or not profiler.should_profile(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler._active = True
+        sampler = StackSampler(profiler.interval_ms / 1000, threading.get_ident())
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            stacks = sampler.stop()
+            profiler._active = False
+            if duration_ms >= profiler.min_duration_ms:
+                profile = Profile(
+                    id=uuid.uuid4().hex[:12],
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=getattr(scope.get("route"), "path", None),
+                    status=status_code,
+                    started_at=started_at,
+                    duration_ms=duration_ms,
+                    interval_ms=profiler.interval_ms,
+                    samples=sampler.samples,
+                    stacks=dict(stacks),
+                )
+                profiler.profiles.append(profile)
+                if profiler.output_dir:
+                    await asyncio.to_thread(profile.write, profiler.output_dir)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
@@ -0,0 +1,204 @@
+"""
+요청 단위 SQL 쿼리 추적 / N+1 감지
+
+핸들러가 lazy relationship을 건드리면 요청 하나가 쿼리를 몇 개나 실행하는지 코드만 봐서는 알기 어렵습니다.
+- instrument_queries(engine): 엔진 이벤트로 현재 요청의 QueryTracker에 쿼리 수/시간을 기록
+  (추적 중이 아니면 ContextVar 하나만 확인하고 끝)
+- QueryTrackingMiddleware: 요청마다 QueryTracker를 ContextVar로 설정
+  이벤트 루프에서 실행되는 세션(AsyncSession 포함)과 스레드 풀의 동기 의존성 모두 같은 tracker로 기록됨
+  (run_in_threadpool / greenlet이 contextvars를 복사)
+- 같은 SQL 문자열이 한 요청에서 N_PLUS_ONE_THRESHOLD번 이상 실행되면 N+1 패턴으로 보고
+  (ORM 컴파일 캐시 덕분에 lazy load는 파라미터만 다른 같은 문자열로 실행됨)
+  → WARNING 로그, db_n_plus_one_total 카운터, 라우트별 db_queries_per_request 히스토그램
+- 테스트: capture_query_reports()로 요청별 QueryReport를 모아 check_query_budget()으로 예산 초과 시 실패
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from metrics import REGISTRY, UNMATCHED_ROUTE
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "3"))
+QUERY_LOG_N_PLUS_ONE = os.getenv("QUERY_LOG_N_PLUS_ONE", "1") != "0"
+
+logger = logging.getLogger("seoulchess.sql")
+
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89))
+DB_N_PLUS_ONE = REGISTRY.counter(
+    "db_n_plus_one", "Requests that repeated an identical SQL statement N_PLUS_ONE_THRESHOLD+ times", ("route",))
+
+
+class QueryTracker:
+    """한 요청(또는 with track_queries() 블록)에서 실행된 쿼리 집계"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # SQL 문자열 → [실행 횟수, 누적 시간]
+        self.statements: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """threshold번 이상 실행된 같은 SQL (많이 실행된 순)"""
+        found = [(statement, int(count)) for statement, (count, _) in self.statements.items() if count >= threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+_current: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def current_tracker() -> Optional[QueryTracker]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    """블록 안에서 (같은 컨텍스트로) 실행된 쿼리를 새 QueryTracker에 기록"""
+    tracker = QueryTracker()
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+
+
+def instrument_queries(engine: Engine):
+    """
+    엔진의 쿼리를 현재 QueryTracker에 기록 (비동기 엔진은 async_engine.sync_engine을 넘김)
+
+    같은 엔진에 여러 번 호출해도 한 번만 등록합니다.
+    """
+    if engine.__dict__.get("_queries_tracked"):
+        return
+    engine._queries_tracked = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("tracked_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        tracker = _current.get()
+        if tracker is not None:
+            tracker.record(statement, time.perf_counter() - conn.info["tracked_query_start"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        if _current.get() is None or context.connection is None:
+            return
+        stack = context.connection.info.get("tracked_query_start")
+        if stack:
+            _current.get().record(context.statement or "", time.perf_counter() - stack.pop())
+
+
+@dataclass
+class QueryReport:
+    method: str
+    path: str
+    route: str
+    status: int
+    queries: int
+    db_ms: float
+    repeated: List[Tuple[str, int]] = field(default_factory=list)
+
+    def describe(self) -> str:
+        lines = [f"{self.method} {self.path} → {self.status}: {self.queries} queries, {self.db_ms:.1f} ms"]
+        for statement, count in self.repeated:
+            lines.append(f"  N+1? {count}x {' '.join(statement.split())}")
+        return "\n".join(lines)
+
+
+# capture_query_reports()가 등록한 리스트 (테스트용, 평소엔 비어 있음)
+_report_sinks: List[List[QueryReport]] = []
+
+
+@contextmanager
+def capture_query_reports() -> Iterator[List[QueryReport]]:
+    """블록 안에서 끝난 요청의 QueryReport를 모음 (TestClient는 앱을 다른 스레드에서 실행하므로 ContextVar 대신 사용)"""
+    reports: List[QueryReport] = []
+    _report_sinks.append(reports)
+    try:
+        yield reports
+    finally:
+        _report_sinks.remove(reports)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def check_query_budget(report: QueryReport, max_queries: int, allow_repeats: bool = False):
+    """쿼리 수가 max_queries를 넘거나 (allow_repeats=False일 때) N+1 패턴이 있으면 QueryBudgetExceeded"""
+    problems = []
+    if report.queries > max_queries:
+        problems.append(f"{report.queries} queries > budget {max_queries}")
+    if report.repeated and not allow_repeats:
+        problems.append("repeated identical statements (N+1)")
+    if problems:
+        raise QueryBudgetExceeded(f"{', '.join(problems)}\n{report.describe()}")
+
+
+class QueryTrackingMiddleware:
+    """요청마다 QueryTracker 설정, 끝나면 쿼리 수 기록 + N+1 보고 (순수 ASGI)"""
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD, log_n_plus_one: bool = QUERY_LOG_N_PLUS_ONE):
+        self.app = app
+        self.threshold = threshold
+        self.log_n_plus_one = log_n_plus_one
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        tracker = QueryTracker()
+        token = _current.set(tracker)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._finish(scope, status_code, tracker)
+
+    def _finish(self, scope, status_code: int, tracker: QueryTracker):
+        route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+        DB_QUERIES_PER_REQUEST.labels(route).observe(tracker.count)
+        repeated = tracker.repeated(self.threshold)
+        if not repeated and not _report_sinks:
+            return
+        report = QueryReport(scope["method"], scope["path"], route, status_code, tracker.count,
+                             tracker.seconds * 1000, repeated)
+        for sink in _report_sinks:
+            sink.append(report)
+        if repeated:
+            DB_N_PLUS_ONE.labels(route).inc()
+            if self.log_n_plus_one:
+                logger.warning("Possible N+1 query pattern\n%s", report.describe())
@@ -1,16 +1,42 @@
 import os
-import requests
-from typing import List, Dict
+import time
+from typing import AsyncIterator, List, Dict
 from dotenv import load_dotenv
+from knowledge_index import KnowledgeIndex
+from chat_cache import ChatResponseCache
+from gemini_client import GeminiError, GeminiNetworkError, GeminiTimeoutError, get_gemini_client
 
 load_dotenv()
 
+KNOWLEDGE_BASE_PATH = "knowledge_base.txt"
+# knowledge_base.txt 변경 여부를 확인하는 최소 간격 (초)
+KNOWLEDGE_BASE_CHECK_INTERVAL = 5.0
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 1024,
+}
+
+class ChatStreamError(Exception):
+    """스트리밍 응답 생성 실패 (message: 사용자에게 보여줄 안내 문구)"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
 class RAGChatbot:
     def __init__(self):
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.initialized = False
         self.knowledge_base = []
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
+        self.index = KnowledgeIndex([])
+        self.gemini = get_gemini_client()
+        self.cache = ChatResponseCache()
+        self._kb_mtime = None
+        self._kb_checked_at = 0.0
         
         if not self.gemini_api_key:
             print("⚠️  WARNING: GEMINI_API_KEY not found - chatbot will not work")
@@ -22,84 +48,94 @@ class RAGChatbot:
             
             self.initialized = True
             print(f"✅ RAG Chatbot initialized successfully (using REST API)")
-            print(f"📡 API URL: {self.api_url}")
+            print(f"📡 API URL: {self.gemini.api_url}")
             
         except Exception as e:
             print(f"❌ Failed to initialize RAG Chatbot: {e}")
             self.initialized = False
     
     def _load_knowledge_base(self):
-        """Load knowledge base file into memory for simple text search"""
+        """Load knowledge base file into memory and build the retrieval index"""
         try:
-            with open("knowledge_base.txt", "r", encoding="utf-8") as f:
+            # 읽기 전 mtime을 기록해 두고 성공한 뒤에만 반영 (실패하면 다음 확인 때 다시 시도)
+            mtime = os.path.getmtime(KNOWLEDGE_BASE_PATH)
+            with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
                 content = f.read()
 
             # Split by sections
             sections = content.split("\n##")
 
+            knowledge_base = []
             for i, section in enumerate(sections):
                 if section.strip():
-                    self.knowledge_base.append({
+                    knowledge_base.append({
                         'id': i,
                         'content': section.strip(),
-                        'content_lower': section.strip().lower()
                     })
 
+            # Build inverted index once (postings + BM25 weights)
+            self.index = KnowledgeIndex([doc['content'] for doc in knowledge_base])
+            self.knowledge_base = knowledge_base
+            self._kb_mtime = mtime
+
+            # Cached answers were generated from the old contents
+            self.cache.clear()
+
             print(f"✅ Loaded {len(self.knowledge_base)} documents into knowledge base")
         except Exception as e:
             print(f"❌ Error loading knowledge base: {e}")
+
+    def _reload_knowledge_base_if_changed(self):
+        """Reload the knowledge base (and invalidate the cache) when the file changes"""
+        now = time.monotonic()
+        if now - self._kb_checked_at < KNOWLEDGE_BASE_CHECK_INTERVAL:
+            return
+        self._kb_checked_at = now
+
+        try:
+            mtime = os.path.getmtime(KNOWLEDGE_BASE_PATH)
+        except OSError:
+            return
+        if mtime != self._kb_mtime:
+            print("🔄 knowledge_base.txt changed - reloading and clearing chat cache")
+            self._load_knowledge_base()
     
     def _search_knowledge(self, query: str, top_k: int = 3) -> List[str]:
-        """Search for documents related to the query (simple keyword matching)"""
+        """Search for documents related to the query (BM25 over the inverted index)"""
         try:
-            query_lower = query.lower()
-            query_words = set(query_lower.split())
-
-            # Calculate matching score for each document
-            scored_docs = []
-            for doc in self.knowledge_base:
-                doc_words = set(doc['content_lower'].split())
-
-                # Count common words
-                common_words = query_words.intersection(doc_words)
-                score = len(common_words)
-
-                # Partial keyword matching
-                for word in query_words:
-                    if word in doc['content_lower']:
-                        score += 2  # Weight for partial matching
-
-                if score > 0:
-                    scored_docs.append((score, doc['content']))
-
-            # Sort by score and return top_k
-            scored_docs.sort(reverse=True, key=lambda x: x[0])
-            return [doc for score, doc in scored_docs[:top_k]]
-
+            return [self.knowledge_base[doc_id]['content'] for score, doc_id in self.index.search(query, top_k)]
         except Exception as e:
             print(f"❌ Error searching knowledge: {e}")
             return []
     
-    def chat(self, user_message: str, conversation_history: List[Dict] = None) -> str:
-        """Generate RAG-based chatbot response (direct REST API call)"""
-        if not self.initialized:
-            return "Sorry, the chatbot service is currently unavailable. Please contact the administrator."
+    @staticmethod
+    def _detect_language(user_message: str) -> str:
+        """Simple language detection (check Korean character ratio)"""
+        korean_chars = sum(1 for c in user_message if '\uac00' <= c <= '\ud7a3')
+        total_chars = len(user_message.replace(' ', ''))
+        is_korean = (korean_chars / total_chars > 0.3) if total_chars > 0 else False
+        return "ko" if is_korean else "en"
 
-        try:
-            # 1. Search for relevant knowledge
-            relevant_docs = self._search_knowledge(user_message)
+    def _prepare(self, user_message: str):
+        """Retrieve context and build the prompt; returns (cache_key, cached_response, full_prompt)"""
+        self._reload_knowledge_base_if_changed()
 
-            # 2. Build context
-            context = "\n\n".join(relevant_docs) if relevant_docs else "No information available."
+        # 1. Search for relevant knowledge
+        relevant_docs = self._search_knowledge(user_message)
 
-            # 3. Detect language and generate prompt
-            # Simple language detection (check Korean character ratio)
-            korean_chars = sum(1 for c in user_message if '\uac00' <= c <= '\ud7a3')
-            total_chars = len(user_message.replace(' ', ''))
-            is_korean = (korean_chars / total_chars > 0.3) if total_chars > 0 else False
+        # 2. Build context
+        context = "\n\n".join(relevant_docs) if relevant_docs else "No information available."
 
-            if is_korean:
-                system_prompt = f"""You are a friendly customer support chatbot for Seoul Chess Club (SCC).
+        # 3. Detect language and check the response cache
+        language = self._detect_language(user_message)
+        cache_key = self.cache.make_key(user_message, language, context)
+        cached_response = self.cache.get(cache_key)
+        if cached_response is not None:
+            return cache_key, cached_response, None
+
+        # 4. Generate prompt
+        if language == "ko":
+            system_prompt = f"""You are a friendly customer support chatbot for Seoul Chess Club (SCC).
 Please answer the user's question **in Korean** based on the knowledge base below.
 
 Knowledge Base:
@@ -112,9 +148,9 @@ Response Guidelines:
 - Use emojis appropriately (♟️, ✨, 🎉, etc.)
 - Keep answers concise, 2-3 sentences
 """
-                user_label = "User Question"
-            else:
-                system_prompt = f"""You are a friendly customer support chatbot for Seoul Chess Club (SCC).
+            user_label = "User Question"
+        else:
+            system_prompt = f"""You are a friendly customer support chatbot for Seoul Chess Club (SCC).
 Please answer the user's question **in English** based on the knowledge base below.
 
 Knowledge Base:
@@ -127,59 +163,85 @@ Response Guidelines:
 - Use emojis appropriately (♟️, ✨, 🎉, etc.)
 - Keep answers concise, 2-3 sentences
 """
-                user_label = "User Question"
-
-            # 4. Build REST API request
-            full_prompt = f"{system_prompt}\n\n{user_label}: {user_message}"
-
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 1024,
-                }
-            }
-
-            # 5. Call Gemini REST API
-            response = requests.post(
-                f"{self.api_url}?key={self.gemini_api_key}",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        text = candidate['content']['parts'][0]['text']
-                        return text.strip()
-                    else:
-                        print(f"❌ Unexpected response structure: {result}")
-                        return "Sorry, I couldn't generate a response. Please try again."
-                else:
-                    print(f"❌ No candidates in response: {result}")
-                    return "Sorry, I couldn't generate a response. Please try again."
-            else:
-                print(f"❌ API Error: {response.status_code} - {response.text}")
-                return f"Sorry, a temporary error occurred. (Error code: {response.status_code})"
-
-        except requests.exceptions.Timeout:
+            user_label = "User Question"
+
+        # 5. Build prompt
+        full_prompt = f"{system_prompt}\n\n{user_label}: {user_message}"
+        return cache_key, None, full_prompt
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        """Map a generation failure to the user-facing message"""
+        if isinstance(error, GeminiTimeoutError):
             print(f"❌ Timeout error in chat")
             return "Sorry, the request timed out. Please try again."
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request error in chat: {e}")
+        if isinstance(error, GeminiNetworkError):
+            print(f"❌ Network error in chat: {error}")
             return "Sorry, a network error occurred. Please check your connection and try again."
+        if isinstance(error, GeminiError):
+            print(f"❌ API Error: {error}")
+            if error.status_code is not None:
+                return f"Sorry, a temporary error occurred. (Error code: {error.status_code})"
+            # 응답은 받았지만 텍스트 후보를 꺼낼 수 없는 경우
+            return "Sorry, I couldn't generate a response. Please try again."
+        print(f"❌ Unexpected error in chat: {error}")
+        return "Sorry, an unexpected error occurred. Please try again."
+
+    async def chat(self, user_message: str, conversation_history: List[Dict] = None) -> str:
+        """Generate RAG-based chatbot response (shared async Gemini client)"""
+        if not self.initialized:
+            return "Sorry, the chatbot service is currently unavailable. Please contact the administrator."
+
+        try:
+            cache_key, cached_response, full_prompt = self._prepare(user_message)
+            if cached_response is not None:
+                return cached_response
+
+            # 6. Call Gemini REST API (non-blocking, pooled connection)
+            response_text = await self.gemini.generate_text(full_prompt, generation_config=GENERATION_CONFIG)
+
+            # Only successful answers are cached
+            self.cache.set(cache_key, response_text)
+            return response_text
+
         except Exception as e:
-            print(f"❌ Unexpected error in chat: {e}")
-            return "Sorry, an unexpected error occurred. Please try again."
+            return self._error_message(e)
+
+    async def chat_stream(self, user_message: str, conversation_history: List[Dict] = None) -> AsyncIterator[str]:
+        """
+        Generate RAG-based chatbot response as text chunks, yielded as Gemini produces them
+
+        Raises:
+            ChatStreamError: generation failed (possibly after some chunks were already yielded);
+                             the error text is never yielded as an answer chunk
+        """
+        if not self.initialized:
+            raise ChatStreamError("Sorry, the chatbot service is currently unavailable. Please contact the administrator.")
+
+        try:
+            cache_key, cached_response, full_prompt = self._prepare(user_message)
+            if cached_response is not None:
+                yield cached_response
+                return
+
+            chunks = []
+            async for chunk in self.gemini.stream_text(full_prompt, generation_config=GENERATION_CONFIG):
+                # Leading whitespace is stripped to match the blocking response
+                if not chunks:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                chunks.append(chunk)
+                yield chunk
+
+            # Only complete answers are cached
+            response_text = "".join(chunks).strip()
+            if response_text:
+                self.cache.set(cache_key, response_text)
+
+        except Exception as e:
+            raise ChatStreamError(self._error_message(e)) from e
+
 
 
 # Singleton instance
@@ -0,0 +1,276 @@
+"""
+SMS 인증 레이트 리밋 / OTP 시도 제한
+
+/sms/request, /sms/verify에서 SQL DB에 닿기 전에 요청을 거릅니다.
+거부되는 요청은 DB를 전혀 건드리지 않으며, 모든 검사는 키 몇 개에 대한 O(1) 연산입니다.
+
+- 번호별 쿨다운: 코드 재요청 간격 (SET NX + TTL)
+- 번호별 / IP별 요청 한도: 슬라이딩 윈도우 카운터 (현재/이전 고정 윈도우 카운트를 가중 합산)
+- 코드별 검증 시도 한도: 코드 발급 시 초기화되는 시도 카운터
+
+백엔드:
+- MemoryBackend: 프로세스 내 딕셔너리 (기본값, 워커 1개 기준)
+- RedisBackend: redis.asyncio 호환 클라이언트 (REDIS_URL 설정 시, 여러 워커/인스턴스가 한도를 공유)
+"""
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+
+SMS_REQUEST_COOLDOWN_SECONDS = int(os.getenv("SMS_REQUEST_COOLDOWN_SECONDS", "30"))
+SMS_REQUEST_PHONE_LIMIT = int(os.getenv("SMS_REQUEST_PHONE_LIMIT", "5"))  # 번호당 / 윈도우
+SMS_REQUEST_IP_LIMIT = int(os.getenv("SMS_REQUEST_IP_LIMIT", "20"))  # IP당 / 윈도우
+SMS_REQUEST_WINDOW_SECONDS = int(os.getenv("SMS_REQUEST_WINDOW_SECONDS", "3600"))
+SMS_VERIFY_IP_LIMIT = int(os.getenv("SMS_VERIFY_IP_LIMIT", "30"))  # IP당 / 윈도우
+SMS_VERIFY_WINDOW_SECONDS = int(os.getenv("SMS_VERIFY_WINDOW_SECONDS", "600"))
+SMS_VERIFY_MAX_ATTEMPTS = int(os.getenv("SMS_VERIFY_MAX_ATTEMPTS", "5"))  # 발급된 코드당
+OTP_TTL_SECONDS = 5 * 60  # 인증 코드 유효 시간과 같음
+TRUST_FORWARDED_FOR = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "1") == "1"
+MEMORY_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "100000"))
+KEY_PREFIX = "scc:rl:"
+# 메모리가 가득 차도 제거하지 않는 키 (쿨다운 / OTP 시도): 제거하면 제한이 풀림
+PROTECTED_PREFIXES = (KEY_PREFIX + "cd:", KEY_PREFIX + "otp:")
+# 보호 키만으로 가득 차 새 카운터를 만들 수 없을 때 incr이 돌려주는 값 (어떤 한도보다 커서 거부됨)
+FAIL_CLOSED_COUNT = sys.maxsize
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    retry_after: float = 0.0
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+
+# --------------------
+# 백엔드
+# --------------------
+class MemoryBackend:
+    """
+    프로세스 내 키-값 저장소 (TTL 지원)
+
+    키는 만든 순서대로 두 OrderedDict에 나눠 저장합니다.
+    - 윈도우 카운터 (sw:): 가득 차면 가장 먼저 만든 키부터 O(1)로 제거
+    - 쿨다운 / OTP 시도 (cd:, otp:): 제거하지 않음. 만료된 키만 정리하고,
+      이 키들만으로 가득 차면 새 키를 만들지 않고 요청을 거부 (fail closed)
+    만료 키는 조회 시, 그리고 가득 찼을 때 앞쪽(오래된 키)부터 정리합니다.
+    """
+
+    def __init__(self, max_keys: int = MEMORY_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> (value, expires_at), 만든 순서
+        self._counters: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._protected: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters) + len(self._protected)
+
+    def _store(self, key: str) -> "OrderedDict[str, Tuple[int, float]]":
+        return self._protected if key.startswith(PROTECTED_PREFIXES) else self._counters
+
+    def _live(self, key: str, now: float) -> Optional[Tuple[int, float]]:
+        store = self._store(key)
+        entry = store.get(key)
+        if entry is not None and entry[1] <= now:
+            del store[key]
+            return None
+        return entry
+
+    def _make_room(self, now: float) -> bool:
+        """새 키 하나를 넣을 자리 확보 (분할 상환 O(1)), 보호 키만으로 가득 차 있으면 False"""
+        if len(self) < self.max_keys:
+            return True
+        for store in (self._counters, self._protected):
+            while store and next(iter(store.values()))[1] <= now:
+                store.popitem(last=False)
+        if len(self) < self.max_keys:
+            return True
+        if self._counters:
+            self._counters.popitem(last=False)
+            return True
+        return False
+
+    async def incr(self, key: str, ttl: float) -> int:
+        with self._lock:
+            now = self.clock()
+            entry = self._live(key, now)
+            if entry is None:
+                if not self._make_room(now):
+                    return FAIL_CLOSED_COUNT
+                entry = (0, now + ttl)
+            value = entry[0] + 1
+            self._store(key)[key] = (value, entry[1])
+            return value
+
+    async def get(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key, self.clock())
+            return entry[0] if entry else 0
+
+    async def set_if_absent(self, key: str, ttl: float) -> bool:
+        with self._lock:
+            now = self.clock()
+            if self._live(key, now) is not None or not self._make_room(now):
+                return False
+            self._store(key)[key] = (1, now + ttl)
+            return True
+
+    async def ttl(self, key: str) -> float:
+        with self._lock:
+            now = self.clock()
+            entry = self._live(key, now)
+            return entry[1] - now if entry else 0.0
+
+    async def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._store(key).pop(key, None)
+
+    async def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._protected.clear()
+
+    async def aclose(self):
+        pass
+
+
+class RedisBackend:
+    """redis.asyncio 호환 클라이언트 백엔드 (incr/pexpire/get/set/pttl/delete 사용)"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def incr(self, key: str, ttl: float) -> int:
+        # 먼저 TTL과 함께 키를 만들어 두므로 INCR 후 프로세스가 죽어도 영구 키가 남지 않음
+        await self.client.set(key, 0, nx=True, px=int(ttl * 1000))
+        return int(await self.client.incr(key))
+
+    async def get(self, key: str) -> int:
+        value = await self.client.get(key)
+        return int(value) if value is not None else 0
+
+    async def set_if_absent(self, key: str, ttl: float) -> bool:
+        return bool(await self.client.set(key, 1, nx=True, px=int(ttl * 1000)))
+
+    async def ttl(self, key: str) -> float:
+        remaining = await self.client.pttl(key)
+        return remaining / 1000 if remaining and remaining > 0 else 0.0
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+
+    async def clear(self):
+        keys = [key async for key in self.client.scan_iter(match=KEY_PREFIX + "*")]
+        await self.delete(*keys)
+
+    async def aclose(self):
+        close = getattr(self.client, "aclose", None) or self.client.close  # redis-py < 5.0.1: close()
+        await close()
+
+
+# --------------------
+# 리미터
+# --------------------
+class RateLimiter:
+    """쿨다운 / 슬라이딩 윈도우 / OTP 시도 제한"""
+
+    def __init__(self, backend, clock=time.time):
+        self.backend = backend
+        self.clock = clock
+
+    async def cooldown(self, key: str, seconds: float) -> Decision:
+        """seconds 동안 한 번만 허용"""
+        key = KEY_PREFIX + "cd:" + key
+        if await self.backend.set_if_absent(key, seconds):
+            return Decision(True)
+        return Decision(False, await self.backend.ttl(key) or seconds)
+
+    async def release_cooldown(self, key: str):
+        await self.backend.delete(KEY_PREFIX + "cd:" + key)
+
+    async def hit(self, key: str, limit: int, window: float) -> Decision:
+        """
+        슬라이딩 윈도우 카운터: 이전 윈도우 카운트를 남은 비율만큼 더해 최근 window초의 요청 수를 추정
+        """
+        now = self.clock()
+        index = int(now // window)
+        elapsed = now - index * window
+        current = await self.backend.incr(f"{KEY_PREFIX}sw:{key}:{index}", ttl=window * 2)
+        previous = await self.backend.get(f"{KEY_PREFIX}sw:{key}:{index - 1}")
+        estimated = previous * (1 - elapsed / window) + current
+        if estimated <= limit:
+            return Decision(True)
+        return Decision(False, window - elapsed)
+
+    # OTP 검증 시도
+    def _attempts_key(self, phone_number: str) -> str:
+        return f"{KEY_PREFIX}otp:{phone_number}"
+
+    async def verify_attempt(self, phone_number: str, max_attempts: int = SMS_VERIFY_MAX_ATTEMPTS) -> Decision:
+        key = self._attempts_key(phone_number)
+        if await self.backend.incr(key, ttl=OTP_TTL_SECONDS) <= max_attempts:
+            return Decision(True)
+        return Decision(False, await self.backend.ttl(key))
+
+    async def reset_attempts(self, phone_number: str):
+        """새 코드 발급 / 검증 성공 시 시도 횟수 초기화"""
+        await self.backend.delete(self._attempts_key(phone_number))
+
+    async def clear(self):
+        await self.backend.clear()
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+def client_ip(request: Request) -> str:
+    """
+    클라이언트 IP (Render/Railway 프록시 뒤: X-Forwarded-For의 마지막 값 = 프록시가 본 주소)
+    """
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def create_backend(redis_url: Optional[str] = None):
+    """REDIS_URL이 있으면 Redis, 없으면 프로세스 내 백엔드"""
+    redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
+    if not redis_url:
+        return MemoryBackend()
+    try:
+        import redis.asyncio as redis_asyncio
+    except ImportError as e:
+        raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+    return RedisBackend(redis_asyncio.from_url(redis_url))
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(create_backend())
+    return _rate_limiter
+
+
+async def close_rate_limiter():
+    """앱 종료 시 Redis 연결 정리"""
+    global _rate_limiter
+    if _rate_limiter is not None:
+        await _rate_limiter.aclose()
+        _rate_limiter = None
@@ -0,0 +1,323 @@
+"""
+구조화된 요청 로그 (JSON lines)
+
+기존 log_requests 미들웨어는 요청마다 print를 세 번 호출하고 Authorization 등 헤더 전체를 그대로 출력했습니다.
+- 요청 경로에서는 LogRecord를 만들어 큐에 넣기만 함 (QueueHandler, 큐가 가득 차면 버리고 dropped로 집계)
+  헤더 디코딩/가림, 클라이언트 IP 계산도 쓰기 스레드로 미룸 (Deferred)
+- JSON 직렬화와 stdout 쓰기는 별도 스레드(LogWriter)가 LOG_FLUSH_SECONDS마다 모아서 수행
+- 샘플링: LOG_SAMPLE_RATE 비율만 기록하되 5xx / 예외 / 느린 요청(LOG_SLOW_REQUEST_MS 이상)은 항상 기록
+- 민감한 헤더(Authorization, Cookie, X-Admin-Code 등)는 값을 가림, 쿼리 문자열은 기록하지 않음
+- 요청별 시간 필드: duration_ms(응답 본문 전송 완료까지), ttfb_ms(응답 헤더 전송까지)
+- QueryTrackingMiddleware 안쪽에서 실행되면 db_queries(쿼리 수), db_ms(쿼리 시간 합계)도 기록
+
+순수 ASGI 미들웨어로 구현하여 BaseHTTPMiddleware(@app.middleware("http"))의 요청당 태스크/스트림 비용도 없앱니다.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, TextIO
+
+from starlette.requests import Request
+
+from query_tracking import current_tracker
+from rate_limit import client_ip
+
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+LOG_REQUEST_HEADERS = os.getenv("LOG_REQUEST_HEADERS", "1").lower() not in ("0", "false", "no")
+LOG_SKIP_PATHS = frozenset(path for path in os.getenv("LOG_SKIP_PATHS", "/health,/metrics").split(",") if path)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_SECONDS = float(os.getenv("LOG_FLUSH_SECONDS", "0.05"))
+
+SENSITIVE_HEADERS = frozenset({
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "set-cookie",
+    "x-admin-code",
+    "x-api-key",
+})
+REDACTED = "[REDACTED]"
+
+access_logger = logging.getLogger("seoulchess.access")
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+
+def redact_headers(raw_headers: Iterable, sensitive: FrozenSet[str] = SENSITIVE_HEADERS) -> Dict[str, str]:
+    """ASGI 헤더 목록 [(bytes, bytes)]를 dict로 바꾸면서 민감한 값은 가림"""
+    headers = {}
+    for key, value in raw_headers:
+        name = key.decode("latin-1").lower()
+        headers[name] = REDACTED if name in sensitive else value.decode("latin-1")
+    return headers
+
+
+class Deferred:
+    """JSON으로 쓸 때(쓰기 스레드에서) 계산할 값: func(*args)"""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable, *args):
+        self.func = func
+        self.args = args
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Deferred):
+        return value.func(*value.args)
+    return str(value)
+
+
+def _scope_client_ip(scope) -> str:
+    return client_ip(Request(scope))
+
+
+class JSONFormatter(logging.Formatter):
+    """LogRecord → JSON 한 줄 (record.fields의 값을 최상위 키로 펼침)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=_json_default, separators=(",", ":"))
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    요청 경로용 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출한 스레드에서 메시지를 포맷하므로 생략하고(포맷은 쓰기 스레드에서),
+    큐(락 없이 동작하는 C 구현 SimpleQueue)에 max_size개가 쌓여 있으면 기다리지 않고 버립니다.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int = LOG_QUEUE_SIZE):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class JSONLinesHandler(logging.StreamHandler):
+    """줄마다 flush하지 않는 StreamHandler (flush는 LogWriter가 배치마다 호출)"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        super().__init__(stream)
+        self.setFormatter(JSONFormatter())
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class LogWriter:
+    """
+    큐에 쌓인 레코드를 flush_interval마다 한꺼번에 꺼내 쓰는 스레드
+
+    QueueListener는 레코드마다 깨어나 요청 처리 스레드와 GIL을 주고받으므로, 주기적으로 모아서 씁니다.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, handler: logging.Handler, flush_interval: float = LOG_FLUSH_SECONDS):
+        self.queue = log_queue
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="request-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """남은 레코드를 모두 쓴 뒤 스레드 종료"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            stopping = self._stopping.wait(self.flush_interval)
+            self.drain()
+            if stopping:
+                return
+
+    def drain(self) -> int:
+        written = 0
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.handler.handle(record)
+            written += 1
+        if written:
+            self.handler.flush()
+        return written
+
+
+class LogPipeline:
+    """logger → 제한된 큐 → LogWriter 스레드 → JSON lines 스트림"""
+
+    def __init__(self, logger: logging.Logger = access_logger, stream: Optional[TextIO] = None,
+                 max_size: int = LOG_QUEUE_SIZE):
+        self.logger = logger
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = NonBlockingQueueHandler(self.queue, max_size)
+        self.writer = LogWriter(self.queue, JSONLinesHandler(stream or sys.stdout))
+        self._started = False
+
+    def start(self):
+        if self._started:
+            return
+        self.logger.addHandler(self.handler)
+        self.writer.start()
+        self._started = True
+
+    def stop(self):
+        """큐에 남은 로그를 모두 쓴 뒤 쓰기 스레드 종료"""
+        if not self._started:
+            return
+        self.logger.removeHandler(self.handler)
+        self.writer.stop()
+        self._started = False
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self.queue.qsize(), "dropped": self.handler.dropped}
+
+
+class RequestLoggingMiddleware:
+    """요청 1건당 JSON 로그 1줄 (샘플링 적용)"""
+
+    def __init__(self, app, logger: logging.Logger = access_logger, sample_rate: float = LOG_SAMPLE_RATE,
+                 slow_request_ms: float = LOG_SLOW_REQUEST_MS, include_headers: bool = LOG_REQUEST_HEADERS,
+                 skip_paths: FrozenSet[str] = LOG_SKIP_PATHS, rand: Callable[[], float] = random.random):
+        self.app = app
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.include_headers = include_headers
+        self.skip_paths = skip_paths
+        self.rand = rand
+        self.logged = 0
+        self.sampled_out = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        response_start = None
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_start, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_start = time.perf_counter()
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        exc_info = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            exc_info = sys.exc_info()
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            ttfb_ms = (response_start - start) * 1000 if response_start is not None else None
+            self._log(scope, status_code, duration_ms, ttfb_ms, response_bytes, exc_info)
+
+    def _log(self, scope, status_code: int, duration_ms: float, ttfb_ms: Optional[float],
+             response_bytes: int, exc_info):
+        if status_code >= 500 or exc_info is not None:
+            level = logging.ERROR
+        elif duration_ms >= self.slow_request_ms:
+            level = logging.WARNING
+        elif self.sample_rate < 1.0 and self.rand() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        else:
+            level = logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
+
+        # scope 전체(app, router 등)를 쓰기 전까지 붙잡아 두지 않도록 필요한 값만 넘김
+        headers = scope["headers"]
+        fields = {
+            "event": "request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "ttfb_ms": round(ttfb_ms, 3) if ttfb_ms is not None else None,
+            "response_bytes": response_bytes,
+            "client": Deferred(_scope_client_ip, {"type": "http", "headers": headers, "client": scope.get("client")}),
+            "sample_rate": self.sample_rate if level == logging.INFO else 1.0,
+        }
+        tracker = current_tracker()
+        if tracker is not None:
+            fields["db_queries"] = tracker.count
+            fields["db_ms"] = round(tracker.seconds * 1000, 3)
+        if self.include_headers:
+            fields["headers"] = Deferred(redact_headers, headers)
+        self.logged += 1
+        # logger.log()는 호출 위치를 찾느라 스택을 훑으므로(findCaller) 레코드를 직접 만들어 넘김
+        # (pathname을 비워 LogRecord의 경로 파싱도 생략, 헤더 가림/클라이언트 IP는 Deferred로 쓰기 스레드에서)
+        record = self.logger.makeRecord(self.logger.name, level, "", 0, "%s %s %d",
+                                        (scope["method"], scope["path"], status_code), exc_info,
+                                        extra={"fields": fields})
+        self.logger.handle(record)
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def start_logging(stream: Optional[TextIO] = None):
+    """앱 시작 시 로그 쓰기 스레드 시작"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(stream=stream)
+    _pipeline.start()
+
+
+def stop_logging():
+    """앱 종료 시 남은 로그를 쓰고 쓰기 스레드 종료"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+
+def logging_stats() -> Dict[str, int]:
+    return _pipeline.stats() if _pipeline is not None else {"queued": 0, "dropped": 0}
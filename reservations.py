@@ -0,0 +1,391 @@
+"""
+모임 좌석 예약 엔진
+
+좌석 확보는 Meeting의 카운터(confirmed_count / pending_count)를 정원 조건과 함께
+증가시키는 단일 UPDATE 문으로 처리합니다.
+
+    UPDATE meetings SET confirmed_count = confirmed_count + 1
+    WHERE id = :meeting_id AND confirmed_count < capacity
+
+영향받은 행이 0이면 정원 초과(또는 모임 없음)이므로, 동시에 요청이 몰려도
+COUNT 후 INSERT 방식처럼 정원을 초과해 등록되지 않습니다.
+중복 신청은 user_meetings의 (user_id, meeting_id) 유니크 제약으로 막습니다.
+
+정원이 찬 모임의 참가 신청은 대기자 명단(WAITLISTED)에 순번과 함께 등록되고,
+취소가 발생하면 같은 트랜잭션에서 다음 대기자가 CONFIRMED로 승격됩니다.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import Meeting, UserMeeting
+
+# 참가 상태
+STATUS_CONFIRMED = "CONFIRMED"
+STATUS_PENDING = "PENDING"
+STATUS_WAITLISTED = "WAITLISTED"
+STATUS_CANCELLED = "CANCELLED"
+
+# 다음 대기자 승격 시 동시 취소와 경합할 때의 최대 재시도 횟수
+MAX_PROMOTION_ATTEMPTS = 3
+
+# 상태별 카운터 컬럼
+_COUNTER_COLUMNS = {
+    STATUS_CONFIRMED: Meeting.confirmed_count,
+    STATUS_PENDING: Meeting.pending_count,
+}
+
+
+def _seat_guard(seat_status: str):
+    """
+    상태별 정원 조건.
+    - CONFIRMED: 확정 인원만 정원과 비교
+    - PENDING: 확정 + 신청 중 인원을 합산하여 정원과 비교
+    """
+    if seat_status == STATUS_CONFIRMED:
+        return Meeting.confirmed_count < Meeting.capacity
+    return Meeting.confirmed_count + Meeting.pending_count < Meeting.capacity
+
+
+def claim_seat(db: Session, meeting_id: int, seat_status: str) -> bool:
+    """
+    단일 UPDATE 문으로 좌석 하나를 확보합니다 (커밋은 호출자가 수행).
+
+    Returns:
+        좌석 확보 성공 여부 (정원 초과 또는 모임이 없으면 False)
+    """
+    counter = _COUNTER_COLUMNS[seat_status]
+    result = db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id, _seat_guard(seat_status))
+        .values({counter: counter + 1})
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_seat(db: Session, meeting_id: int, seat_status: str):
+    """좌석 하나를 반납합니다 (커밋은 호출자가 수행)."""
+    counter = _COUNTER_COLUMNS[seat_status]
+    db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id, counter > 0)
+        .values({counter: counter - 1})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _duplicate_error(existing: UserMeeting, seat_status: str) -> HTTPException:
+    """이미 참가 기록이 있을 때의 409 응답 (기존 엔드포인트 메시지 유지)"""
+    if existing.status == STATUS_WAITLISTED:
+        detail = "User is already on the waitlist for this meeting"
+    elif seat_status == STATUS_CONFIRMED:
+        detail = "User is already registered for this meeting"
+    elif existing.status == STATUS_CONFIRMED:
+        detail = "User is already confirmed for this meeting"
+    else:
+        detail = "User has already expressed interest in this meeting"
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+def _claim_failed_error(db: Session, user_id: int, meeting_id: int, seat_status: str,
+                        waitlist: bool = False) -> Optional[HTTPException]:
+    """
+    좌석 확보 실패 원인 판별: 모임 없음(404), 중복 신청(409), 정원 초과(403).
+    waitlist=True이고 단순 정원 초과라면 None을 반환합니다 (대기자 등록 대상).
+    """
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Meeting with id {meeting_id} not found"
+        )
+
+    existing = db.query(UserMeeting).filter(
+        UserMeeting.user_id == user_id,
+        UserMeeting.meeting_id == meeting_id
+    ).first()
+    if existing and existing.status != STATUS_CANCELLED:
+        return _duplicate_error(existing, seat_status)
+
+    if waitlist:
+        return None
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Meeting is full. Capacity: {meeting.capacity}"
+    )
+
+
+def reserve_seat(db: Session, user_id: int, meeting_id: int, seat_status: str = STATUS_CONFIRMED,
+                 waitlist: bool = False) -> Tuple[UserMeeting, bool]:
+    """
+    모임 좌석을 원자적으로 예약합니다.
+
+    정상 경로는 UPDATE(좌석 확보) + INSERT(참가 기록) + COMMIT 한 번의 트랜잭션입니다.
+    취소(CANCELLED)된 기존 기록이 있으면 좌석을 다시 확보한 뒤 상태를 되살립니다.
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 신청 사용자 ID
+        meeting_id: 모임 ID
+        seat_status: CONFIRMED (참가 신청) 또는 PENDING (관심 등록)
+        waitlist: 정원이 찼을 때 403 대신 대기자 명단에 등록할지 여부
+
+    Returns:
+        (참가 기록, 재활성화 여부) - 대기자로 등록되면 기록의 status가 WAITLISTED
+
+    Raises:
+        HTTPException: 404 (모임 없음), 409 (중복 신청), 403 (정원 초과, waitlist=False)
+    """
+    if not claim_seat(db, meeting_id, seat_status):
+        db.rollback()
+        error = _claim_failed_error(db, user_id, meeting_id, seat_status, waitlist)
+        if error is not None:
+            raise error
+        return join_waitlist(db, user_id, meeting_id)
+
+    registration = UserMeeting(
+        user_id=user_id,
+        meeting_id=meeting_id,
+        status=seat_status,
+        registered_at=datetime.utcnow()
+    )
+    db.add(registration)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 이미 참가 기록이 있음 - 확보한 좌석도 함께 롤백됨
+        db.rollback()
+        return _reactivate(db, user_id, meeting_id, seat_status), True
+
+    db.refresh(registration)
+    return registration, False
+
+
+def _reactivate(db: Session, user_id: int, meeting_id: int, seat_status: str) -> UserMeeting:
+    """취소된 참가 기록을 다시 활성화합니다 (그 외 상태면 409)."""
+    existing = db.query(UserMeeting).filter(
+        UserMeeting.user_id == user_id,
+        UserMeeting.meeting_id == meeting_id
+    ).first()
+    if existing is None:
+        # 유니크 제약 외의 무결성 오류 (예: 존재하지 않는 사용자)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Registration violates a database integrity constraint"
+        )
+    if existing.status != STATUS_CANCELLED:
+        raise _duplicate_error(existing, seat_status)
+
+    registration_id = existing.id
+    if not claim_seat(db, meeting_id, seat_status):
+        db.rollback()
+        raise _claim_failed_error(db, user_id, meeting_id, seat_status)
+
+    # 상태 조건을 걸어 동시에 들어온 재활성화 요청 중 하나만 성공하도록 함
+    result = db.execute(
+        update(UserMeeting)
+        .where(UserMeeting.id == registration_id, UserMeeting.status == STATUS_CANCELLED)
+        .values(status=seat_status, registered_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        existing = db.query(UserMeeting).filter(UserMeeting.id == registration_id).first()
+        raise _duplicate_error(existing, seat_status)
+
+    db.commit()
+    db.refresh(existing)
+    return existing
+
+
+# --------------------
+# 대기자 명단 (Waitlist)
+# --------------------
+def _next_waitlist_position(db: Session, meeting_id: int) -> int:
+    """모임의 대기 순번 시퀀스를 증가시키고 새 순번을 반환합니다 (커밋은 호출자가 수행)."""
+    db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id)
+        .values(waitlist_seq=Meeting.waitlist_seq + 1)
+        .execution_options(synchronize_session=False)
+    )
+    # 같은 트랜잭션에서 행 잠금을 잡고 있으므로 다른 요청과 순번이 겹치지 않음
+    return db.query(Meeting.waitlist_seq).filter(Meeting.id == meeting_id).scalar()
+
+
+def join_waitlist(db: Session, user_id: int, meeting_id: int) -> Tuple[UserMeeting, bool]:
+    """
+    대기자 명단에 등록합니다. 취소된 기존 기록이 있으면 대기 상태로 되살립니다.
+
+    Returns:
+        (대기 기록, 재활성화 여부) - 그 사이 좌석이 비었다면 바로 CONFIRMED로 승격된 기록
+
+    Raises:
+        HTTPException: 409 (이미 신청/대기 중)
+    """
+    position = _next_waitlist_position(db, meeting_id)
+    existing = db.query(UserMeeting).filter(
+        UserMeeting.user_id == user_id,
+        UserMeeting.meeting_id == meeting_id
+    ).first()
+
+    if existing is None:
+        registration = UserMeeting(
+            user_id=user_id,
+            meeting_id=meeting_id,
+            status=STATUS_WAITLISTED,
+            waitlist_position=position,
+            registered_at=datetime.utcnow()
+        )
+        db.add(registration)
+        reactivated = False
+    elif existing.status == STATUS_CANCELLED:
+        registration = existing
+        registration.status = STATUS_WAITLISTED
+        registration.waitlist_position = position
+        registration.registered_at = datetime.utcnow()
+        reactivated = True
+    else:
+        db.rollback()
+        raise _duplicate_error(existing, STATUS_CONFIRMED)
+
+    try:
+        db.flush()
+        # 정원 확인과 대기 등록 사이에 취소가 있었다면 바로 승격되도록 함
+        _promote_next(db, meeting_id)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = db.query(UserMeeting).filter(
+            UserMeeting.user_id == user_id,
+            UserMeeting.meeting_id == meeting_id
+        ).first()
+        raise _duplicate_error(existing, STATUS_CONFIRMED)
+
+    db.refresh(registration)
+    return registration, reactivated
+
+
+def _promote_next(db: Session, meeting_id: int) -> Optional[UserMeeting]:
+    """
+    가장 앞선 대기자를 CONFIRMED로 승격합니다 (커밋은 호출자가 수행).
+    확정 좌석이 없거나 대기자가 없으면 None을 반환합니다.
+    """
+    for _ in range(MAX_PROMOTION_ATTEMPTS):
+        # (meeting_id, status, waitlist_position) 인덱스로 첫 행만 조회
+        # PostgreSQL에서는 동시 승격끼리 같은 행을 잡지 않도록 SKIP LOCKED 사용
+        next_in_line = (
+            db.query(UserMeeting)
+            .filter(UserMeeting.meeting_id == meeting_id, UserMeeting.status == STATUS_WAITLISTED)
+            .order_by(UserMeeting.waitlist_position)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if next_in_line is None:
+            return None
+        if not claim_seat(db, meeting_id, STATUS_CONFIRMED):
+            return None
+
+        result = db.execute(
+            update(UserMeeting)
+            .where(UserMeeting.id == next_in_line.id, UserMeeting.status == STATUS_WAITLISTED)
+            .values(status=STATUS_CONFIRMED, waitlist_position=None, registered_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            return next_in_line
+
+        # 다른 요청이 먼저 승격/취소함 - 확보한 좌석을 돌려놓고 다음 대기자로 재시도
+        release_seat(db, meeting_id, STATUS_CONFIRMED)
+        db.expire(next_in_line)
+    return None
+
+
+def cancel_registration(db: Session, user_id: int, meeting_id: int) -> Tuple[UserMeeting, Optional[UserMeeting]]:
+    """
+    참가 신청(확정/신청 중/대기)을 취소합니다.
+    좌석이 반납되면 같은 트랜잭션에서 다음 대기자를 자동으로 승격합니다.
+
+    Returns:
+        (취소된 기록, 승격된 대기자 기록 또는 None)
+
+    Raises:
+        HTTPException: 404 (취소할 신청 없음), 409 (동시에 상태가 바뀐 경우)
+    """
+    registration = db.query(UserMeeting).filter(
+        UserMeeting.user_id == user_id,
+        UserMeeting.meeting_id == meeting_id
+    ).first()
+    if registration is None or registration.status == STATUS_CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active registration found for this meeting"
+        )
+
+    previous_status = registration.status
+    registration_id = registration.id
+    # 이전 상태를 조건으로 걸어 동시 취소가 좌석을 두 번 반납하지 않도록 함
+    result = db.execute(
+        update(UserMeeting)
+        .where(UserMeeting.id == registration_id, UserMeeting.status == previous_status)
+        .values(status=STATUS_CANCELLED, waitlist_position=None)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Registration was modified concurrently. Please retry."
+        )
+
+    promoted = None
+    if previous_status in _COUNTER_COLUMNS:
+        release_seat(db, meeting_id, previous_status)
+        promoted = _promote_next(db, meeting_id)
+    else:
+        # 대기 취소는 카운터를 건드리지 않으므로 모임 행 버전만 갱신
+        db.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id)
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+    db.commit()
+    db.refresh(registration)
+    if promoted is not None:
+        db.refresh(promoted)
+    return registration, promoted
+
+
+def get_waitlist_position(db: Session, user_id: int, meeting_id: int,
+                          registration: Optional[UserMeeting] = None) -> Tuple[Optional[UserMeeting], Optional[int], int]:
+    """
+    대기 순번 조회 (인덱스 범위 COUNT 두 번, 쓰기 없음).
+
+    방금 reserve_seat()로 받은 참가 기록이 있으면 registration으로 넘겨 다시 조회하지 않습니다.
+
+    Returns:
+        (참가 기록 또는 None, 앞선 대기자 수 + 1 또는 None, 전체 대기자 수)
+    """
+    waitlisted = db.query(UserMeeting).filter(
+        UserMeeting.meeting_id == meeting_id,
+        UserMeeting.status == STATUS_WAITLISTED
+    )
+    waitlist_size = waitlisted.count()
+
+    if registration is None:
+        registration = db.query(UserMeeting).filter(
+            UserMeeting.user_id == user_id,
+            UserMeeting.meeting_id == meeting_id
+        ).first()
+    if registration is None or registration.status != STATUS_WAITLISTED:
+        return registration, None, waitlist_size
+
+    ahead = waitlisted.filter(UserMeeting.waitlist_position < registration.waitlist_position).count()
+    return registration, ahead + 1, waitlist_size
@@ -0,0 +1,322 @@
+"""
+버전 기반 스키마 마이그레이션
+
+schema_version 테이블에 적용된 마이그레이션 번호를 기록하고, 아직 적용되지 않은
+단계만 순서대로 실행합니다. SQLite와 PostgreSQL 모두 지원합니다.
+
+- 모든 단계는 멱등(컬럼/인덱스가 이미 있으면 건너뜀)이라 기존 create_all / migrate_database.py로
+  만들어진 DB에도 그대로 적용됩니다.
+- 백필은 id 범위 단위 배치로 나눠 커밋하므로 긴 쓰기 잠금을 잡지 않습니다.
+- PostgreSQL 인덱스는 CREATE INDEX CONCURRENTLY로 만듭니다 (테이블 쓰기를 막지 않음).
+- dry_run=True면 실행할 SQL만 출력합니다.
+- ensure_schema()는 앱 시작 시 호출하며, 스키마가 최신이면 버전 조회 한 번으로 끝납니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, String, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from database import Base
+from user_stats import REBUILD_STATEMENTS
+
+VERSION_TABLE = "schema_version"
+BACKFILL_BATCH_SIZE = 1000
+
+
+class MigrationContext:
+    """마이그레이션 단계에서 사용하는 DDL/DML 헬퍼 (dry-run 시 SQL만 기록)"""
+
+    def __init__(self, engine: Engine, conn: Connection, dry_run: bool = False,
+                 batch_size: int = BACKFILL_BATCH_SIZE, log: Callable[[str], None] = print):
+        self.engine = engine
+        self.conn = conn
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.log = log
+        self.dialect = engine.dialect.name
+        self.statements: List[str] = []
+
+    def execute(self, sql: str, params: Optional[dict] = None):
+        self.statements.append(sql)
+        if self.dry_run:
+            self.log(f"   [dry-run] {sql}")
+            return None
+        self.log(f"   ✅ {sql}")
+        return self.conn.execute(text(sql), params or {})
+
+    def has_table(self, table: str) -> bool:
+        return inspect(self.conn).has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        if not self.has_table(table):
+            return False  # dry-run: 1단계에서 생성될 테이블
+        return column in {col["name"] for col in inspect(self.conn).get_columns(table)}
+
+    def has_unique(self, table: str, columns: List[str]) -> bool:
+        """columns 조합에 유니크 제약/인덱스가 이미 있는지"""
+        if not self.has_table(table):
+            return False
+        inspector = inspect(self.conn)
+        existing = [c["column_names"] for c in inspector.get_unique_constraints(table)]
+        existing += [i["column_names"] for i in inspector.get_indexes(table) if i["unique"]]
+        return list(columns) in existing
+
+    def create_tables(self):
+        """아직 없는 테이블을 현재 모델 정의대로 생성"""
+        missing = [table for name, table in Base.metadata.tables.items() if not self.has_table(name)]
+        for table in missing:
+            self.statements.append(f"CREATE TABLE {table.name}")
+            self.log(f"   {'[dry-run] ' if self.dry_run else '✅ '}CREATE TABLE {table.name}")
+        if missing and not self.dry_run:
+            Base.metadata.create_all(bind=self.conn, tables=missing)
+        self.conn.commit()
+
+    def add_column(self, table: str, column: Column) -> bool:
+        """컬럼이 없으면 추가 (추가했으면 True)"""
+        if self.has_column(table, column.name):
+            return False
+        ddl = f"ALTER TABLE {table} ADD COLUMN {column.name} {column.type.compile(dialect=self.engine.dialect)}"
+        if column.server_default is not None:
+            ddl += f" DEFAULT {column.server_default.arg}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        self.execute(ddl)
+        self.conn.commit()
+        return True
+
+    def create_index(self, name: str, table: str, columns: str, unique: bool = False, where: Optional[str] = None):
+        """인덱스 생성 (PostgreSQL은 CONCURRENTLY, 트랜잭션 밖에서 실행)"""
+        concurrently = "CONCURRENTLY " if self.dialect == "postgresql" else ""
+        sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({columns})"
+        if where:
+            sql += f" WHERE {where}"
+        self._execute_outside_transaction(sql)
+
+    def drop_index(self, name: str):
+        concurrently = "CONCURRENTLY " if self.dialect == "postgresql" else ""
+        self._execute_outside_transaction(f"DROP INDEX {concurrently}IF EXISTS {name}")
+
+    def _execute_outside_transaction(self, sql: str):
+        if self.dialect != "postgresql":
+            self.execute(sql)
+            self.conn.commit()
+            return
+        self.conn.commit()
+        self.statements.append(sql)
+        if self.dry_run:
+            self.log(f"   [dry-run] {sql}")
+            return
+        self.log(f"   ✅ {sql}")
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as autocommit_conn:
+            autocommit_conn.execute(text(sql))
+
+    def backfill(self, table: str, set_clause: str, where: Optional[str] = None):
+        """
+        id 범위 배치 단위 UPDATE (배치마다 커밋)
+
+        Args:
+            table: 대상 테이블
+            set_clause: "col = expr, ..." (테이블 이름으로 상관 서브쿼리 참조 가능)
+            where: 추가 조건
+        """
+        condition = f" AND ({where})" if where else ""
+        sql = f"UPDATE {table} SET {set_clause} WHERE id > :start AND id <= :end{condition}"
+        if self.dry_run:
+            self.statements.append(sql)
+            self.log(f"   [dry-run] {sql}  (batches of {self.batch_size})")
+            return
+        max_id = self.conn.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+        self.log(f"   ✅ {sql}  ({max_id} rows, batches of {self.batch_size})")
+        self.statements.append(sql)
+        for start in range(0, max_id, self.batch_size):
+            self.conn.execute(text(sql), {"start": start, "end": start + self.batch_size})
+            self.conn.commit()
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[MigrationContext], None]
+
+
+# --------------------
+# 마이그레이션 단계 (추가만 하고, 이미 배포된 단계는 수정하지 않음)
+# --------------------
+def _create_base_tables(ctx: MigrationContext):
+    ctx.create_tables()
+
+
+def _add_social_login_columns(ctx: MigrationContext):
+    ctx.add_column("users", Column("social_provider", String, nullable=True))
+    if ctx.add_column("users", Column("social_id", String, nullable=True)):
+        ctx.create_index("ix_users_social_id", "users", "social_id", unique=True)
+
+
+def _add_seat_counters_and_waitlist(ctx: MigrationContext):
+    for name in ("confirmed_count", "pending_count", "waitlist_seq"):
+        ctx.add_column("meetings", Column(name, Integer, nullable=False, server_default="0"))
+    ctx.add_column("user_meetings", Column("waitlist_position", Integer, nullable=True))
+    ctx.create_index("ix_user_meetings_waitlist", "user_meetings", "meeting_id, status, waitlist_position")
+
+    ctx.backfill("meetings", """
+        confirmed_count = (SELECT COUNT(*) FROM user_meetings
+                           WHERE user_meetings.meeting_id = meetings.id AND status = 'CONFIRMED'),
+        pending_count = (SELECT COUNT(*) FROM user_meetings
+                         WHERE user_meetings.meeting_id = meetings.id AND status = 'PENDING')
+    """)
+
+    # (user_id, meeting_id) 유일성 - 중복 행이 있으면 건너뛰고 경고
+    if ctx.has_unique("user_meetings", ["user_id", "meeting_id"]):
+        return
+    duplicates = ctx.has_table("user_meetings") and ctx.conn.execute(text("""
+        SELECT user_id, meeting_id FROM user_meetings
+        GROUP BY user_id, meeting_id HAVING COUNT(*) > 1
+    """)).fetchall()
+    if duplicates:
+        ctx.log(f"   ⚠️  Skipping uq_user_meetings_user_meeting: {len(duplicates)} duplicate (user_id, meeting_id) pairs")
+    else:
+        ctx.create_index("uq_user_meetings_user_meeting", "user_meetings", "user_id, meeting_id", unique=True)
+
+
+def _add_meeting_row_version(ctx: MigrationContext):
+    ctx.add_column("meetings", Column("updated_at", DateTime, nullable=True))
+    ctx.backfill("meetings", "updated_at = created_at", where="updated_at IS NULL")
+
+
+def _add_hot_query_indexes(ctx: MigrationContext):
+    ctx.create_index("ix_meetings_date_time_id", "meetings", "date_time, id")
+    ctx.drop_index("ix_meetings_date_time")
+    ctx.create_index("ix_verification_codes_phone_code", "verification_codes", "phone_number, code")
+    ctx.drop_index("ix_verification_codes_phone_number")
+    ctx.create_index("ix_users_social_provider_id", "users", "social_provider, social_id",
+                     unique=True, where="social_id IS NOT NULL")
+    ctx.execute("ANALYZE")
+    ctx.conn.commit()
+
+
+def _add_verification_code_expiry_index(ctx: MigrationContext):
+    ctx.create_index("ix_verification_codes_expires_at", "verification_codes", "expires_at")
+
+
+def _create_sms_deliveries(ctx: MigrationContext):
+    ctx.create_tables()
+
+
+def _add_admin_dashboard_indexes_and_user_stats(ctx: MigrationContext):
+    ctx.create_tables()
+    # 롤업이 집계하는 컬럼 (아주 오래된 DB에는 없음)
+    ctx.add_column("users", Column("chess_rating", String, nullable=True))
+    ctx.create_index("ix_users_name", "users", "name")
+    ctx.create_index("ix_users_total_visits_id", "users", "total_visits, id")
+    ctx.create_index("ix_users_created_at_id", "users", "created_at, id")
+    for sql in REBUILD_STATEMENTS:
+        ctx.execute(sql)
+    ctx.conn.commit()
+
+
+def _require_user_created_at(ctx: MigrationContext):
+    # 가입일 키셋 페이지네이션은 (created_at, id) 비교라 NULL 행이 있으면 페이지가 끊기거나 커서가 깨짐
+    fallback = "COALESCE(updated_at, CURRENT_TIMESTAMP)" if ctx.has_column("users", "updated_at") else "CURRENT_TIMESTAMP"
+    ctx.backfill("users", f"created_at = {fallback}", where="created_at IS NULL")
+    if ctx.dialect == "postgresql":
+        # SQLite는 ALTER COLUMN을 지원하지 않음 (새 DB는 모델 정의대로 NOT NULL로 생성)
+        ctx.execute("ALTER TABLE users ALTER COLUMN created_at SET NOT NULL")
+        ctx.conn.commit()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create base tables", _create_base_tables),
+    Migration(2, "Social login columns on users", _add_social_login_columns),
+    Migration(3, "Seat counters, waitlist and unique registrations", _add_seat_counters_and_waitlist),
+    Migration(4, "Meeting row version (updated_at)", _add_meeting_row_version),
+    Migration(5, "Composite/partial indexes for hot queries", _add_hot_query_indexes),
+    Migration(6, "Expiry index on verification_codes", _add_verification_code_expiry_index),
+    Migration(7, "SMS delivery log table", _create_sms_deliveries),
+    Migration(8, "Admin dashboard user indexes and user_stats rollup", _add_admin_dashboard_indexes_and_user_stats),
+    Migration(9, "Backfill users.created_at and make it NOT NULL", _require_user_created_at),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# --------------------
+# 실행기
+# --------------------
+def current_version(conn: Connection) -> int:
+    """기록된 스키마 버전 (schema_version 테이블이 없으면 0)"""
+    if not inspect(conn).has_table(VERSION_TABLE):
+        return 0
+    return conn.execute(text(f"SELECT MAX(version) FROM {VERSION_TABLE}")).scalar() or 0
+
+
+def _ensure_version_table(conn: Connection):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR NOT NULL,
+            applied_at TIMESTAMP NOT NULL
+        )
+    """))
+    conn.commit()
+
+
+def migrate(engine: Engine, dry_run: bool = False, target: Optional[int] = None,
+            batch_size: int = BACKFILL_BATCH_SIZE, log: Callable[[str], None] = print) -> List[int]:
+    """
+    적용되지 않은 마이그레이션을 순서대로 실행합니다.
+
+    Args:
+        engine: 대상 DB 엔진
+        dry_run: True면 SQL만 출력하고 변경하지 않음
+        target: 이 버전까지만 적용 (기본: 최신)
+        batch_size: 백필 배치 크기
+
+    Returns:
+        적용한(dry-run이면 적용할) 마이그레이션 버전 목록
+    """
+    target = LATEST_VERSION if target is None else target
+    applied: List[int] = []
+    with engine.connect() as conn:
+        version = current_version(conn)
+        conn.commit()
+        pending = [m for m in MIGRATIONS if version < m.version <= target]
+        if not pending:
+            log(f"✅ Schema is up to date (version {version})")
+            return applied
+
+        if not dry_run:
+            _ensure_version_table(conn)
+        for migration in pending:
+            log(f"{'🔍' if dry_run else '🔧'} Migration {migration.version}: {migration.description}")
+            ctx = MigrationContext(engine, conn, dry_run=dry_run, batch_size=batch_size, log=log)
+            migration.apply(ctx)
+            if not dry_run:
+                try:
+                    conn.execute(
+                        text(f"INSERT INTO {VERSION_TABLE} (version, description, applied_at) VALUES (:v, :d, :t)"),
+                        {"v": migration.version, "d": migration.description, "t": datetime.utcnow()},
+                    )
+                    conn.commit()
+                except IntegrityError:
+                    # 다른 워커가 동시에 같은 단계를 적용함 (단계는 멱등)
+                    conn.rollback()
+            applied.append(migration.version)
+    return applied
+
+
+def ensure_schema(engine: Engine, log: Callable[[str], None] = print) -> List[int]:
+    """
+    앱 시작 시 호출: 스키마가 최신이면 버전 조회만 하고 반환 (메타데이터 리플렉션 없음)
+    """
+    with engine.connect() as conn:
+        try:
+            version = conn.execute(text(f"SELECT MAX(version) FROM {VERSION_TABLE}")).scalar()
+        except Exception:
+            version = None
+        conn.rollback()
+    if version == LATEST_VERSION:
+        return []
+    return migrate(engine, log=log)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from enum import Enum
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, List
 from datetime import datetime
 
 class GenderEnum(str, Enum):
@@ -120,8 +120,12 @@ class MeetingCreate(MeetingBase):
 class MeetingOut(MeetingBase):
     """모임 출력 스키마 (참가자 목록 포함)"""
     id: int
+    confirmed_count: int = 0  # 확정 인원
+    pending_count: int = 0  # 신청 중(결제 대기) 인원
+    participant_count: int = 0  # 확정 + 신청 중 인원
+    waitlist_count: int = 0  # 대기 인원
     created_at: datetime
-    participants: List[UserMeetingOut] = []  # 모임에 참여한 사용자 목록
+    participants: List[UserMeetingOut] = []  # 모임에 참여한 사용자 목록 (include=participants일 때만)
     
     class Config:
         from_attributes = True
@@ -142,12 +146,21 @@ class UserMeetingOut(BaseModel):
     user_id: int
     meeting_id: int
     status: str
+    waitlist_position: Optional[int] = None
     registered_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class WaitlistPositionOut(BaseModel):
+    """대기 순번 조회 출력 스키마"""
+    meeting_id: int
+    status: str
+    position: Optional[int] = None  # 1 = 다음 승격 대상 (대기 중이 아니면 null)
+    waitlist_size: int
+
+
 # --------------------
 # 인증 관련 스키마
 # --------------------
@@ -215,3 +228,27 @@ class ChatResponse(BaseModel):
     """챗봇 응답 스키마"""
     response: str
     timestamp: datetime
+
+
+# --------------------
+# 관리자: 프로파일링
+# --------------------
+class ProfilingConfigIn(BaseModel):
+    """요청 프로파일링 설정 (sample_rate=0이면 끔)"""
+    sample_rate: float = Field(..., ge=0, le=1)
+    routes: List[str] = []  # fnmatch 패턴 (예: "/meetings", "/meetings/*"), 비어 있으면 전체 경로
+    interval_ms: Optional[float] = Field(None, ge=1, le=100)
+    min_duration_ms: float = Field(0, ge=0)  # 이보다 빠른 요청의 프로파일은 버림
+    expires_in_seconds: Optional[float] = Field(600, gt=0)  # null이면 자동으로 꺼지지 않음
+
+
+# --------------------
+# 관리자: 대시보드 회원 통계
+# --------------------
+class UserStatsOut(BaseModel):
+    """회원 통계 (user_stats 롤업 테이블 기준, 값/구간 → 회원 수)"""
+    total: int
+    gender: Dict[str, int] = {}
+    chess_experience: Dict[str, int] = {}
+    chess_rating: Dict[str, int] = {}  # 레이팅 없음은 "UNRATED"
+    total_visits: Dict[str, int] = {}  # "1", "2-4", "5-9", "10+"
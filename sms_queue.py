@@ -0,0 +1,447 @@
+"""
+SMS 비동기 발송 큐
+
+/sms/request는 메시지를 큐에 넣고 바로 응답하며, 워커 태스크가 외부 SMS API로 발송합니다.
+- 워커 SMS_QUEUE_WORKERS개(기본: 공급자 동시 호출 수) + 공급자별 동시 호출 수 제한 (provider.max_concurrency)
+- 일시적 실패(네트워크 오류, 429, 5xx)는 지수 백오프 + 지터로 재시도 (재시도 대기 중 워커를 점유하지 않음)
+- 발송 결과(SENT / FAILED)는 sms_deliveries 테이블에 배치로 기록 (메시지 본문/인증 코드는 저장하지 않음)
+  종료 시 발송하지 못한 메시지(대기 / 재시도 대기 / 발송 중)도 FAILED로 기록
+
+공급자 (SMS_PROVIDER):
+- twilio: Twilio REST API를 httpx.AsyncClient로 호출 (Twilio 환경 변수가 모두 있으면 기본값)
+- console: 콘솔 출력 (개발 환경 기본값)
+- fake: 지연/실패율을 조절할 수 있는 로컬 가짜 공급자 (부하 테스트용)
+"""
+import asyncio
+import os
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, SMSDelivery
+
+SMS_QUEUE_WORKERS = int(os.getenv("SMS_QUEUE_WORKERS", "0"))  # 0이면 공급자 동시 호출 수와 같게
+SMS_QUEUE_MAX_SIZE = int(os.getenv("SMS_QUEUE_MAX_SIZE", "10000"))
+SMS_MAX_ATTEMPTS = int(os.getenv("SMS_MAX_ATTEMPTS", "4"))
+SMS_BACKOFF_BASE_SECONDS = float(os.getenv("SMS_BACKOFF_BASE_SECONDS", "0.5"))
+SMS_BACKOFF_MAX_SECONDS = float(os.getenv("SMS_BACKOFF_MAX_SECONDS", "10"))
+SMS_PROVIDER_CONCURRENCY = int(os.getenv("SMS_PROVIDER_CONCURRENCY", "8"))
+SMS_RECORD_BATCH_SIZE = int(os.getenv("SMS_RECORD_BATCH_SIZE", "100"))
+SMS_RECORD_FLUSH_SECONDS = float(os.getenv("SMS_RECORD_FLUSH_SECONDS", "1.0"))
+
+STATUS_SENT = "SENT"
+STATUS_FAILED = "FAILED"
+SHUTDOWN_ERROR = "Not sent before shutdown"
+
+
+class SMSDeliveryError(Exception):
+    """SMS 발송 실패 (retryable=True면 재시도 대상)"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SMSQueueFull(Exception):
+    """큐가 가득 참 (공급자 장애 등으로 적체)"""
+
+
+# --------------------
+# 공급자
+# --------------------
+class ConsoleProvider:
+    """개발 환경: 콘솔 출력으로 발송 대체"""
+
+    name = "console"
+    max_concurrency = SMS_PROVIDER_CONCURRENCY
+
+    async def send(self, to: str, body: str) -> Optional[str]:
+        print(f"[개발 모드] SMS 모킹: {to}로 전송됨 - {body}")
+        return None
+
+    async def aclose(self):
+        pass
+
+
+class FakeProvider:
+    """지연 시간과 일시적 실패율을 조절할 수 있는 로컬 가짜 공급자"""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, failure_rate: float = 0.0,
+                 max_concurrency: int = SMS_PROVIDER_CONCURRENCY, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.max_concurrency = max_concurrency
+        self.random = random.Random(seed)
+        self.sent: List[Dict[str, str]] = []
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, to: str, body: str) -> Optional[str]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency + self.random.random() * self.jitter)
+            if self.random.random() < self.failure_rate:
+                raise SMSDeliveryError("fake provider: 503 Service Unavailable")
+            self.sent.append({"to": to, "body": body})
+            return f"FAKE{self.calls:08d}"
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self):
+        pass
+
+
+class TwilioProvider:
+    """Twilio Messages REST API (httpx.AsyncClient 커넥션 풀 재사용)"""
+
+    name = "twilio"
+    api_url = "https://api.twilio.com/2010-04-01/Accounts/{sid}/Messages.json"
+
+    def __init__(self, account_sid: str, auth_token: str, from_number: str,
+                 max_concurrency: int = SMS_PROVIDER_CONCURRENCY, timeout: float = 10.0):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                auth=(self.account_sid, self.auth_token),
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+        return self._client
+
+    async def send(self, to: str, body: str) -> Optional[str]:
+        try:
+            response = await self.client.post(
+                self.api_url.format(sid=self.account_sid),
+                data={"From": self.from_number, "To": to, "Body": body},
+            )
+        except httpx.HTTPError as e:
+            raise SMSDeliveryError(f"twilio request failed: {type(e).__name__}")
+        if response.status_code == 429 or response.status_code >= 500:
+            raise SMSDeliveryError(f"twilio HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise SMSDeliveryError(f"twilio HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+        return response.json().get("sid")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_provider(name: Optional[str] = None):
+    """SMS_PROVIDER (기본: Twilio 환경 변수가 모두 있으면 twilio, 아니면 console)"""
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    from_number = os.getenv("TWILIO_PHONE_NUMBER")
+    name = name or os.getenv("SMS_PROVIDER") or ("twilio" if account_sid and auth_token and from_number else "console")
+    if name == "twilio":
+        return TwilioProvider(account_sid, auth_token, from_number)
+    if name == "fake":
+        return FakeProvider(latency=float(os.getenv("SMS_FAKE_LATENCY_SECONDS", "0.05")),
+                            failure_rate=float(os.getenv("SMS_FAKE_FAILURE_RATE", "0")))
+    return ConsoleProvider()
+
+
+# --------------------
+# 발송 기록 (배치 INSERT)
+# --------------------
+class DeliveryRecorder:
+    """발송 결과를 모아 batch_size개 또는 flush_interval마다 한 번에 INSERT"""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 batch_size: int = SMS_RECORD_BATCH_SIZE, flush_interval: float = SMS_RECORD_FLUSH_SECONDS):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.errors = 0
+
+    def record(self, row: Dict[str, Any]):
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        db = self.session_factory()
+        try:
+            db.execute(insert(SMSDelivery), rows)
+            db.commit()
+        finally:
+            db.close()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._write, rows)
+            self.flushes += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️  Failed to record {len(rows)} SMS deliveries: {str(e)}")
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# --------------------
+# 큐 / 워커
+# --------------------
+@dataclass
+class OutboundSMS:
+    to: str
+    body: str
+    message_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+
+
+class SMSQueue:
+    """메모리 큐 + 워커 풀 + 재시도 스케줄러"""
+
+    def __init__(self, provider=None, recorder: Optional[DeliveryRecorder] = None,
+                 workers: int = SMS_QUEUE_WORKERS, max_size: int = SMS_QUEUE_MAX_SIZE,
+                 max_attempts: int = SMS_MAX_ATTEMPTS, backoff_base: float = SMS_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = SMS_BACKOFF_MAX_SECONDS, latency_samples: int = 10_000):
+        self.provider = provider or create_provider()
+        self.recorder = recorder or DeliveryRecorder()
+        self.workers = workers or self.provider.max_concurrency
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retry_handles: Dict[asyncio.TimerHandle, OutboundSMS] = {}
+        self._unfinished = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def _ensure_loop_state(self):
+        # asyncio 객체는 실행 중인 이벤트 루프 안에서 생성 (Python 3.9 호환)
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.provider.max_concurrency)
+            self._idle = asyncio.Event()
+            self._idle.set()
+
+    def enqueue(self, to: str, body: str) -> str:
+        """메시지를 큐에 넣고 메시지 ID 반환 (대기 없이 즉시 반환)"""
+        self._ensure_loop_state()
+        if self._unfinished >= self.max_size:
+            self.rejected += 1
+            raise SMSQueueFull(f"SMS queue is full ({self.max_size} messages pending)")
+        message = OutboundSMS(to=to, body=body)
+        self._unfinished += 1
+        self._idle.clear()
+        self._queue.put_nowait(message)
+        self.enqueued += 1
+        return message.message_id
+
+    def _backoff(self, attempts: int) -> float:
+        # 전체 지터 (full jitter): 0 ~ min(max, base * 2^(n-1))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1)))
+
+    def _finish(self, message: OutboundSMS, status: str, provider_message_id: Optional[str] = None):
+        if status == STATUS_SENT:
+            self.sent += 1
+            self._latencies.append(time.monotonic() - message.enqueued_at)
+        else:
+            self.failed += 1
+            print(f"⚠️  SMS to {message.to} failed after {message.attempts} attempts: {message.last_error}")
+        self.recorder.record({
+            "message_id": message.message_id,
+            "phone_number": message.to,
+            "provider": self.provider.name,
+            "status": status,
+            "attempts": message.attempts,
+            "provider_message_id": provider_message_id,
+            "error": message.last_error,
+            "created_at": message.created_at,
+            "completed_at": datetime.utcnow(),
+        })
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    def _schedule_retry(self, message: OutboundSMS):
+        self.retries += 1
+
+        def requeue():
+            self._retry_handles.pop(handle, None)
+            self._queue.put_nowait(message)
+
+        handle = asyncio.get_running_loop().call_later(self._backoff(message.attempts), requeue)
+        self._retry_handles[handle] = message
+
+    async def _deliver(self, message: OutboundSMS):
+        message.attempts += 1
+        try:
+            async with self._semaphore:
+                provider_message_id = await self.provider.send(message.to, message.body)
+        except SMSDeliveryError as e:
+            message.last_error = str(e)
+            if e.retryable and message.attempts < self.max_attempts:
+                self._schedule_retry(message)
+            else:
+                self._finish(message, STATUS_FAILED)
+            return
+        except Exception as e:
+            message.last_error = f"{type(e).__name__}: {str(e)}"
+            self._finish(message, STATUS_FAILED)
+            return
+        message.last_error = None
+        self._finish(message, STATUS_SENT, provider_message_id)
+
+    async def _worker(self):
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._deliver(message)
+            except asyncio.CancelledError:
+                # 종료 중 발송이 끊긴 메시지
+                message.last_error = SHUTDOWN_ERROR
+                self._finish(message, STATUS_FAILED)
+                raise
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        """워커 / 기록 태스크 시작 (앱 startup)"""
+        if self._tasks:
+            return
+        self._ensure_loop_state()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self.recorder.start()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 메시지가 모두 발송(또는 최종 실패)될 때까지 대기"""
+        if self._idle is None:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        남은 메시지를 drain_timeout까지 발송한 뒤 워커 종료, 발송 기록 flush (앱 shutdown)
+        그때까지 보내지 못한 메시지는 FAILED로 기록합니다.
+        """
+        if self._tasks:
+            await self.drain(drain_timeout)
+        abandoned = list(self._retry_handles.values())
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            abandoned.append(self._queue.get_nowait())
+        for message in abandoned:
+            message.last_error = SHUTDOWN_ERROR
+            self._finish(message, STATUS_FAILED)
+        await self.recorder.stop()
+        await self.provider.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+
+        return {
+            "provider": self.provider.name,
+            "workers": self.workers,
+            "max_concurrency": self.provider.max_concurrency,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "pending": self._unfinished,
+            "delivery_p50_ms": pct(0.50),
+            "delivery_p99_ms": pct(0.99),
+        }
+
+
+_sms_queue: Optional[SMSQueue] = None
+
+
+def get_sms_queue() -> SMSQueue:
+    global _sms_queue
+    if _sms_queue is None:
+        _sms_queue = SMSQueue()
+    return _sms_queue
+
+
+def start_sms_queue():
+    """앱 시작 시 워커 시작"""
+    get_sms_queue().start()
+
+
+async def stop_sms_queue():
+    """앱 종료 시 남은 메시지 발송 후 정리"""
+    global _sms_queue
+    if _sms_queue is not None:
+        await _sms_queue.stop()
+        _sms_queue = None
@@ -1,13 +1,24 @@
 """
 소셜 로그인 (Apple, Kakao) 인증 서비스
+
+Apple 공개 키(JWKS)는 프로세스 전역 캐시에 보관하고 TTL이 지났거나
+모르는 kid가 들어왔을 때만 비동기로 다시 받아오므로, 일반적인 Apple 로그인은
+로컬 RSA 서명 검증만 수행합니다.
+카카오 사용자 정보 조회는 앱 시작 시 만든 공용 커넥션 풀을 쓰고, 같은 토큰으로
+짧은 시간 안에 재시도되는 로그인은 토큰 해시 키의 TTL 캐시로 응답합니다.
 """
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 import httpx
 import jwt
-from jwt import PyJWKClient
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status
 import os
 from dotenv import load_dotenv
+from metrics import track_upstream
 
 load_dotenv()
 
@@ -15,9 +26,261 @@ load_dotenv()
 APPLE_KEY_URL = "https://appleid.apple.com/auth/keys"
 APPLE_ISSUER = "https://appleid.apple.com"
 APPLE_CLIENT_ID = os.getenv("APPLE_CLIENT_ID", "com.yourcompany.communitycontrol")
+APPLE_JWKS_TTL_SECONDS = float(os.getenv("APPLE_JWKS_TTL_SECONDS", "86400"))
+# 모르는 kid로 인한 재요청 최소 간격 (임의 kid로 Apple에 요청을 몰아보내는 것 방지)
+APPLE_JWKS_MIN_REFRESH_SECONDS = float(os.getenv("APPLE_JWKS_MIN_REFRESH_SECONDS", "10"))
+APPLE_JWKS_TIMEOUT_SECONDS = float(os.getenv("APPLE_JWKS_TIMEOUT_SECONDS", "5"))
 
 # Kakao 설정
 KAKAO_USER_INFO_URL = "https://kapi.kakao.com/v2/user/me"
+KAKAO_CONNECT_TIMEOUT_SECONDS = float(os.getenv("KAKAO_CONNECT_TIMEOUT_SECONDS", "3"))
+KAKAO_READ_TIMEOUT_SECONDS = float(os.getenv("KAKAO_READ_TIMEOUT_SECONDS", "5"))
+KAKAO_MAX_CONNECTIONS = int(os.getenv("KAKAO_MAX_CONNECTIONS", "20"))
+KAKAO_CACHE_TTL_SECONDS = float(os.getenv("KAKAO_CACHE_TTL_SECONDS", "30"))
+KAKAO_CACHE_MAX_ENTRIES = int(os.getenv("KAKAO_CACHE_MAX_ENTRIES", "1024"))
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """
+    JWKS 공개 키 캐시 (kid -> 키)
+    
+    - TTL이 지나면 다음 조회 시 갱신, 모르는 kid면 즉시 갱신
+    - 갱신 시도는 성공/실패와 관계없이 마지막 시도 시각 기준으로 최소 간격을 둠
+      (Apple 장애 중에 요청마다 재시도하지 않음)
+    - 동시에 들어온 갱신 요청은 진행 중인 한 번의 fetch를 함께 기다림 (single-flight)
+    - 갱신이 실패해도 이전 키가 있으면 계속 사용
+    """
+
+    def __init__(
+        self,
+        key_url: str,
+        ttl_seconds: float = APPLE_JWKS_TTL_SECONDS,
+        min_refresh_interval: float = APPLE_JWKS_MIN_REFRESH_SECONDS,
+        timeout: float = APPLE_JWKS_TIMEOUT_SECONDS,
+    ):
+        self.key_url = key_url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None  # 마지막 성공 시각 (TTL 기준)
+        self._attempted_at: Optional[float] = None  # 마지막 시도 시각 (재시도 간격 기준)
+        self._last_error: Optional[Exception] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetch_count = 0
+
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.ttl_seconds
+
+    def _can_refresh(self) -> bool:
+        return self._attempted_at is None or time.monotonic() - self._attempted_at >= self.min_refresh_interval
+
+    async def _fetch(self):
+        self.fetch_count += 1
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                with track_upstream("apple_jwks") as call:
+                    response = await client.get(self.key_url)
+                    call.status_code = response.status_code
+                response.raise_for_status()
+                key_set = jwt.PyJWKSet.from_dict(response.json())
+        except Exception as e:
+            self._last_error = e
+            raise
+        self._keys = {key.key_id: key.key for key in key_set.keys if key.key_id}
+        self._fetched_at = time.monotonic()
+        self._last_error = None
+
+    async def refresh(self):
+        """키 목록 갱신 (진행 중인 갱신이 있으면 그 결과를 기다림)"""
+        if self._refresh_task is None:
+            self._attempted_at = time.monotonic()
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+        task = self._refresh_task
+        try:
+            await asyncio.shield(task)
+        finally:
+            if self._refresh_task is task and task.done():
+                self._refresh_task = None
+
+    async def get_signing_key(self, kid: str):
+        """
+        kid에 해당하는 공개 키 반환
+        
+        Raises:
+            jwt.InvalidTokenError: 갱신 후에도 kid를 찾을 수 없는 경우
+            httpx.HTTPError: 캐시된 키가 없고 JWKS를 받아올 수 없는 경우
+                (최근 시도가 실패했으면 재시도 간격 동안 다시 요청하지 않고 바로 실패)
+        """
+        needs_refresh = self._is_stale() or kid not in self._keys
+        if self._refresh_task is not None or (needs_refresh and self._can_refresh()):
+            try:
+                await self.refresh()
+            except (httpx.HTTPError, ValueError, jwt.PyJWTError) as e:
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh failed, using cached keys: %s", e)
+        elif needs_refresh and not self._keys:
+            raise httpx.HTTPError(f"Apple JWKS unavailable, retrying later: {self._last_error}")
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key id: {kid}")
+        return key
+
+
+# Singleton instance
+_apple_jwks: Optional[JWKSCache] = None
+
+
+def get_apple_jwks() -> JWKSCache:
+    global _apple_jwks
+    if _apple_jwks is None:
+        _apple_jwks = JWKSCache(APPLE_KEY_URL)
+    return _apple_jwks
+
+
+class KakaoClient:
+    """커넥션 풀을 공유하는 카카오 사용자 정보 클라이언트 (토큰 해시 키 TTL 캐시 포함)"""
+
+    def __init__(
+        self,
+        user_info_url: str = KAKAO_USER_INFO_URL,
+        connect_timeout: float = KAKAO_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = KAKAO_READ_TIMEOUT_SECONDS,
+        max_connections: int = KAKAO_MAX_CONNECTIONS,
+        cache_ttl_seconds: float = KAKAO_CACHE_TTL_SECONDS,
+        cache_max_entries: int = KAKAO_CACHE_MAX_ENTRIES,
+    ):
+        self.user_info_url = user_info_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self._client: Optional[httpx.AsyncClient] = None
+        # sha256(token) -> (expires_at, user_info)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.upstream_calls = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """지연 생성되는 공용 httpx.AsyncClient (앱 시작 시 미리 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _cache_key(access_token: str) -> str:
+        # 원본 토큰은 메모리에 보관하지 않음
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _cache_set(self, key: str, user_info: Dict[str, Any]):
+        if self.cache_ttl_seconds <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl_seconds, user_info)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        """
+        카카오 사용자 정보 조회 (캐시 우선, 성공한 응답만 캐시)
+        
+        Raises:
+            HTTPException: 토큰이 유효하지 않은 경우 (401)
+            httpx.RequestError: 연결 실패 또는 타임아웃
+        """
+        key = self._cache_key(access_token)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return dict(cached)
+
+        self.upstream_calls += 1
+        with track_upstream("kakao") as call:
+            response = await self.client.get(
+                self.user_info_url,
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                    "Content-Type": "application/x-www-form-urlencoded;charset=utf-8",
+                },
+            )
+            call.status_code = response.status_code
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Kakao access token",
+            )
+        
+        user_data = response.json()
+        
+        # 카카오 응답 형식:
+        # {
+        #   "id": 123456789,
+        #   "kakao_account": {
+        #     "email": "user@example.com",
+        #     "profile": {
+        #       "nickname": "홍길동"
+        #     }
+        #   }
+        # }
+        
+        user_info = {
+            "id": str(user_data.get("id")),
+            "email": user_data.get("kakao_account", {}).get("email"),
+            "name": user_data.get("kakao_account", {}).get("profile", {}).get("nickname"),
+        }
+        self._cache_set(key, user_info)
+        return dict(user_info)
+
+
+_kakao_client: Optional[KakaoClient] = None
+
+
+def get_kakao_client() -> KakaoClient:
+    global _kakao_client
+    if _kakao_client is None:
+        _kakao_client = KakaoClient()
+    return _kakao_client
+
+
+def init_kakao_client():
+    """앱 시작 시 커넥션 풀 생성"""
+    get_kakao_client().client
+
+
+async def close_kakao_client():
+    """앱 종료 시 커넥션 풀 정리"""
+    if _kakao_client is not None:
+        await _kakao_client.aclose()
 
 
 async def verify_apple_token(identity_token: str) -> Dict[str, Any]:
@@ -34,14 +297,14 @@ async def verify_apple_token(identity_token: str) -> Dict[str, Any]:
         HTTPException: 토큰이 유효하지 않은 경우
     """
     try:
-        # Apple의 공개 키를 가져와 토큰 검증
-        jwks_client = PyJWKClient(APPLE_KEY_URL)
-        signing_key = jwks_client.get_signing_key_from_jwt(identity_token)
+        # 캐시된 Apple 공개 키로 토큰 검증 (필요할 때만 비동기로 갱신)
+        kid = jwt.get_unverified_header(identity_token).get("kid")
+        signing_key = await get_apple_jwks().get_signing_key(kid)
         
         # 토큰 디코딩 및 검증
         decoded_token = jwt.decode(
             identity_token,
-            signing_key.key,
+            signing_key,
             algorithms=["RS256"],
             audience=APPLE_CLIENT_ID,
             issuer=APPLE_ISSUER,
@@ -74,46 +337,19 @@ async def get_kakao_user_info(access_token: str) -> Dict[str, Any]:
         access_token: 카카오에서 발급받은 액세스 토큰
     
     Returns:
-        사용자 정보 딕셔너리
+        사용자 정보 딕셔너리 (같은 토큰은 KAKAO_CACHE_TTL_SECONDS 동안 캐시)
     
     Raises:
         HTTPException: 토큰이 유효하지 않거나 API 호출 실패
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                KAKAO_USER_INFO_URL,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/x-www-form-urlencoded;charset=utf-8",
-                },
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Kakao access token",
-                )
-            
-            user_data = response.json()
-            
-            # 카카오 응답 형식:
-            # {
-            #   "id": 123456789,
-            #   "kakao_account": {
-            #     "email": "user@example.com",
-            #     "profile": {
-            #       "nickname": "홍길동"
-            #     }
-            #   }
-            # }
-            
-            return {
-                "id": str(user_data.get("id")),
-                "email": user_data.get("kakao_account", {}).get("email"),
-                "name": user_data.get("kakao_account", {}).get("profile", {}).get("nickname"),
-            }
-            
+        return await get_kakao_client().get_user_info(access_token)
+    
+    except httpx.TimeoutException:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Kakao API timed out",
+        )
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,171 @@
+"""
+SQLite 데이터 영속화
+
+- 데이터 디렉토리: DATA_DIR (Render 디스크 / Railway 볼륨 마운트 경로).
+  운영 환경에서 지정하지 않으면 기존처럼 /tmp를 쓰며, 재배포 시 데이터가 사라집니다.
+- 온라인 스냅샷: sqlite3 백업 API로 한 번의 읽기 트랜잭션 안에서 복사합니다.
+  WAL 모드에서는 읽기가 쓰기를 막지 않으므로 스냅샷 중에도 쓰기가 계속됩니다.
+  (페이지 단위로 나눠 복사하면 다른 연결이 쓸 때마다 백업이 처음부터 다시 시작되어
+  쓰기가 계속되는 동안 끝나지 않습니다 - benchmarks/bench_storage_snapshot.py 참고)
+  임시 파일에 쓴 뒤 rename하여 반쯤 쓴 스냅샷이 남지 않습니다.
+- 부팅 시 복원: DB 파일이 없거나 비어 있으면 가장 최근 스냅샷으로 복원합니다.
+  (DB는 빠른 임시 디스크에, 스냅샷만 영구 볼륨(BACKUP_DIR)에 두는 구성도 가능)
+- 주기 스냅샷: BACKUP_INTERVAL_SECONDS마다 백그라운드 스레드에서 실행, 종료 시 한 번 더 실행.
+"""
+import asyncio
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.engine import make_url
+
+from db_backends import backend_name, is_memory_sqlite, normalize_url
+
+DB_FILENAME = "community_control.db"
+SNAPSHOT_PREFIX = "community_control-"
+BACKUP_INTERVAL_SECONDS = int(os.getenv("BACKUP_INTERVAL_SECONDS", "3600"))  # 0이면 주기 스냅샷 끔
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "24"))
+
+
+def resolve_data_dir(is_production: bool) -> str:
+    """SQLite DB를 둘 디렉토리 (DATA_DIR > 운영 /tmp > 로컬 현재 디렉토리)"""
+    explicit = os.getenv("DATA_DIR")
+    if explicit:
+        os.makedirs(explicit, exist_ok=True)
+        return explicit
+    if is_production:
+        print("⚠️  DATA_DIR not set - using /tmp (data is lost on every redeploy)")
+        return "/tmp"
+    return "."
+
+
+def sqlite_path(url: str) -> Optional[str]:
+    """SQLite 파일 DB면 파일 경로, 그 외(메모리 DB, PostgreSQL)는 None"""
+    url = normalize_url(url)
+    if backend_name(url) != "sqlite" or is_memory_sqlite(url):
+        return None
+    return make_url(url).database
+
+
+def backup_dir_for(db_path: str) -> str:
+    """스냅샷 디렉토리 (BACKUP_DIR, 기본: DB 파일 옆 backups/)"""
+    return os.getenv("BACKUP_DIR") or os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+
+def list_snapshots(backup_dir: str) -> List[str]:
+    """스냅샷 경로 목록 (오래된 순)"""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = sorted(
+        name for name in os.listdir(backup_dir)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".db")
+    )
+    return [os.path.join(backup_dir, name) for name in names]
+
+
+def _copy(source_path: str, target_path: str):
+    """백업 API로 source → target.partial 복사 후 무결성 확인, rename"""
+    partial = target_path + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    source = sqlite3.connect(source_path)
+    try:
+        target = sqlite3.connect(partial)
+        try:
+            source.backup(target)
+            result = target.execute("PRAGMA quick_check").fetchone()[0]
+            if result != "ok":
+                raise sqlite3.DatabaseError(f"snapshot failed quick_check: {result}")
+        finally:
+            target.close()
+    finally:
+        source.close()
+    os.replace(partial, target_path)
+
+
+def snapshot(db_path: str, backup_dir: Optional[str] = None, keep: int = BACKUP_KEEP) -> str:
+    """
+    실행 중인 DB의 온라인 스냅샷을 만들고 오래된 스냅샷을 정리합니다.
+
+    Returns:
+        생성된 스냅샷 경로
+    """
+    backup_dir = backup_dir or backup_dir_for(db_path)
+    os.makedirs(backup_dir, exist_ok=True)
+    name = f"{SNAPSHOT_PREFIX}{datetime.utcnow():%Y%m%dT%H%M%S%fZ}.db"
+    path = os.path.join(backup_dir, name)
+    _copy(db_path, path)
+
+    for old in list_snapshots(backup_dir)[:-keep] if keep > 0 else []:
+        os.remove(old)
+    return path
+
+
+def restore(snapshot_path: str, db_path: str):
+    """스냅샷으로 DB 파일을 교체 (앱이 DB에 연결하기 전에만 호출)"""
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    _copy(snapshot_path, db_path)
+
+
+def restore_if_missing(db_path: str, backup_dir: Optional[str] = None) -> Optional[str]:
+    """
+    DB 파일이 없거나 비어 있으면 가장 최근 스냅샷으로 복원
+
+    Returns:
+        복원에 사용한 스냅샷 경로 (복원하지 않았으면 None)
+    """
+    if os.path.exists(db_path) and os.path.getsize(db_path) > 0:
+        return None
+    snapshots = list_snapshots(backup_dir or backup_dir_for(db_path))
+    if not snapshots:
+        return None
+    restore(snapshots[-1], db_path)
+    return snapshots[-1]
+
+
+# --------------------
+# 주기 스냅샷 (앱 startup / shutdown에서 호출)
+# --------------------
+_snapshot_task: Optional[asyncio.Task] = None
+_snapshot_db_path: Optional[str] = None
+
+
+async def _snapshot_loop(db_path: str, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            path = await asyncio.to_thread(snapshot, db_path)
+            print(f"💾 Database snapshot saved: {path}")
+        except Exception as e:
+            print(f"⚠️  Database snapshot failed: {str(e)}")
+
+
+def start_snapshots(db_path: str, interval: float = BACKUP_INTERVAL_SECONDS):
+    """주기 스냅샷 백그라운드 태스크 시작 (interval이 0이면 아무것도 하지 않음)"""
+    global _snapshot_task, _snapshot_db_path
+    if interval <= 0 or _snapshot_task is not None:
+        return
+    _snapshot_db_path = db_path
+    _snapshot_task = asyncio.get_running_loop().create_task(_snapshot_loop(db_path, interval))
+
+
+async def stop_snapshots():
+    """주기 스냅샷을 멈추고 마지막 스냅샷을 남김"""
+    global _snapshot_task, _snapshot_db_path
+    if _snapshot_task is None:
+        return
+    _snapshot_task.cancel()
+    try:
+        await _snapshot_task
+    except asyncio.CancelledError:
+        pass
+    db_path, _snapshot_task, _snapshot_db_path = _snapshot_db_path, None, None
+    try:
+        path = await asyncio.to_thread(snapshot, db_path)
+        print(f"💾 Final database snapshot saved: {path}")
+    except Exception as e:
+        print(f"⚠️  Final database snapshot failed: {str(e)}")
@@ -0,0 +1,249 @@
+"""
+관리자 대시보드 회원 목록 / 통계 롤업 (admin_dashboard.py, user_stats.py) 테스트
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+import main
+from conftest import auth_headers, make_user
+from database import User
+from user_stats import read_stats, rebuild
+
+ADMIN = {"X-Admin-Code": "admin-secret"}
+
+
+@pytest.fixture(autouse=True)
+def admin_code(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+
+
+def seed_users(db, count: int):
+    start = datetime(2024, 1, 1)
+    for i in range(1, count + 1):
+        # 가입일/방문 횟수가 겹치는 회원을 두어 (값, id) 키셋 동률 처리를 확인
+        make_user(db, i, created_at=start + timedelta(days=i // 2), total_visits=i % 4 + 1)
+
+
+def walk_pages(client, params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/admin/dashboard/users", params=query, headers=ADMIN)
+        assert response.status_code == 200
+        ids += [user["id"] for user in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["created_at", "total_visits"])
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_pagination_visits_every_user_once_in_order(client, db, sort, order):
+    seed_users(db, 11)
+    expected = sorted(db.query(User).all(), key=lambda user: (getattr(user, sort), user.id), reverse=order == "desc")
+
+    assert walk_pages(client, {"limit": 3, "sort": sort, "order": order}) == [user.id for user in expected]
+
+
+def test_created_at_is_required_for_keyset_cursor(db):
+    """created_at이 NULL이면 (값, id) 비교에서 빠지고 커서도 만들 수 없으므로 NOT NULL"""
+    from sqlalchemy.exc import IntegrityError
+
+    with pytest.raises(IntegrityError):
+        db.execute(insert(User.__table__), [dict(name="No date", email="nodate@example.com", gender="MALE",
+                                                 chess_experience="KNOW_RULES_ONLY", total_visits=1, created_at=None)])
+    db.rollback()
+
+
+def test_link_header_and_invalid_parameters(client, db):
+    seed_users(db, 3)
+    response = client.get("/admin/dashboard/users", params={"limit": 2, "sort": "total_visits"}, headers=ADMIN)
+    cursor = response.headers["X-Next-Cursor"]
+    assert f"cursor={cursor}" in response.headers["Link"] and "sort=total_visits" in response.headers["Link"]
+
+    # 다른 정렬로 만든 커서 / 깨진 커서 / 지원하지 않는 정렬
+    assert client.get("/admin/dashboard/users", params={"cursor": cursor}, headers=ADMIN).status_code == 400
+    assert client.get("/admin/dashboard/users", params={"cursor": "garbage"}, headers=ADMIN).status_code == 400
+    assert client.get("/admin/dashboard/users", params={"sort": "name"}, headers=ADMIN).status_code == 400
+    assert client.get("/admin/dashboard/users", params={"order": "up"}, headers=ADMIN).status_code == 400
+    assert client.get("/admin/dashboard/users", params={"limit": 500}, headers=ADMIN).status_code == 422
+
+
+def test_prefix_search_by_name_email_and_phone(client, db):
+    make_user(db, 1, name="김철수", email="chulsoo@chess.kr", phone_number="010-1234-5678")
+    make_user(db, 2, name="김영희", email="younghee@chess.kr", phone_number="010-9876-5432")
+    make_user(db, 3, name="Park", email="park@example.com", phone_number="010-1299-0000")
+
+    def names(q):
+        response = client.get("/admin/dashboard/users", params={"q": q, "sort": "total_visits"}, headers=ADMIN)
+        return sorted(user["name"] for user in response.json())
+
+    assert names("김") == ["김영희", "김철수"]
+    assert names("김철") == ["김철수"]
+    assert names("younghee@") == ["김영희"]
+    assert names("010-12") == ["Park", "김철수"]
+    assert names("0101234") == ["김철수"]  # 하이픈 없이 입력해도 저장 형식으로 맞춤
+    assert names("이") == []
+
+
+def test_search_uses_column_indexes(db):
+    from admin_dashboard import list_users
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for q, index in (("Kim", "ix_users_name"), ("kim@", "(email>? AND email<?)"),
+                         ("010", "(phone_number>? AND phone_number<?)")):
+            statements.clear()
+            list_users(db, q=q)
+            [(statement, parameters)] = statements
+            plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters))
+            assert "SEARCH users USING INDEX" in plan and index in plan, plan
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+# --------------------
+# 통계 롤업
+# --------------------
+def rebuilt_stats(db):
+    rebuild(db)
+    return read_stats(db)
+
+
+def test_rollup_tracks_orm_insert_update_delete(db):
+    first = make_user(db, 1, gender="MALE", chess_rating="BETWEEN_1500_2000")
+    make_user(db, 2, gender="FEMALE", total_visits=5)
+    make_user(db, 3, gender="FEMALE", chess_experience="PLAY_WELL", total_visits=12)
+
+    stats = read_stats(db)
+    assert stats["total"] == 3
+    assert stats["gender"] == {"FEMALE": 2, "MALE": 1}
+    assert stats["chess_experience"] == {"PLAY_WELL": 1, "KNOW_RULES_ONLY": 2}
+    assert stats["chess_rating"] == {"BETWEEN_1500_2000": 1, "UNRATED": 2}
+    assert stats["total_visits"] == {"1": 1, "5-9": 1, "10+": 1}
+
+    first.total_visits = 3
+    first.gender = "OTHER"
+    first.chess_rating = None
+    db.commit()
+    stats = read_stats(db)
+    assert stats["gender"] == {"FEMALE": 2, "OTHER": 1}
+    assert stats["chess_rating"] == {"UNRATED": 3}
+    assert stats["total_visits"] == {"2-4": 1, "5-9": 1, "10+": 1}
+
+    db.delete(db.query(User).filter(User.total_visits == 12).one())
+    db.commit()
+    assert read_stats(db)["total"] == 2
+    assert read_stats(db) == rebuilt_stats(db)
+
+
+def test_rollup_skips_unchanged_buckets_and_discards_rolled_back_changes(db):
+    from query_tracking import track_queries
+
+    user = make_user(db, 1, total_visits=2)
+    with track_queries() as tracker:
+        user.total_visits = 3  # 같은 구간 (2-4): 롤업 UPSERT 없음
+        db.commit()
+    assert not any("user_stats" in statement for statement in tracker.statements)
+
+    user.total_visits = 10
+    db.flush()
+    db.rollback()
+    make_user(db, 2)
+    assert read_stats(db)["total_visits"] == {"1": 1, "2-4": 1}
+    assert read_stats(db) == rebuilt_stats(db)
+
+
+def test_rollup_tracks_async_session_writes(async_session_factory, db):
+    """AsyncSession도 내부의 동기 Session flush로 같은 리스너가 반영"""
+    async def write():
+        async with async_session_factory() as session:
+            user = User(name="Async", phone_number="010-5555-0001", email="async@example.com", gender="FEMALE",
+                        chess_experience="PLAY_WELL", chess_rating="OVER_2000", total_visits=1)
+            session.add(user)
+            await session.commit()
+            user.total_visits += 1  # 1 → 2-4
+            await session.commit()
+
+    asyncio.run(write())
+    stats = read_stats(db)
+    assert stats == {"total": 1, "gender": {"FEMALE": 1}, "chess_experience": {"PLAY_WELL": 1},
+                     "chess_rating": {"OVER_2000": 1}, "total_visits": {"2-4": 1}}
+    assert stats == rebuilt_stats(db)
+
+
+def test_register_endpoint_updates_rollup(client, db):
+    payload = {"name": "New", "phone_number": "010-5555-0002", "email": "new@example.com", "gender": "MALE",
+               "birth_year": 1990, "chess_experience": "PLAY_WELL", "chess_rating": "UNDER_1000"}
+    assert client.post("/register", json=payload).status_code == 201
+    assert client.post("/register", json=dict(payload, gender="FEMALE")).status_code == 201  # 재방문 + 정보 수정
+
+    stats = client.get("/admin/dashboard/stats", headers=ADMIN).json()
+    assert stats["gender"] == {"FEMALE": 1} and stats["chess_rating"] == {"UNDER_1000": 1}
+    assert stats["total_visits"] == {"2-4": 1}
+    assert stats == rebuilt_stats(db)
+
+
+def test_rebuild_endpoint_recounts_core_inserts(client, db):
+    """ORM을 거치지 않은 대량 INSERT는 롤업에 반영되지 않으므로 rebuild로 다시 집계"""
+    now = datetime.utcnow()
+    db.execute(insert(User), [
+        dict(name=f"Bulk {i}", email=f"bulk{i}@example.com", gender="MALE", chess_experience="KNOW_RULES_ONLY",
+             total_visits=i, created_at=now, updated_at=now)
+        for i in range(1, 7)
+    ])
+    db.commit()
+    assert client.get("/admin/dashboard/stats", headers=ADMIN).json()["total"] == 0
+
+    stats = client.post("/admin/dashboard/stats/rebuild", headers=ADMIN).json()
+    assert stats["total"] == 6
+    assert stats["total_visits"] == {"1": 1, "2-4": 3, "5-9": 2}
+    assert client.get("/admin/dashboard/stats", headers=ADMIN).json() == stats
+
+
+# --------------------
+# 권한 / 대시보드 페이지
+# --------------------
+def test_admin_endpoints_require_admin(client, db):
+    user = make_user(db)
+    for method, path in (("get", "/admin/dashboard/users"), ("get", "/admin/dashboard/stats"),
+                         ("post", "/admin/dashboard/stats/rebuild")):
+        assert getattr(client, method)(path).status_code == 401
+        assert getattr(client, method)(path, headers=auth_headers(user)).status_code == 403
+        assert getattr(client, method)(path, headers={"X-Admin-Code": "wrong"}).status_code == 401
+
+
+def test_dashboard_page_renders_one_page_with_stats(client, db):
+    seed_users(db, 51)
+
+    page = client.get("/dashboard", params={"code": "admin-secret", "sort": "total_visits"})
+    assert page.status_code == 200
+    assert "51 members" in page.text
+    assert page.text.count("visits</span>") == 50  # 기본 페이지 크기만 렌더링
+    assert "/dashboard?code=admin-secret&amp;sort=total_visits&amp;order=desc&amp;cursor=" in page.text
+
+    searched = client.get("/dashboard", params={"q": "nobody"}, headers=ADMIN)
+    assert 'No members match "nobody"' in searched.text and "Next page" not in searched.text
+    assert client.get("/dashboard", follow_redirects=False).status_code == 302
+
+
+def test_admin_login_issues_token_for_admin_user(client, db, monkeypatch):
+    admin = make_user(db, 1, email="admin@chess.kr")
+    monkeypatch.setattr(main, "ADMIN_EMAIL", "admin@chess.kr")
+
+    assert client.post("/auth/admin_login", json={"code": "wrong"}).status_code == 401
+    response = client.post("/auth/admin_login", json={"code": "admin-secret"})
+    assert response.status_code == 200 and response.json()["user"]["id"] == admin.id
+    token = response.json()["access_token"]
+    assert client.get("/admin/dashboard/stats", headers={"Authorization": f"Bearer {token}"}).status_code == 200
@@ -0,0 +1,105 @@
+"""
+인증 principal 캐시 (auth.get_current_user) 테스트
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from auth import (
+    AuthenticatedUser, PrincipalCache, create_access_token, get_current_user,
+    get_current_user_optional, invalidate_user, principal_cache,
+)
+from conftest import make_user
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def bearer(user, **kwargs):
+    token = create_access_token(data={"user_id": user.id, "phone_number": user.phone_number}, **kwargs)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def count_queries(async_session_factory):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_session_factory.kw["bind"].sync_engine, "before_cursor_execute", before_execute)
+    return statements
+
+
+def authenticate(async_session_factory, dependency, credentials):
+    """비동기 세션으로 인증 의존성 호출"""
+    async def run():
+        async with async_session_factory() as session:
+            return await dependency(credentials, session)
+
+    return asyncio.run(run())
+
+
+def test_repeated_token_skips_database(db, async_session_factory):
+    user = make_user(db)
+    credentials = bearer(user)
+    statements = count_queries(async_session_factory)
+
+    first = authenticate(async_session_factory, get_current_user, credentials)
+    second = authenticate(async_session_factory, get_current_user, credentials)
+
+    assert isinstance(first, AuthenticatedUser)
+    assert first is second
+    assert first.email == user.email
+    assert len(statements) == 1
+
+
+def test_invalidate_user_reloads_principal(db, async_session_factory):
+    user = make_user(db)
+    credentials = bearer(user)
+    authenticate(async_session_factory, get_current_user, credentials)
+
+    user.name = "Renamed"
+    db.commit()
+    assert authenticate(async_session_factory, get_current_user, credentials).name == "User 1"
+
+    invalidate_user(user.id)
+    assert authenticate(async_session_factory, get_current_user, credentials).name == "Renamed"
+
+
+def test_invalid_and_unknown_tokens_are_not_cached(db, async_session_factory):
+    user = make_user(db)
+    expired = bearer(user, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(HTTPException) as exc_info:
+        authenticate(async_session_factory, get_current_user, expired)
+    assert exc_info.value.status_code == 401
+
+    ghost = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(data={"user_id": 999}))
+    with pytest.raises(HTTPException):
+        authenticate(async_session_factory, get_current_user, ghost)
+    assert authenticate(async_session_factory, get_current_user_optional, ghost) is None
+    assert principal_cache.stats()["size"] == 0
+
+
+def test_cache_respects_ttl_and_token_expiry(db, monkeypatch):
+    user = make_user(db)
+    principal = AuthenticatedUser.from_user(user)
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+
+    clock = [1000.0]
+    monkeypatch.setattr("auth.time.time", lambda: clock[0])
+    cache.set("a", principal, token_exp=1010.0)
+    cache.set("b", principal)
+    cache.set("c", principal)  # "a" 제거 (LRU)
+    assert cache.get("a") is None
+
+    clock[0] = 1061.0
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 1  # 만료 항목은 조회 시 제거
@@ -0,0 +1,127 @@
+"""
+챗봇 응답 캐시 (ChatResponseCache) 및 RAGChatbot 캐시 연동 테스트
+"""
+import asyncio
+import os
+import time
+
+import rag_chatbot
+from chat_cache import ChatResponseCache, normalize_query
+from rag_chatbot import RAGChatbot
+
+
+def test_normalize_query_ignores_case_punctuation_and_spacing():
+    assert normalize_query("  How much is the FEE?? ") == "how much is the fee"
+    assert normalize_query("참가비는   얼마인가요?") == "참가비는 얼마인가요"
+
+
+def test_key_depends_on_language_and_context():
+    key = ChatResponseCache.make_key("fee?", "en", "ctx")
+    assert key == ChatResponseCache.make_key("FEE", "en", "ctx")
+    assert key != ChatResponseCache.make_key("fee", "ko", "ctx")
+    assert key != ChatResponseCache.make_key("fee", "en", "other ctx")
+
+
+def test_lru_eviction_and_counters():
+    cache = ChatResponseCache(max_size=2, ttl_seconds=60)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # a가 최근 사용됨
+    cache.set("c", "C")           # b가 제거됨
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["evictions"] == 1 and stats["size"] == 2
+
+
+def test_ttl_expiry():
+    cache = ChatResponseCache(max_size=10, ttl_seconds=0)
+    cache.set("a", "A")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+class FakeGemini:
+    api_url = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_text(self, prompt, generation_config=None, deadline=None):
+        self.calls += 1
+        return f"answer #{self.calls}"
+
+
+def make_chatbot(tmp_path, monkeypatch):
+    kb_path = tmp_path / "knowledge_base.txt"
+    kb_path.write_text("# KB\n\n## Payment Information\nThe fee is 10,000 won.\n", encoding="utf-8")
+    monkeypatch.setattr(rag_chatbot, "KNOWLEDGE_BASE_PATH", str(kb_path))
+    monkeypatch.setattr(rag_chatbot, "KNOWLEDGE_BASE_CHECK_INTERVAL", 0.0)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    chatbot = RAGChatbot()
+    chatbot.gemini = FakeGemini()
+    return chatbot, kb_path
+
+
+def test_repeated_questions_skip_llm_call(tmp_path, monkeypatch):
+    chatbot, _ = make_chatbot(tmp_path, monkeypatch)
+
+    first = asyncio.run(chatbot.chat("How much is the fee?"))
+    second = asyncio.run(chatbot.chat("how much is the fee"))
+
+    assert first == second == "answer #1"
+    assert chatbot.gemini.calls == 1
+    assert chatbot.cache.stats()["hits"] == 1
+
+
+def test_knowledge_base_change_invalidates_cache(tmp_path, monkeypatch):
+    chatbot, kb_path = make_chatbot(tmp_path, monkeypatch)
+    asyncio.run(chatbot.chat("How much is the fee?"))
+
+    kb_path.write_text("# KB\n\n## Payment Information\nThe fee is 15,000 won.\n", encoding="utf-8")
+    stat = os.stat(kb_path)
+    os.utime(kb_path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert asyncio.run(chatbot.chat("How much is the fee?")) == "answer #2"
+    assert "15,000" in chatbot.knowledge_base[-1]["content"]
+    assert chatbot.cache.stats()["invalidations"] >= 2
+
+
+def test_error_messages_distinguish_network_and_malformed_responses(tmp_path, monkeypatch):
+    from gemini_client import GeminiError, GeminiNetworkError
+
+    chatbot, _ = make_chatbot(tmp_path, monkeypatch)
+
+    def failing(error):
+        async def generate_text(prompt, generation_config=None, deadline=None):
+            raise error
+        return generate_text
+
+    chatbot.gemini.generate_text = failing(GeminiNetworkError("connection refused"))
+    assert "network error" in asyncio.run(chatbot.chat("How much is the fee?"))
+    chatbot.gemini.generate_text = failing(GeminiError("Unexpected Gemini response structure: {}"))
+    assert asyncio.run(chatbot.chat("How much is the fee?")) == "Sorry, I couldn't generate a response. Please try again."
+    chatbot.gemini.generate_text = failing(GeminiError("Gemini API error: 503", status_code=503))
+    assert "(Error code: 503)" in asyncio.run(chatbot.chat("How much is the fee?"))
+    assert len(chatbot.cache) == 0  # 실패 응답은 캐시하지 않음
+
+
+def test_failed_reload_is_retried(tmp_path, monkeypatch):
+    chatbot, kb_path = make_chatbot(tmp_path, monkeypatch)
+    kb_path.write_text("# KB\n\n## Location\nWe meet in Gangnam.\n", encoding="utf-8")
+    later = time.time() + 10
+    os.utime(kb_path, (later, later))
+
+    def broken(documents):
+        raise RuntimeError("index build failed")
+
+    original = rag_chatbot.KnowledgeIndex
+    monkeypatch.setattr(rag_chatbot, "KnowledgeIndex", broken)
+    chatbot._reload_knowledge_base_if_changed()
+    assert "fee" in chatbot.knowledge_base[-1]["content"]  # 실패: 이전 내용 유지
+
+    monkeypatch.setattr(rag_chatbot, "KnowledgeIndex", original)
+    chatbot._reload_knowledge_base_if_changed()  # 파일이 다시 바뀌지 않아도 다음 확인 때 재시도
+    assert "Gangnam" in chatbot.knowledge_base[-1]["content"]
@@ -0,0 +1,97 @@
+"""
+/api/chat/stream (SSE 스트리밍 챗봇) 엔드포인트 테스트
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+import rag_chatbot
+from rag_chatbot import RAGChatbot
+
+
+class FakeStreamingGemini:
+    api_url = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def stream_text(self, prompt, generation_config=None, first_chunk_deadline=None):
+        self.calls += 1
+        for chunk in ["  Hello", ", ", "chess fan!"]:
+            yield chunk
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        name = "message"
+        if lines[0].startswith("event: "):
+            name = lines.pop(0)[len("event: "):]
+        events.append((name, json.loads(lines[0][len("data: "):])))
+    return events
+
+
+def test_stream_endpoint_forwards_chunks_and_caches_result(tmp_path, monkeypatch):
+    kb_path = tmp_path / "knowledge_base.txt"
+    kb_path.write_text("# KB\n\n## Location\nWe meet at cafes in Gangnam.\n", encoding="utf-8")
+    monkeypatch.setattr(rag_chatbot, "KNOWLEDGE_BASE_PATH", str(kb_path))
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    chatbot = RAGChatbot()
+    chatbot.gemini = FakeStreamingGemini()
+    monkeypatch.setattr(main, "get_chatbot", lambda: chatbot)
+
+    client = TestClient(main.app)
+    response = client.post("/api/chat/stream", json={"message": "Where do you meet?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [data["delta"] for name, data in events if name == "message"] == ["Hello", ", ", "chess fan!"]
+    assert events[-1][0] == "done"
+
+    # 완성된 응답은 캐시되어 블로킹 엔드포인트에서도 재사용됨
+    response = client.post("/api/chat", json={"message": "where do you meet"})
+    assert response.json()["response"] == "Hello, chess fan!"
+    assert chatbot.gemini.calls == 1
+
+
+class FailingStreamingGemini:
+    api_url = "stub"
+
+    async def stream_text(self, prompt, generation_config=None, first_chunk_deadline=None):
+        from gemini_client import GeminiTimeoutError
+
+        yield "Partial "
+        raise GeminiTimeoutError("Gemini API request timed out")
+
+
+def test_stream_failure_after_chunks_sends_error_event(tmp_path, monkeypatch):
+    kb_path = tmp_path / "knowledge_base.txt"
+    kb_path.write_text("# KB\n\n## Location\nWe meet at cafes in Gangnam.\n", encoding="utf-8")
+    monkeypatch.setattr(rag_chatbot, "KNOWLEDGE_BASE_PATH", str(kb_path))
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    chatbot = RAGChatbot()
+    chatbot.gemini = FailingStreamingGemini()
+    monkeypatch.setattr(main, "get_chatbot", lambda: chatbot)
+
+    events = parse_events(TestClient(main.app).post("/api/chat/stream", json={"message": "Where?"}).text)
+
+    # 오류 문구는 답변 조각(delta)에 섞이지 않고 별도 error 이벤트로 끝남 (done 없음)
+    assert events == [("message", {"delta": "Partial "}),
+                      ("error", {"message": "Sorry, the request timed out. Please try again."})]
+    assert len(chatbot.cache) == 0
+
+
+def test_uninitialized_chatbot_sends_error_event(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    chatbot = RAGChatbot()
+    assert not chatbot.initialized
+    monkeypatch.setattr(main, "get_chatbot", lambda: chatbot)
+
+    events = parse_events(TestClient(main.app).post("/api/chat/stream", json={"message": "Where?"}).text)
+
+    # 안내 문구가 답변 조각이나 done으로 전달되지 않음
+    assert events == [("error", {"message": "Sorry, the chatbot service is currently unavailable. "
+                                            "Please contact the administrator."})]
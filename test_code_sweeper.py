@@ -0,0 +1,101 @@
+"""
+만료 인증 코드 정리(CodeSweeper)와 /sms/request 단일 DELETE 테스트
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from code_sweeper import CodeSweeper, delete_expired_codes
+from database import VerificationCode
+
+
+def add_codes(db, count, expires_in, prefix="010-1000"):
+    now = datetime.utcnow()
+    db.add_all([
+        VerificationCode(phone_number=f"{prefix}-{i:04d}", code="123456",
+                         created_at=now - timedelta(minutes=10), expires_at=now + expires_in)
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def test_delete_expired_codes_in_batches(db):
+    add_codes(db, 7, timedelta(minutes=-1), prefix="010-1000")
+    add_codes(db, 3, timedelta(minutes=4), prefix="010-2000")
+
+    statements = []
+    engine = db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert delete_expired_codes(db, batch_size=3) == 7
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [code.phone_number[:8] for code in db.query(VerificationCode)] == ["010-2000"] * 3
+    assert sum(statement.lstrip().startswith("DELETE") for statement in statements) == 3  # 3 + 3 + 1
+
+
+def test_sweeper_stats(session_factory):
+    db = session_factory()
+    add_codes(db, 4, timedelta(seconds=-5))
+    db.close()
+
+    sweeper = CodeSweeper(session_factory, interval=0, batch_size=2)
+    assert sweeper.sweep() == 4
+    assert sweeper.sweep() == 0
+
+    stats = sweeper.stats()
+    assert stats["runs"] == 2
+    assert stats["last_rows_swept"] == 0
+    assert stats["rows_swept_total"] == 4
+    assert stats["errors"] == 0
+    assert stats["last_run_at"] is not None
+
+
+def test_sweeper_background_task(session_factory):
+    db = session_factory()
+    add_codes(db, 2, timedelta(seconds=-5))
+    db.close()
+
+    sweeper = CodeSweeper(session_factory, interval=0.05)
+
+    async def run():
+        sweeper.start()
+        await asyncio.sleep(0.2)
+        await sweeper.stop()
+
+    asyncio.run(run())
+    assert sweeper.runs >= 2
+    assert sweeper.rows_swept_total == 2
+    assert sweeper._task is None
+
+
+def test_sms_request_replaces_previous_code_with_single_delete(client, db):
+    phone = "010-3000-0001"
+    now = datetime.utcnow()
+    db.add_all([
+        VerificationCode(phone_number=phone, code=code, created_at=now - timedelta(minutes=2),
+                         expires_at=now + timedelta(minutes=3))
+        for code in ("111111", "222222")
+    ])
+    db.commit()
+
+    assert client.post("/sms/request", json={"phone_number": phone}).status_code == 200
+    db.expire_all()
+    codes = db.query(VerificationCode).filter(VerificationCode.phone_number == phone).all()
+    assert len(codes) == 1 and codes[0].code not in ("111111", "222222")
+
+    # 30초 쿨다운
+    response = client.post("/sms/request", json={"phone_number": phone})
+    assert response.status_code == 429
+
+
+def test_sweeper_stats_endpoint(client, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    assert client.get("/sms/sweeper_stats").status_code == 401
+    stats = client.get("/sms/sweeper_stats", headers={"X-Admin-Code": "admin-secret"}).json()
+    assert {"runs", "last_rows_swept", "rows_swept_total", "last_duration_ms"} <= set(stats)
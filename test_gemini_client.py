@@ -0,0 +1,183 @@
+"""
+GeminiClient (공용 비동기 Gemini 클라이언트) 테스트
+
+로컬 스텁 HTTP 서버를 띄워 실제 네트워크 없이 동작을 확인합니다.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gemini_client import GeminiClient, GeminiError, GeminiNetworkError, GeminiTimeoutError
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["contents"][0]["parts"][0]["text"]
+        if ":streamGenerateContent" in self.path:
+            return self._stream(prompt)
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.api_keys.append(self.headers.get("x-goog-api-key"))
+        try:
+            time.sleep(server.delay)
+            if prompt == "fail":
+                status, payload = 503, {"error": "unavailable"}
+            else:
+                status, payload = 200, {"candidates": [{"content": {"parts": [{"text": f"  echo: {prompt}  "}]}}]}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # 데드라인 테스트에서 클라이언트가 먼저 연결을 끊는 경우
+            pass
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _stream(self, prompt):
+        # SSE 응답: 단어마다 하나의 data 이벤트, 연결 종료로 스트림 끝을 표시
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for word in prompt.split():
+            event = {"candidates": [{"content": {"parts": [{"text": word + " "}]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode())
+            self.wfile.flush()
+            time.sleep(self.server.delay)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+    server.lock = threading.Lock()
+    server.delay = 0.0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.api_keys = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs) -> GeminiClient:
+    host, port = server.server_address
+    return GeminiClient(api_key="test-key", api_url=f"http://{host}:{port}/models/stub:generateContent", **kwargs)
+
+
+def test_generate_text_returns_first_candidate(stub_server):
+    async def run():
+        client = make_client(stub_server)
+        try:
+            return await client.generate_text("hello")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "echo: hello"
+    assert stub_server.api_keys == ["test-key"]
+
+
+def test_http_error_raises_gemini_error(stub_server):
+    async def run():
+        client = make_client(stub_server)
+        try:
+            await client.generate_text("fail")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(GeminiError) as exc_info:
+        asyncio.run(run())
+    assert exc_info.value.status_code == 503
+
+
+def test_connection_failure_raises_network_error():
+    async def run():
+        # 아무도 듣지 않는 포트 (연결 거부)
+        client = GeminiClient(api_key="test-key", api_url="http://127.0.0.1:9/models/stub:generateContent")
+        try:
+            await client.generate_text("hello")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(GeminiNetworkError) as exc_info:
+        asyncio.run(run())
+    assert exc_info.value.status_code is None
+
+
+def test_deadline_raises_timeout(stub_server):
+    stub_server.delay = 0.5
+
+    async def run():
+        client = make_client(stub_server)
+        try:
+            await client.generate_text("slow", deadline=0.1)
+        finally:
+            await client.aclose()
+
+    with pytest.raises(GeminiTimeoutError):
+        asyncio.run(run())
+
+
+def test_concurrency_is_bounded_and_loop_stays_responsive(stub_server):
+    stub_server.delay = 0.2
+
+    async def run():
+        client = make_client(stub_server, max_concurrency=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        try:
+            results = await asyncio.gather(*(client.generate_text(f"q{i}") for i in range(6)))
+        finally:
+            tick_task.cancel()
+            await client.aclose()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+    assert results == [f"echo: q{i}" for i in range(6)]
+    assert stub_server.max_in_flight <= 2
+    # 6건 / 동시 2건 * 0.2초 = 약 0.6초 동안 이벤트 루프가 계속 돌아야 함
+    assert ticks > 20
+
+
+def test_stream_text_yields_chunks_as_they_arrive(stub_server):
+    stub_server.delay = 0.05
+
+    async def run():
+        client = make_client(stub_server)
+        received = []
+        try:
+            async for chunk in client.stream_text("one two three"):
+                received.append((chunk, time.perf_counter()))
+        finally:
+            await client.aclose()
+        return received
+
+    received = asyncio.run(run())
+    assert [chunk for chunk, _ in received] == ["one ", "two ", "three "]
+    # 조각이 한꺼번에가 아니라 순차적으로 도착해야 함
+    assert received[-1][1] - received[0][1] >= 0.08
@@ -0,0 +1,98 @@
+"""
+ETag / 조건부 GET / 응답 캐시 (http_cache.py) 테스트
+"""
+from datetime import datetime, timedelta
+
+from auth import invalidate_user
+from conftest import auth_headers, make_user
+from database import Meeting
+from http_cache import response_cache
+
+
+def seed_meeting(session_factory, capacity=5):
+    db = session_factory()
+    meeting = Meeting(title="Blitz", date_time=datetime.utcnow() + timedelta(days=1), location="Seoul", capacity=capacity)
+    db.add(meeting)
+    db.commit()
+    meeting_id = meeting.id
+    user = make_user(db)
+    db.close()
+    return meeting_id, user
+
+
+def test_meetings_not_modified_until_registration(client, session_factory):
+    meeting_id, user = seed_meeting(session_factory)
+
+    first = client.get("/meetings")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    repeat = client.get("/meetings", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+
+    response = client.post(f"/meetings/register?meeting_id={meeting_id}", headers=auth_headers(user))
+    assert response.status_code == 201
+
+    changed = client.get("/meetings", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()[0]["confirmed_count"] == 1
+
+
+def test_waitlist_cancel_changes_meeting_etag(client, session_factory):
+    meeting_id, first_user = seed_meeting(session_factory, capacity=1)
+    db = session_factory()
+    second_user = make_user(db, 2)
+    db.close()
+
+    client.post(f"/meetings/register?meeting_id={meeting_id}", headers=auth_headers(first_user))
+    assert client.post(f"/meetings/register?meeting_id={meeting_id}", headers=auth_headers(second_user)).status_code == 202
+    before = client.get("/meetings")
+    assert before.json()[0]["waitlist_count"] == 1
+
+    response = client.post(f"/meetings/cancel?meeting_id={meeting_id}", headers=auth_headers(second_user))
+    assert response.status_code == 200
+
+    after = client.get("/meetings", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.json()[0]["waitlist_count"] == 0
+
+
+def test_cached_body_served_and_invalidated(client, session_factory):
+    seed_meeting(session_factory)
+
+    client.get("/meetings")
+    hits = response_cache.hits
+    assert client.get("/meetings").status_code == 200
+    assert response_cache.hits == hits + 1
+
+    response = client.post(
+        "/meetings/create",
+        json={"title": "Rapid", "date_time": (datetime.utcnow() + timedelta(days=2)).isoformat(), "location": "Seoul", "capacity": 4},
+    )
+    assert response.status_code == 201
+    assert response_cache.stats()["size"] == 0
+    assert [meeting["title"] for meeting in client.get("/meetings").json()] == ["Blitz", "Rapid"]
+
+
+def test_user_endpoints_support_if_none_match(client, session_factory):
+    _, user = seed_meeting(session_factory)
+
+    me = client.get("/auth/me", headers=auth_headers(user))
+    assert me.status_code == 200
+    assert me.headers["Cache-Control"] == "private, no-cache"
+    etag = me.headers["ETag"]
+
+    by_phone = client.get("/get_user_by_phone", params={"phone_number": user.phone_number}, headers={"If-None-Match": etag})
+    assert by_phone.status_code == 304
+
+    db = session_factory()
+    db.query(type(user)).filter_by(id=user.id).update({"total_visits": 5, "updated_at": datetime.utcnow() + timedelta(seconds=1)})
+    db.commit()
+    db.close()
+    invalidate_user(user.id)
+
+    refreshed = client.get("/auth/me", headers={"Authorization": auth_headers(user)["Authorization"], "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["total_visits"] == 5
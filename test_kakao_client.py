@@ -0,0 +1,137 @@
+"""
+카카오 사용자 정보 클라이언트 (social_auth.KakaoClient) 테스트
+
+로컬 스텁 카카오 서버로 커넥션 재사용, 캐시, 타임아웃을 확인합니다.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import HTTPException
+
+import social_auth
+from social_auth import KakaoClient, get_kakao_user_info
+
+
+class StubKakaoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.delay)
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token == "bad-token":
+            status, payload = 401, {"msg": "this access token does not exist"}
+        else:
+            status, payload = 200, {
+                "id": 42,
+                "kakao_account": {"email": f"{token}@kakao.test", "profile": {"nickname": "홍길동"}},
+            }
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def kakao_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubKakaoHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.connections = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.url = f"http://{host}:{port}/v2/user/me"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_with_client(client, coroutine_factory):
+    async def run():
+        try:
+            return await coroutine_factory()
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_repeated_token_served_from_cache(kakao_server):
+    client = KakaoClient(user_info_url=kakao_server.url)
+
+    async def login_three_times():
+        return [await client.get_user_info("token-a") for _ in range(3)]
+
+    results = run_with_client(client, login_three_times)
+    assert results[0] == {"id": "42", "email": "token-a@kakao.test", "name": "홍길동"}
+    assert results == results[:1] * 3
+    assert kakao_server.requests == 1
+    assert client.cache_hits == 2
+    assert all("token-a" not in key for key in client._cache)
+
+
+def test_distinct_tokens_reuse_one_connection(kakao_server):
+    client = KakaoClient(user_info_url=kakao_server.url, cache_ttl_seconds=0)
+
+    async def login_many():
+        return [await client.get_user_info(f"token-{i}") for i in range(5)]
+
+    run_with_client(client, login_many)
+    assert kakao_server.requests == 5
+    assert kakao_server.connections == 1
+
+
+def test_invalid_token_not_cached(kakao_server):
+    client = KakaoClient(user_info_url=kakao_server.url)
+
+    async def login_twice():
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await client.get_user_info("bad-token")
+            assert exc_info.value.status_code == 401
+
+    run_with_client(client, login_twice)
+    assert kakao_server.requests == 2
+
+
+def test_cache_entries_expire(kakao_server):
+    client = KakaoClient(user_info_url=kakao_server.url, cache_ttl_seconds=0.05)
+
+    async def login_after_ttl():
+        await client.get_user_info("token-a")
+        await asyncio.sleep(0.1)
+        await client.get_user_info("token-a")
+
+    run_with_client(client, login_after_ttl)
+    assert kakao_server.requests == 2
+
+
+def test_read_timeout_maps_to_504(kakao_server, monkeypatch):
+    kakao_server.delay = 0.5
+    client = KakaoClient(user_info_url=kakao_server.url, read_timeout=0.1)
+    monkeypatch.setattr(social_auth, "_kakao_client", client)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_with_client(client, lambda: get_kakao_user_info("token-a"))
+    assert exc_info.value.status_code == 504
@@ -0,0 +1,40 @@
+"""
+KnowledgeIndex (역색인 기반 지식 검색) 테스트
+"""
+from knowledge_index import KnowledgeIndex, tokenize
+
+
+DOCUMENTS = [
+    "Club Introduction\nSeoul Chess Club (SCC) is a community for meeting new people.",
+    "Payment Information\nThe participation fee is 10,000 won. Your spot is confirmed after payment.",
+    "Chess Levels\nAll levels are welcome, from beginners to advanced players.",
+    "참가비 안내\n모임 참가비는 만원입니다. 입금 후 자리가 확정됩니다.",
+]
+
+
+def test_tokenize_adds_hangul_bigrams():
+    tokens = tokenize("참가비는 얼마?")
+    assert "참가비는" in tokens
+    assert "참가" in tokens and "가비" in tokens
+    assert tokenize("Chess, CLUB!") == ["chess", "club"]
+
+
+def test_search_ranks_best_section_first():
+    index = KnowledgeIndex(DOCUMENTS)
+    results = index.search("how much is the fee?", top_k=3)
+    assert results[0][1] == 1
+
+
+def test_search_matches_prefix_and_korean_particles():
+    index = KnowledgeIndex(DOCUMENTS)
+    # "begin" -> "beginners" (접두어 확장)
+    assert index.search("begin")[0][1] == 2
+    # 조사가 붙은 질의도 본문과 매칭
+    assert index.search("참가비가 궁금해요")[0][1] == 3
+
+
+def test_search_respects_top_k_and_empty_results():
+    index = KnowledgeIndex(DOCUMENTS)
+    assert len(index.search("chess club payment levels", top_k=2)) == 2
+    assert index.search("xylophone") == []
+    assert KnowledgeIndex([]).search("chess") == []
@@ -0,0 +1,109 @@
+"""
+모임 목록 페이지네이션 (meeting_listing.py, GET /meetings) 테스트
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from conftest import make_user
+from database import Meeting
+from reservations import reserve_seat
+
+
+def seed_meetings(db, past: int, upcoming: int):
+    now = datetime.utcnow()
+    meetings = [
+        Meeting(title=f"Past {i}", date_time=now - timedelta(days=i + 1), location="Seoul", capacity=1)
+        for i in range(past)
+    ] + [
+        Meeting(title=f"Upcoming {i}", date_time=now + timedelta(days=i + 1), location="Seoul", capacity=1)
+        for i in range(upcoming)
+    ]
+    db.add_all(meetings)
+    db.commit()
+    return meetings
+
+
+def walk_pages(client, params):
+    titles, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/meetings", params=query)
+        assert response.status_code == 200
+        titles += [meeting["title"] for meeting in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return titles, pages
+
+
+def test_cursor_pagination_visits_every_meeting_once(client, session_factory):
+    db = session_factory()
+    seed_meetings(db, past=4, upcoming=7)
+    db.close()
+
+    titles, pages = walk_pages(client, {"limit": 3, "when": "all"})
+    assert len(titles) == len(set(titles)) == 11
+    assert pages == 4
+
+    upcoming, _ = walk_pages(client, {"limit": 3, "when": "upcoming"})
+    assert upcoming == [f"Upcoming {i}" for i in range(7)]
+    # when을 생략하면 다가오는 모임 (기존 클라이언트의 GET /meetings)
+    assert walk_pages(client, {"limit": 3})[0] == upcoming
+
+    past, _ = walk_pages(client, {"limit": 3, "when": "past"})
+    assert past == [f"Past {i}" for i in range(4)]  # 최신순
+
+
+def test_counts_without_participants_and_opt_in_expansion(client, session_factory):
+    db = session_factory()
+    meeting = seed_meetings(db, past=0, upcoming=1)[0]
+    users = [make_user(db, i) for i in range(3)]
+    for user in users:
+        reserve_seat(db, user.id, meeting.id, waitlist=True)
+    db.close()
+
+    listed = client.get("/meetings").json()[0]
+    assert listed["participant_count"] == 1
+    assert listed["waitlist_count"] == 2
+    assert listed["participants"] == []
+
+    expanded = client.get("/meetings", params={"include": "participants"}).json()[0]
+    assert len(expanded["participants"]) == 3
+
+
+def test_listing_query_count_is_constant(client, session_factory, async_session_factory):
+    db = session_factory()
+    meetings = seed_meetings(db, past=0, upcoming=20)
+    users = [make_user(db, i) for i in range(5)]
+    for meeting in meetings:
+        for user in users:
+            reserve_seat(db, user.id, meeting.id, waitlist=True)
+    db.close()
+    # 엔드포인트는 비동기 세션을 사용
+    engine = async_session_factory.kw["bind"].sync_engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        client.get("/meetings", params={"limit": 20})
+        plain = len(statements)
+        statements.clear()
+        client.get("/meetings", params={"limit": 20, "include": "participants"})
+        expanded = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # 페이지 조회 + 대기 인원 집계 / + 참가자 selectinload 1회
+    assert plain == 2
+    assert expanded == 3
+
+
+def test_invalid_parameters_are_rejected(client):
+    assert client.get("/meetings", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/meetings", params={"when": "someday"}).status_code == 400
+    assert client.get("/meetings", params={"limit": 0}).status_code == 422
@@ -0,0 +1,223 @@
+"""
+메트릭 레지스트리 / 미들웨어 / SQL·외부 호출 계측 테스트
+"""
+import asyncio
+import re
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from conftest import auth_headers, make_user
+from metrics import MetricsMiddleware, Registry, UPSTREAM_REQUEST_DURATION, instrument_engine, track_upstream
+
+
+def parse(text_format: str):
+    """Prometheus 텍스트 → {(이름, 정렬된 라벨): 값}"""
+    samples = {}
+    for line in text_format.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = re.match(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$', line)
+        assert match, line
+        name, labels, value = match.groups()
+        label_pairs = tuple(sorted(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or "")))
+        samples[(name, label_pairs)] = float(value)
+    return samples
+
+
+def test_histogram_exposition():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels("/a").observe(value)
+
+    rendered = registry.render()
+    assert "# TYPE latency_seconds histogram" in rendered
+    samples = parse(rendered)
+    bucket = lambda le: samples[("latency_seconds_bucket", (("le", le), ("route", "/a")))]
+    assert (bucket("0.1"), bucket("1"), bucket("+Inf")) == (2, 3, 4)  # le는 경계값 포함
+    assert samples[("latency_seconds_count", (("route", "/a"),))] == 4
+    assert samples[("latency_seconds_sum", (("route", "/a"),))] == pytest.approx(3.65)
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.counter("events", "test", ("name",)).labels('a"b\\c\nd').inc()
+    assert 'events_total{name="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_counter_is_exact_across_threads():
+    registry = Registry()
+    counter = registry.counter("hits", "test")
+    histogram = registry.histogram("work_seconds", "test")
+
+    def work():
+        for _ in range(20000):
+            counter.inc()
+            histogram.observe(0.002)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    samples = parse(registry.render())
+    assert samples[("hits_total", ())] == 160000
+    assert samples[("work_seconds_count", ())] == 160000
+
+
+def test_dead_thread_shards_are_folded():
+    """짧게 사는 스레드가 계속 바뀌어도 스레드별 배열이 쌓이지 않고 값은 보존됨"""
+    registry = Registry()
+    counter = registry.counter("hits", "test")
+    child = counter.labels()
+
+    for _ in range(50):
+        thread = threading.Thread(target=lambda: child.inc(2))
+        thread.start()
+        thread.join()
+
+    assert len(child._values._shards) <= 1
+    assert parse(registry.render())[("hits_total", ())] == 100
+    assert len(child._values._shards) == 0
+
+
+def test_register_returns_existing_and_rejects_conflicts():
+    registry = Registry()
+    assert registry.counter("x", "doc", ("a",)) is registry.counter("x", "doc", ("a",))
+    with pytest.raises(ValueError):
+        registry.histogram("x", "doc", ("a",))
+    with pytest.raises(ValueError):
+        registry.counter("x", "doc", ("a",)).labels("1", "2")
+
+
+def test_failing_collector_does_not_break_scrape():
+    registry = Registry()
+    registry.counter("ok", "doc").inc()
+    registry.register_collector("broken", "gauge", "doc", lambda: 1 / 0)
+    rendered = registry.render()
+    assert "ok_total 1" in rendered and "collector broken failed" in rendered
+
+
+def test_middleware_labels_by_route_template():
+    registry = Registry()
+    duration = registry.histogram("http_request_duration_seconds", "test", ("method", "route", "status"))
+    in_flight = registry.gauge("http_requests_in_flight", "test")
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, duration=duration, in_flight=in_flight)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for item_id in (1, 2, 3, 0):
+        client.get(f"/items/{item_id}")
+    client.get("/no/such/path")
+
+    samples = parse(registry.render())
+    count = lambda route, status: samples.get(
+        ("http_request_duration_seconds_count", (("method", "GET"), ("route", route), ("status", status))))
+    assert count("/items/{item_id}", "200") == 3
+    assert count("/items/{item_id}", "404") == 1
+    assert count("other", "404") == 1
+    assert samples[("http_requests_in_flight", ())] == 0
+
+
+def test_instrument_engine_counts_statements(tmp_path):
+    registry = Registry()
+    duration = registry.histogram("db_query_duration_seconds", "test", ("engine", "operation"))
+    errors = registry.counter("db_query_errors", "test", ("engine", "operation"))
+    engine = create_engine(f"sqlite:///{tmp_path}/metrics.db")
+    instrument_engine(engine, "test", duration=duration, errors=errors)
+    instrument_engine(engine, "test", duration=duration, errors=errors)  # 중복 등록 무시
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+        conn.execute(text("  select * from t"))
+        conn.execute(text("SELECT count(*) FROM t"))
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing"))
+    engine.dispose()
+
+    samples = parse(registry.render())
+    count = lambda op: samples.get(("db_query_duration_seconds_count", (("engine", "test"), ("operation", op))))
+    assert (count("CREATE"), count("INSERT"), count("SELECT")) == (1, 1, 2)
+    assert samples[("db_query_errors_total", (("engine", "test"), ("operation", "SELECT")))] == 1
+
+
+def upstream_count(service, outcome):
+    child = UPSTREAM_REQUEST_DURATION._children.get((service, outcome))
+    return child.snapshot()[2] if child is not None else 0
+
+
+def test_track_upstream_outcomes():
+    before = {o: upstream_count("test_api", o) for o in ("2xx", "5xx", "timeout", "error", "cancelled")}
+
+    with track_upstream("test_api") as call:
+        call.status_code = 204
+    with track_upstream("test_api") as call:
+        call.status_code = 503
+    with pytest.raises(httpx.ReadTimeout):
+        with track_upstream("test_api"):
+            raise httpx.ReadTimeout("slow")
+    with pytest.raises(ValueError):
+        with track_upstream("test_api"):
+            raise ValueError
+
+    async def cancelled():
+        with track_upstream("test_api"):
+            await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(cancelled(), 0.01))
+
+    assert {o: upstream_count("test_api", o) - n for o, n in before.items()} == {
+        "2xx": 1, "5xx": 1, "timeout": 1, "error": 1, "cancelled": 1}
+
+
+def test_metrics_endpoint(client, monkeypatch):
+    import main
+    import rag_chatbot
+
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    client.get("/meetings")
+    client.get("/meetings")
+    assert client.get("/api/chat/cache_stats").status_code == 401
+    assert client.get("/api/chat/cache_stats", headers={"X-Admin-Code": "admin-secret"}).status_code == 200  # 챗봇 인스턴스 생성
+    rag_chatbot._chatbot_instance.cache.get("missing-key")
+
+    response = client.get("/metrics", headers={"X-Admin-Code": "admin-secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = parse(response.text)
+    assert samples[("http_request_duration_seconds_count",
+                    (("method", "GET"), ("route", "/meetings"), ("status", "200")))] >= 2
+    assert samples[("http_requests_in_flight", ())] == 1  # /metrics 요청 자신
+    assert samples[("cache_requests_total", (("cache", "chatbot"), ("result", "miss")))] >= 1
+    assert ("sms_queue_messages", (("state", "pending"),)) in samples
+
+
+def test_metrics_endpoint_requires_token_or_admin(client, db, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    monkeypatch.setattr(main, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers=auth_headers(make_user(db))).status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/metrics", headers={"X-Admin-Code": "admin-secret"}).status_code == 200
+
+    # 토큰을 설정하지 않아도 공개되지 않음
+    monkeypatch.setattr(main, "METRICS_TOKEN", None)
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 401
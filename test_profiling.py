@@ -0,0 +1,168 @@
+"""
+요청 프로파일링 미들웨어 / 관리자 API 테스트
+"""
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main
+from conftest import auth_headers, make_user
+from profiling import IDLE_FRAME, Profiler, ProfilingMiddleware, get_profiler
+
+
+def busy_work(seconds: float):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def make_app(profiler: Profiler):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/cpu")
+    def cpu():  # 동기 엔드포인트: 스레드 풀에서 실행
+        busy_work(0.15)
+        return {"ok": True}
+
+    @app.get("/wait")
+    async def wait():
+        await asyncio.sleep(0.15)
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    return app
+
+
+def test_disabled_profiler_only_checks_flag():
+    profiler = Profiler(sample_rate=0)
+
+    def fail():
+        raise AssertionError("should_profile must not run while disabled")
+
+    profiler.rand = fail
+    client = TestClient(make_app(profiler))
+    assert client.get("/fast").status_code == 200
+    assert not profiler.profiles
+
+
+def test_profiles_sync_endpoint_in_threadpool():
+    profiler = Profiler(interval_ms=2)
+    profiler.configure(sample_rate=1.0)
+    client = TestClient(make_app(profiler))
+    assert client.get("/cpu").status_code == 200
+
+    [profile] = profiler.profiles
+    assert profile.route == "/cpu" and profile.status == 200 and profile.duration_ms >= 150
+    assert profile.samples >= 10
+    assert any("busy_work (test_profiling.py:" in stack for stack in profile.stacks)
+    assert profile.top_frames()[0]["frame"].startswith("busy_work")
+
+    # collapsed: "frame;frame;... count"
+    for line in profile.collapsed().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+    speedscope = profile.speedscope()
+    frames = speedscope["shared"]["frames"]
+    [sampled] = speedscope["profiles"]
+    assert sampled["type"] == "sampled" and len(sampled["samples"]) == len(sampled["weights"])
+    assert all(0 <= index < len(frames) for sample in sampled["samples"] for index in sample)
+    assert sampled["endValue"] == pytest.approx(sum(profile.stacks.values()) * 2)
+
+
+def test_event_loop_waiting_is_recorded_as_idle():
+    profiler = Profiler(interval_ms=2)
+    profiler.configure(sample_rate=1.0)
+    TestClient(make_app(profiler)).get("/wait")
+
+    [profile] = profiler.profiles
+    idle = sum(count for stack, count in profile.stacks.items() if stack.endswith(IDLE_FRAME))
+    assert idle >= profile.samples * 0.5
+
+
+def test_route_filter_sampling_and_min_duration():
+    values = iter([0.5, 0.1, 0.0])
+    profiler = Profiler(interval_ms=2, rand=lambda: next(values))
+    profiler.configure(sample_rate=0.2, routes=["/w*"], min_duration_ms=100)
+    client = TestClient(make_app(profiler))
+
+    client.get("/fast")  # 경로 불일치 (rand 호출 안 함)
+    client.get("/wait")  # 0.5 >= 0.2 → 제외
+    client.get("/wait")  # 0.1 < 0.2 → 프로파일
+    assert [profile.path for profile in profiler.profiles] == ["/wait"]
+
+    profiler.configure(sample_rate=1.0, min_duration_ms=100)
+    client.get("/fast")  # 프로파일했지만 min_duration_ms 미만이라 버림
+    assert len(profiler.profiles) == 1
+
+
+def test_profiling_expires():
+    profiler = Profiler()
+    profiler.configure(sample_rate=1.0, expires_in_seconds=0.01)
+    time.sleep(0.02)
+    TestClient(make_app(profiler)).get("/fast")
+    assert not profiler.enabled and not profiler.profiles
+
+
+def test_writes_files_to_output_dir(tmp_path):
+    profiler = Profiler(interval_ms=2, output_dir=str(tmp_path))
+    profiler.configure(sample_rate=1.0)
+    TestClient(make_app(profiler)).get("/wait")
+    [profile] = profiler.profiles
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert [name.split("-", 1)[1] for name in names] == [f"{profile.id}.collapsed", f"{profile.id}.speedscope.json"]
+    assert json.loads((tmp_path / names[1]).read_text())["profiles"][0]["type"] == "sampled"
+
+
+# --------------------
+# 관리자 API
+# --------------------
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    profiler = get_profiler()
+    yield profiler
+    profiler.disable()
+    profiler.clear()
+
+
+def test_admin_profiling_requires_admin(client, db, profiler):
+    assert client.get("/admin/profiling").status_code == 401
+    assert client.get("/admin/profiling", headers=auth_headers(make_user(db))).status_code == 403
+    assert client.get("/admin/profiling", headers={"X-Admin-Code": "wrong"}).status_code == 401
+    assert client.put("/admin/profiling", json={"sample_rate": 1}).status_code == 401
+    assert not profiler.enabled
+
+
+def test_admin_profiling_flow(client, profiler):
+    admin = {"X-Admin-Code": "admin-secret"}
+    config = client.put("/admin/profiling", headers=admin,
+                        json={"sample_rate": 1, "routes": ["/meetings"], "interval_ms": 2}).json()
+    assert config["enabled"] and config["routes"] == ["/meetings"] and 0 < config["expires_in_seconds"] <= 600
+
+    assert client.get("/meetings").status_code == 200
+    assert client.get("/health").status_code == 200  # 경로 불일치
+
+    listing = client.get("/admin/profiling", headers=admin).json()
+    [summary] = listing["profiles"]
+    assert summary["path"] == "/meetings" and summary["route"] == "/meetings" and summary["status"] == 200
+
+    speedscope = client.get(f"/admin/profiling/{summary['id']}", headers=admin)
+    assert speedscope.json()["profiles"][0]["type"] == "sampled"
+    assert "speedscope.json" in speedscope.headers["content-disposition"]
+    collapsed = client.get(f"/admin/profiling/{summary['id']}?format=collapsed", headers=admin)
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert client.get("/admin/profiling/missing", headers=admin).status_code == 404
+
+    assert client.put("/admin/profiling", headers=admin, json={"sample_rate": 0}).json()["enabled"] is False
+    assert client.put("/admin/profiling", headers=admin, json={"sample_rate": 2}).status_code == 422
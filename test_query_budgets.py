@@ -0,0 +1,184 @@
+"""
+엔드포인트별 SQL 쿼리 예산 / N+1 감지 테스트
+
+주요 엔드포인트를 호출하면서 QueryTrackingMiddleware가 만든 요청별 QueryReport를 모아
+(메서드, 라우트, 상태 코드)별 예산을 넘거나 같은 SQL을 반복(N+1)하면 실패합니다.
+모임마다 참가자를 여러 명 두어 관계를 하나씩 lazy load하면 바로 드러나도록 합니다.
+
+쿼리를 줄였다면 BUDGETS를 낮추고, 늘려야 한다면 이유를 PR에 적은 뒤 올립니다.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, text
+
+import main
+from auth import principal_cache
+from conftest import auth_headers, make_user
+from database import Meeting, User, UserMeeting, VerificationCode
+from metrics import REGISTRY
+from query_tracking import (QueryBudgetExceeded, QueryReport, QueryTrackingMiddleware, capture_query_reports,
+                            check_query_budget, track_queries)
+from reservations import STATUS_CONFIRMED
+
+# (메서드, 라우트 템플릿, 상태 코드) → 최대 쿼리 수 (인증이 필요한 요청은 사용자 조회 1번 포함)
+BUDGETS = {
+    ("POST", "/sms/request", 200): 2,
+    ("POST", "/sms/verify", 200): 2,
+    ("POST", "/auth/login", 200): 1,
+    ("GET", "/get_user_by_phone", 200): 1,
+    ("GET", "/auth/me", 200): 1,
+    ("GET", "/meetings", 200): 3,  # 목록 + 다음 페이지 확인 (+ include=participants면 참가자 IN 조회 1번)
+    ("GET", "/meetings_list", 200): 1,
+    ("GET", "/dashboard", 200): 2,  # 회원 한 페이지 + 통계 롤업
+    ("GET", "/admin/dashboard/users", 200): 1,
+    ("GET", "/admin/dashboard/stats", 200): 1,
+    ("POST", "/meetings/register", 201): 4,
+    ("POST", "/meetings/register", 202): 13,  # 좌석 확보 실패 → 원인 확인 → 대기 순번 → 승격 확인 → 순번 조회
+    ("GET", "/meetings/{meeting_id}/waitlist/position", 200): 4,
+    ("POST", "/meetings/cancel", 200): 9,
+    ("POST", "/meetings/register_interest", 201): 4,
+    ("POST", "/auth/kakao", 200): 4,  # 방문 횟수 구간이 바뀌면 (1 → 2-4) 통계 롤업 UPSERT 1번
+}
+
+
+@pytest.fixture
+def seeded(session_factory):
+    db = session_factory()
+    now = datetime.utcnow()
+    users = [make_user(db, i) for i in range(1, 9)]
+    users.append(make_user(db, 90, phone_number=None, social_provider="kakao", social_id="kakao-90"))
+    past = [Meeting(title=f"Past {i}", date_time=now - timedelta(days=i), location="Seoul", capacity=10,
+                    confirmed_count=6) for i in range(1, 4)]
+    upcoming = [Meeting(title=f"Meeting {i}", date_time=now + timedelta(days=i), location="Seoul", capacity=2)
+                for i in range(1, 6)]
+    db.add_all(past + upcoming)
+    db.add(VerificationCode(phone_number="010-0000-0008", code="123456", created_at=now,
+                            expires_at=now + timedelta(minutes=5)))
+    db.flush()
+    db.add_all(UserMeeting(user_id=user.id, meeting_id=meeting.id, status=STATUS_CONFIRMED,
+                           registered_at=now - timedelta(days=10))
+               for meeting in past for user in users[:6])
+    db.commit()
+    result = SimpleNamespace(users=[SimpleNamespace(id=u.id, phone_number=u.phone_number) for u in users],
+                             upcoming=[m.id for m in upcoming])
+    db.close()
+    return result
+
+
+def cold_auth(user) -> dict:
+    """인증 캐시를 비운 토큰 헤더 (예산은 사용자 조회가 포함된 최악의 경우 기준)"""
+    principal_cache.clear()
+    return auth_headers(user)
+
+
+def exercise(client, seeded, monkeypatch):
+    first, second, third = seeded.users[:3]
+    meeting_id = seeded.upcoming[0]
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+
+    client.post("/sms/request", json={"phone_number": "010-0000-0009"})
+    client.post("/sms/verify", json={"phone_number": "010-0000-0008", "code": "123456"})
+    client.post("/auth/login", json={"phone_number": first.phone_number})
+    client.get("/get_user_by_phone", params={"phone_number": first.phone_number})
+    client.get("/auth/me", headers=cold_auth(first))
+    response = client.get("/meetings", params={"limit": 2, "when": "upcoming"})
+    client.get("/meetings", params={"limit": 2, "when": "upcoming", "cursor": response.headers["X-Next-Cursor"]})
+    client.get("/meetings", params={"limit": 3, "when": "past", "include": "participants"})
+    client.get("/meetings_list")
+    client.get("/dashboard", headers={"X-Admin-Code": "admin-secret"})
+    response = client.get("/admin/dashboard/users", params={"limit": 3}, headers={"X-Admin-Code": "admin-secret"})
+    client.get("/admin/dashboard/users", params={"limit": 3, "cursor": response.headers["X-Next-Cursor"]},
+               headers={"X-Admin-Code": "admin-secret"})
+    client.get("/admin/dashboard/users", params={"q": "010-0000", "sort": "total_visits"},
+               headers={"X-Admin-Code": "admin-secret"})
+    client.get("/admin/dashboard/stats", headers={"X-Admin-Code": "admin-secret"})
+    for user in (first, second, third):
+        client.post(f"/meetings/register?meeting_id={meeting_id}", headers=cold_auth(user))
+    client.get(f"/meetings/{meeting_id}/waitlist/position", headers=cold_auth(third))
+    client.post(f"/meetings/cancel?meeting_id={meeting_id}", headers=cold_auth(first))
+    client.post(f"/meetings/register_interest?meeting_id={seeded.upcoming[1]}", headers=cold_auth(first))
+
+    async def kakao_user(access_token):
+        return {"id": "kakao-90", "email": None, "name": "Kakao User"}
+
+    monkeypatch.setattr(main, "get_kakao_user_info", kakao_user)
+    client.post("/auth/kakao", json={"access_token": "token"})
+
+
+def test_endpoint_query_budgets(client, seeded, monkeypatch):
+    with capture_query_reports() as reports:
+        exercise(client, seeded, monkeypatch)
+
+    failures, seen = [], set()
+    for report in reports:
+        key = (report.method, report.route, report.status)
+        if key not in BUDGETS:
+            continue
+        seen.add(key)
+        try:
+            check_query_budget(report, BUDGETS[key])
+        except QueryBudgetExceeded as error:
+            failures.append(str(error))
+    assert not failures, "\n\n".join(failures)
+    assert seen == set(BUDGETS), f"not exercised: {sorted(set(BUDGETS) - seen)}"
+
+
+def test_lazy_relationship_loop_is_flagged(client, seeded, session_factory):
+    """Meeting.participants를 모임마다 lazy load하면 같은 SELECT가 반복됨"""
+    db = session_factory()
+    with track_queries() as tracker:
+        meetings = db.scalars(select(Meeting).where(Meeting.confirmed_count > 0)).all()
+        for meeting in meetings:
+            len(meeting.participants)
+    db.close()
+
+    assert tracker.count == 4
+    [(statement, count)] = tracker.repeated()
+    assert count == 3 and "FROM user_meetings" in statement
+
+    report = QueryReport("GET", "/x", "/x", 200, tracker.count, tracker.seconds * 1000, tracker.repeated())
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        check_query_budget(report, max_queries=10)
+    with pytest.raises(QueryBudgetExceeded, match="4 queries > budget 2"):
+        check_query_budget(report, max_queries=2, allow_repeats=True)
+    check_query_budget(report, max_queries=4, allow_repeats=True)
+
+
+def test_middleware_reports_n_plus_one(session_factory, seeded, caplog):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.add_middleware(QueryTrackingMiddleware)
+
+    @app.get("/users/{user_id}")
+    def user_meetings(user_id: int):  # 스레드 풀에서 실행되어도 같은 tracker에 기록
+        db = session_factory()
+        try:
+            registrations = db.scalars(select(UserMeeting).where(UserMeeting.user_id == user_id)).all()
+            return [registration.meeting.title for registration in registrations]  # 모임을 하나씩 lazy load
+        finally:
+            db.close()
+
+    with capture_query_reports() as reports, caplog.at_level("WARNING", logger="seoulchess.sql"):
+        assert len(TestClient(app).get(f"/users/{seeded.users[0].id}").json()) == 3
+
+    [report] = reports
+    assert report.route == "/users/{user_id}" and report.queries == 4 and report.repeated[0][1] == 3
+    assert "Possible N+1" in caplog.text
+    rendered = REGISTRY.render()
+    assert 'db_n_plus_one_total{route="/users/{user_id}"}' in rendered
+    assert 'db_queries_per_request_count{route="/users/{user_id}"}' in rendered
+
+
+def test_untracked_queries_are_ignored(session_factory):
+    db = session_factory()
+    db.execute(text("SELECT 1"))  # tracker 없음: 기록하지 않음
+    with track_queries() as tracker:
+        db.scalar(select(User.id).limit(1))
+        with pytest.raises(Exception):
+            db.execute(text("SELECT * FROM missing"))
+    db.close()
+    assert tracker.count == 2 and len(tracker.statements) == 2
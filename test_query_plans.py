@@ -0,0 +1,224 @@
+"""
+핫 쿼리 실행 계획 (EXPLAIN) 테스트
+
+main.py의 주요 엔드포인트를 실제로 호출하면서 실행된 SQL을 모두 수집하고,
+각 SELECT/UPDATE/DELETE를 EXPLAIN하여 테이블 전체 스캔이나 정렬용 임시 B-tree 없이
+인덱스를 사용하는지 확인합니다.
+
+- SQLite: 항상 실행 (EXPLAIN QUERY PLAN)
+- PostgreSQL: TEST_POSTGRES_URL이 설정된 경우에만 실행 (enable_seqscan=off 상태의 EXPLAIN)
+"""
+import asyncio
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import main
+from auth import principal_cache
+from code_sweeper import delete_expired_codes
+from conftest import auth_headers, make_user
+from database import Base, Meeting, VerificationCode, get_async_db, get_db
+from db_backends import create_async_db_engine, create_db_engine
+from http_cache import response_cache
+from rate_limit import get_rate_limiter
+
+TABLES = set(Base.metadata.tables)
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def sqlite_plan_problems(rows):
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        match = _SQLITE_FULL_SCAN.match(detail)
+        if match and match.group(1) in TABLES:
+            problems.append(detail)
+        if "TEMP B-TREE FOR ORDER BY" in detail:
+            problems.append(detail)
+    return problems
+
+
+def postgres_plan_problems(plan):
+    problems = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in TABLES:
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        if node.get("Node Type") == "Sort" and node.get("Sort Key") and "Plans" in node:
+            if any(child.get("Relation Name") in TABLES for child in node["Plans"]):
+                problems.append(f"Sort {node['Sort Key']}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return problems
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path}/plans.db"
+    else:
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+
+    engine = create_db_engine(url)
+    async_engine = create_async_db_engine(url, poolclass=NullPool)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield request.param, engine, async_engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+
+def seed(session_factory):
+    db = session_factory()
+    now = datetime.utcnow()
+    users = [make_user(db, i) for i in range(1, 6)]
+    users.append(make_user(db, 90, phone_number=None, social_provider="kakao", social_id="kakao-90"))
+    meetings = [
+        Meeting(title=f"Meeting {i}", date_time=now + timedelta(days=i), location="Seoul", capacity=2)
+        for i in range(-3, 6)
+    ]
+    db.add_all(meetings)
+    db.add(VerificationCode(phone_number="010-0000-0001", code="123456", created_at=now - timedelta(minutes=1),
+                            expires_at=now + timedelta(minutes=4)))
+    db.commit()
+    upcoming = [meeting.id for meeting in meetings if meeting.date_time > now]
+    users = [SimpleNamespace(id=user.id, phone_number=user.phone_number) for user in users]
+    db.close()
+    return users, upcoming
+
+
+def exercise_hot_endpoints(client, users, meeting_ids, monkeypatch):
+    """main.py의 핫 경로를 한 번씩 호출"""
+    first, second, third = users[0], users[1], users[2]
+    meeting_id = meeting_ids[0]
+
+    assert client.post("/sms/request", json={"phone_number": "010-0000-0002"}).status_code == 200
+    assert client.post("/sms/verify", json={"phone_number": "010-0000-0001", "code": "123456"}).status_code == 200
+    assert client.post("/auth/login", json={"phone_number": first.phone_number}).status_code == 200
+    client.get("/get_user_by_phone", params={"phone_number": first.phone_number})
+    client.get("/auth/me", headers=auth_headers(first))
+
+    response = client.get("/meetings", params={"limit": 2, "when": "upcoming"})
+    client.get("/meetings", params={"limit": 2, "when": "upcoming", "cursor": response.headers["X-Next-Cursor"]})
+    client.get("/meetings", params={"limit": 2, "when": "past", "include": "participants"})
+    client.get("/meetings_list")
+
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    admin = {"X-Admin-Code": "admin-secret"}
+    for sort in ("created_at", "total_visits"):
+        for order in ("desc", "asc"):
+            params = {"limit": 2, "sort": sort, "order": order}
+            response = client.get("/admin/dashboard/users", params=params, headers=admin)
+            client.get("/admin/dashboard/users", params={**params, "cursor": response.headers["X-Next-Cursor"]},
+                       headers=admin)
+    client.get("/admin/dashboard/stats", headers=admin)
+
+    statuses = [
+        client.post(f"/meetings/register?meeting_id={meeting_id}", headers=auth_headers(user)).status_code
+        for user in (first, second, third)
+    ]
+    assert statuses == [201, 201, 202]  # 정원 2명: 세 번째는 대기
+    client.get(f"/meetings/{meeting_id}/waitlist/position", headers=auth_headers(third))
+    client.post(f"/meetings/cancel?meeting_id={meeting_id}", headers=auth_headers(first))  # 대기자 승격
+    client.post(f"/meetings/register_interest?meeting_id={meeting_ids[1]}", headers=auth_headers(first))
+    client.post(f"/meetings/register?meeting_id={meeting_id}", headers=auth_headers(first))  # 취소 후 재신청
+
+    async def kakao_user(access_token):
+        return {"id": "kakao-90", "email": None, "name": "Kakao User"}
+
+    monkeypatch.setattr(main, "get_kakao_user_info", kakao_user)
+    assert client.post("/auth/kakao", json={"access_token": "token"}).status_code == 200
+
+
+def test_hot_queries_use_indexes(backend, monkeypatch):
+    name, engine, async_engine = backend
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    users, meeting_ids = seed(session_factory)
+
+    captured = []
+
+    def capture(source):
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                captured.append((source, statement, parameters))
+        return before_cursor_execute
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    sync_listener, async_listener = capture("sync"), capture("async")
+    event.listen(engine, "before_cursor_execute", sync_listener)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", async_listener)
+    main.app.dependency_overrides[get_db] = override_get_db
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    response_cache.clear()
+    principal_cache.clear()
+    asyncio.run(get_rate_limiter().clear())
+    try:
+        exercise_hot_endpoints(TestClient(main.app), users, meeting_ids, monkeypatch)
+        session = session_factory()
+        delete_expired_codes(session)  # 백그라운드 만료 코드 정리
+        session.close()
+    finally:
+        main.app.dependency_overrides.clear()
+        event.remove(engine, "before_cursor_execute", sync_listener)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", async_listener)
+
+    assert len(captured) > 30
+    failures = []
+
+    if name == "sqlite":
+        with engine.connect() as conn:
+            for _, statement, parameters in captured:
+                rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+                problems = sqlite_plan_problems(rows)
+                if problems:
+                    failures.append((" ".join(statement.split()), problems))
+    else:
+        async def explain_async(statements):
+            plans = []
+            async with async_engine.connect() as conn:
+                await conn.exec_driver_sql("SET enable_seqscan = off")
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                    plans.append(result.scalar())
+            return plans
+
+        async_statements = [(s, p) for source, s, p in captured if source == "async"]
+        plans = asyncio.run(explain_async(async_statements))
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            for source, statement, parameters in captured:
+                if source == "sync":
+                    plans.append(conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar())
+        statements = async_statements + [(s, p) for source, s, p in captured if source == "sync"]
+        for (statement, _), plan in zip(statements, plans):
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            problems = postgres_plan_problems(plan)
+            if problems:
+                failures.append((" ".join(statement.split()), problems))
+
+    assert not failures, "\n".join(f"{problems}: {statement}" for statement, problems in failures)
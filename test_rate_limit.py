@@ -0,0 +1,256 @@
+"""
+레이트 리밋 / OTP 시도 제한 테스트
+
+백엔드 테스트는 프로세스 내 백엔드와 Redis 백엔드(로컬 대역 FakeRedis) 모두에 대해 실행합니다.
+"""
+import asyncio
+import fnmatch
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from starlette.requests import Request
+
+import main
+from database import VerificationCode
+from rate_limit import MemoryBackend, RateLimiter, RedisBackend, client_ip
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """redis.asyncio.Redis의 사용 부분만 흉내 낸 로컬 대역 (값은 bytes로 반환)"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values = {}
+        self.expires = {}
+        self.closed = False
+
+    def _expire_if_needed(self, key):
+        if key in self.expires and self.expires[key] <= self.clock() * 1000:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+
+    async def set(self, key, value, nx=False, px=None):
+        self._expire_if_needed(key)
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        if px is not None:
+            self.expires[key] = self.clock() * 1000 + px
+        return True
+
+    async def incr(self, key):
+        self._expire_if_needed(key)
+        value = int(self.values.get(key, b"0")) + 1
+        self.values[key] = str(value).encode()
+        return value
+
+    async def get(self, key):
+        self._expire_if_needed(key)
+        return self.values.get(key)
+
+    async def pttl(self, key):
+        self._expire_if_needed(key)
+        if key not in self.values:
+            return -2
+        if key not in self.expires:
+            return -1
+        return int(self.expires[key] - self.clock() * 1000)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.values):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture(params=["memory", "redis"])
+def limiter(request):
+    clock = FakeClock()
+    if request.param == "memory":
+        backend = MemoryBackend(clock=clock)
+    else:
+        backend = RedisBackend(FakeRedis(clock))
+    limiter = RateLimiter(backend, clock=clock)
+    limiter.fake_clock = clock
+    return limiter
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_cooldown(limiter):
+    assert run(limiter.cooldown("sms:010", 30)).allowed
+    denied = run(limiter.cooldown("sms:010", 30))
+    assert not denied.allowed and denied.retry_after_seconds == 30
+
+    limiter.fake_clock.now += 12
+    assert run(limiter.cooldown("sms:010", 30)).retry_after_seconds == 18
+    assert run(limiter.cooldown("sms:other", 30)).allowed
+
+    limiter.fake_clock.now += 18
+    assert run(limiter.cooldown("sms:010", 30)).allowed
+
+
+def test_release_cooldown(limiter):
+    run(limiter.cooldown("sms:010", 30))
+    run(limiter.release_cooldown("sms:010"))
+    assert run(limiter.cooldown("sms:010", 30)).allowed
+
+
+def test_sliding_window(limiter):
+    clock = limiter.fake_clock
+    clock.now = 3600 * 1000  # 윈도우 시작
+    assert all(run(limiter.hit("ip:1", 3, 3600)).allowed for _ in range(3))
+    assert not run(limiter.hit("ip:1", 3, 3600)).allowed
+
+    # 다음 윈도우 시작 직후: 이전 윈도우 카운트(4)가 거의 그대로 반영되어 계속 거부
+    clock.now += 3600 + 60
+    assert not run(limiter.hit("ip:1", 3, 3600)).allowed
+
+    # 다음 윈도우의 3/4 지점: 이전 4회 * 0.25 + 현재 1~2회 → 허용
+    clock.now += 2640
+    assert run(limiter.hit("ip:1", 3, 3600)).allowed
+
+
+def test_verify_attempts_cap_and_reset(limiter):
+    assert all(run(limiter.verify_attempt("010", max_attempts=3)).allowed for _ in range(3))
+    denied = run(limiter.verify_attempt("010", max_attempts=3))
+    assert not denied.allowed and 0 < denied.retry_after <= 300
+
+    run(limiter.reset_attempts("010"))
+    assert run(limiter.verify_attempt("010", max_attempts=3)).allowed
+
+
+def test_clear(limiter):
+    run(limiter.cooldown("sms:010", 30))
+    run(limiter.clear())
+    assert run(limiter.cooldown("sms:010", 30)).allowed
+
+
+def test_memory_backend_is_bounded():
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=10, clock=clock)
+    for i in range(50):
+        run(backend.incr(f"key:{i}", ttl=60 + i))
+    assert len(backend) <= 10
+    assert run(backend.get("key:49")) == 1  # 가장 최근에 만든 키는 남음
+
+
+def test_memory_backend_evicts_counters_before_cooldown_and_otp_keys():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBackend(max_keys=10, clock=clock), clock=clock)
+    run(limiter.cooldown("sms:010", 30))
+    for _ in range(5):
+        run(limiter.verify_attempt("010"))  # 시도 한도 소진
+
+    # 다른 IP들의 윈도우 카운터가 몰려도 쿨다운 / 시도 카운터는 밀려나지 않음
+    for i in range(100):
+        assert run(limiter.hit(f"sms:ip:10.0.0.{i}", 20, 3600)).allowed
+    assert len(limiter.backend) <= 10
+    assert not run(limiter.cooldown("sms:010", 30)).allowed
+    assert not run(limiter.verify_attempt("010")).allowed
+
+
+def test_memory_backend_fails_closed_when_full_of_protected_keys():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBackend(max_keys=3, clock=clock), clock=clock)
+    for i in range(3):
+        assert run(limiter.cooldown(f"sms:01{i}", 30)).allowed
+
+    # 자리를 만들려고 기존 쿨다운을 지우지 않고 새 요청을 거부
+    assert not run(limiter.cooldown("sms:019", 30)).allowed
+    assert not run(limiter.verify_attempt("019")).allowed
+    assert not run(limiter.hit("sms:ip:10.0.0.1", 20, 3600)).allowed
+    assert not run(limiter.cooldown("sms:010", 30)).allowed
+
+    clock.now += 31  # 만료된 키는 정리되어 다시 허용
+    assert run(limiter.cooldown("sms:019", 30)).allowed
+
+
+def test_client_ip_uses_last_forwarded_hop():
+    def make_request(headers):
+        return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+                        "client": ("10.0.0.1", 1234)})
+
+    assert client_ip(make_request({})) == "10.0.0.1"
+    # 클라이언트가 보낸 값(앞쪽)은 위조 가능하므로 프록시가 붙인 마지막 값을 사용
+    assert client_ip(make_request({"X-Forwarded-For": "1.1.1.1, 203.0.113.7"})) == "203.0.113.7"
+
+
+# --------------------
+# 엔드포인트
+# --------------------
+@pytest.fixture
+def statements(async_session_factory):
+    """비동기 엔진에서 실행된 SQL 목록"""
+    engine = async_session_factory.kw["bind"].sync_engine
+    captured = []
+
+    def listener(conn, cursor, statement, *args):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    yield captured
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_sms_request_limits_reject_without_database(client, statements, monkeypatch):
+    monkeypatch.setattr(main, "SMS_REQUEST_IP_LIMIT", 2)
+
+    assert client.post("/sms/request", json={"phone_number": "010-4000-0001"}).status_code == 200
+    response = client.post("/sms/request", json={"phone_number": "010-4000-0001"})
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 30
+
+    assert client.post("/sms/request", json={"phone_number": "010-4000-0002"}).status_code == 429  # IP 한도
+    executed = len(statements)
+    assert client.post("/sms/request", json={"phone_number": "010-4000-0003"}).status_code == 429
+    assert len(statements) == executed  # 거부된 요청은 DB를 건드리지 않음
+
+
+def test_sms_request_per_ip_uses_forwarded_for(client, monkeypatch):
+    monkeypatch.setattr(main, "SMS_REQUEST_IP_LIMIT", 1)
+    assert client.post("/sms/request", json={"phone_number": "010-4100-0001"},
+                       headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 200
+    assert client.post("/sms/request", json={"phone_number": "010-4100-0002"},
+                       headers={"X-Forwarded-For": "203.0.113.2"}).status_code == 200
+    assert client.post("/sms/request", json={"phone_number": "010-4100-0003"},
+                       headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 429
+
+
+def test_sms_verify_attempt_cap(client, db, statements):
+    phone = "010-4200-0001"
+    now = datetime.utcnow()
+    db.add(VerificationCode(phone_number=phone, code="654321", created_at=now, expires_at=now + timedelta(minutes=5)))
+    db.commit()
+
+    for _ in range(5):
+        assert client.post("/sms/verify", json={"phone_number": phone, "code": "000000"}).status_code == 400
+
+    executed = len(statements)
+    response = client.post("/sms/verify", json={"phone_number": phone, "code": "654321"})
+    assert response.status_code == 429
+    assert len(statements) == executed
+
+    # 새 코드를 발급받으면 시도 횟수 초기화
+    assert client.post("/sms/request", json={"phone_number": phone}).status_code == 200
+    db.expire_all()
+    code = db.query(VerificationCode).filter(VerificationCode.phone_number == phone).one().code
+    assert client.post("/sms/verify", json={"phone_number": phone, "code": code}).status_code == 200
@@ -0,0 +1,145 @@
+"""
+구조화된 요청 로그 미들웨어 테스트
+"""
+import io
+import json
+import logging
+import queue
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from conftest import auth_headers, make_user
+from request_logging import REDACTED, LogPipeline, NonBlockingQueueHandler, RequestLoggingMiddleware, access_logger
+
+
+@pytest.fixture
+def log_output():
+    """전용 logger + StringIO로 흘려보내는 파이프라인 (lines()는 리스너를 멈춰 남은 로그를 비운 뒤 파싱)"""
+    logger = logging.getLogger("seoulchess.test_access")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stream = io.StringIO()
+    pipeline = LogPipeline(logger=logger, stream=stream)
+    pipeline.start()
+
+    def lines():
+        pipeline.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    lines.logger = logger
+    yield lines
+    pipeline.stop()
+
+
+def make_app(logger, **kwargs):
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, logger=logger, **kwargs)
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def test_request_is_logged_as_json_with_redacted_headers(log_output):
+    client = TestClient(make_app(log_output.logger))
+    response = client.get("/ok?token=secret-query", headers={
+        "Authorization": "Bearer secret-token", "Cookie": "session=abc", "X-Admin-Code": "1234",
+        "User-Agent": "pytest", "X-Forwarded-For": "203.0.113.9",
+    })
+    assert response.status_code == 200
+
+    [entry] = log_output()
+    assert entry["event"] == "request" and entry["level"] == "INFO"
+    assert entry["method"] == "GET" and entry["path"] == "/ok" and entry["status"] == 200
+    assert entry["duration_ms"] >= entry["ttfb_ms"] >= 0
+    assert entry["response_bytes"] == len(response.content)
+    assert entry["client"] == "203.0.113.9"
+    assert entry["headers"]["user-agent"] == "pytest"
+    for name in ("authorization", "cookie", "x-admin-code"):
+        assert entry["headers"][name] == REDACTED
+    raw = json.dumps(entry)
+    assert "secret-token" not in raw and "session=abc" not in raw and "secret-query" not in raw
+
+
+def test_sampling_keeps_errors_and_slow_requests(log_output):
+    client = TestClient(make_app(log_output.logger, sample_rate=0.0, slow_request_ms=1e9), raise_server_exceptions=False)
+    for _ in range(5):
+        client.get("/ok")
+    client.get("/missing")
+    client.get("/boom")
+
+    entries = log_output()
+    assert [(e["path"], e["status"], e["level"]) for e in entries] == [("/boom", 500, "ERROR")]
+    assert "RuntimeError: boom" in entries[0]["exc"]
+
+
+def test_slow_requests_are_always_logged(log_output):
+    client = TestClient(make_app(log_output.logger, sample_rate=0.0, slow_request_ms=0))
+    client.get("/ok")
+    [entry] = log_output()
+    assert entry["level"] == "WARNING" and entry["sample_rate"] == 1.0
+
+
+def test_partial_sampling_records_rate(log_output):
+    values = iter([0.05, 0.5, 0.05, 0.9])
+    app = make_app(log_output.logger, sample_rate=0.1, rand=lambda: next(values))
+    client = TestClient(app)
+    for _ in range(4):
+        client.get("/ok")
+    entries = log_output()
+    assert len(entries) == 2 and all(e["sample_rate"] == 0.1 for e in entries)
+
+
+def test_skip_paths_and_headers_opt_out(log_output):
+    client = TestClient(make_app(log_output.logger, include_headers=False))
+    client.get("/health")
+    client.get("/ok")
+    [entry] = log_output()
+    assert entry["path"] == "/ok" and "headers" not in entry
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=2)
+    logger = logging.getLogger("seoulchess.test_drop")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("message %d", i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
+    # 포맷은 리스너 스레드에서: 큐에 든 레코드는 원래 인자를 그대로 가짐
+    assert handler.queue.get_nowait().args == (0,)
+
+
+def test_app_logs_requests_without_credentials(client, db):
+    headers = auth_headers(make_user(db))
+    stream = io.StringIO()
+    pipeline = LogPipeline(logger=access_logger, stream=stream)
+    pipeline.start()
+    try:
+        client.get("/meetings", headers=headers)
+    finally:
+        pipeline.stop()
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["path"] for e in entries] == ["/meetings"]
+    assert entries[0]["headers"]["authorization"] == REDACTED
+    assert headers["Authorization"] not in stream.getvalue()
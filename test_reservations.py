@@ -0,0 +1,245 @@
+"""
+모임 좌석 예약 엔진 (reservations.py) 테스트
+
+동시 신청 부하 테스트는 스레드마다 별도 세션으로 reserve_seat를 호출하여
+정원을 초과해 등록되지 않는지 확인합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import auth_headers, make_user
+from database import Meeting, User, UserMeeting
+from reservations import (
+    STATUS_CANCELLED, STATUS_CONFIRMED, STATUS_PENDING, STATUS_WAITLISTED,
+    cancel_registration, get_waitlist_position, reserve_seat,
+)
+
+
+def make_meeting(db, capacity: int) -> Meeting:
+    meeting = Meeting(
+        title="Friday Blitz",
+        date_time=datetime.utcnow() + timedelta(days=3),
+        location="Gangnam",
+        capacity=capacity,
+    )
+    db.add(meeting)
+    db.commit()
+    db.refresh(meeting)
+    return meeting
+
+
+def test_reserve_updates_counter_and_rejects_when_full(db):
+    meeting = make_meeting(db, capacity=1)
+    first, second = make_user(db, 1), make_user(db, 2)
+
+    registration, reactivated = reserve_seat(db, first.id, meeting.id)
+    assert registration.status == STATUS_CONFIRMED and not reactivated
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserve_seat(db, second.id, meeting.id)
+    assert exc_info.value.status_code == 403
+
+    db.refresh(meeting)
+    assert meeting.confirmed_count == 1
+
+
+def test_duplicate_missing_and_reactivation(db):
+    meeting = make_meeting(db, capacity=5)
+    user = make_user(db)
+    registration, _ = reserve_seat(db, user.id, meeting.id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserve_seat(db, user.id, meeting.id)
+    assert exc_info.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserve_seat(db, user.id, 9999)
+    assert exc_info.value.status_code == 404
+
+    # 취소된 기록은 좌석을 다시 확보하며 재활성화됨
+    registration.status = STATUS_CANCELLED
+    meeting.confirmed_count = 0
+    db.commit()
+    registration, reactivated = reserve_seat(db, user.id, meeting.id)
+    assert reactivated and registration.status == STATUS_CONFIRMED
+    db.refresh(meeting)
+    assert meeting.confirmed_count == 1
+    assert db.query(UserMeeting).count() == 1
+
+
+def test_pending_counts_against_combined_capacity(db):
+    meeting = make_meeting(db, capacity=2)
+    users = [make_user(db, i) for i in range(3)]
+    reserve_seat(db, users[0].id, meeting.id, STATUS_CONFIRMED)
+    reserve_seat(db, users[1].id, meeting.id, STATUS_PENDING)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserve_seat(db, users[2].id, meeting.id, STATUS_PENDING)
+    assert exc_info.value.status_code == 403
+
+    db.refresh(meeting)
+    assert (meeting.confirmed_count, meeting.pending_count) == (1, 1)
+
+
+def test_concurrent_signup_rush_never_oversells(session_factory):
+    capacity, applicants = 25, 300
+    setup = session_factory()
+    meeting_id = make_meeting(setup, capacity=capacity).id
+    setup.add_all(
+        User(name=f"U{i}", phone_number=f"010-9{i:07d}", email=f"rush{i}@example.com",
+             gender="OTHER", chess_experience="KNOW_RULES_ONLY")
+        for i in range(applicants)
+    )
+    setup.commit()
+    user_ids = [user_id for (user_id,) in setup.query(User.id).all()]
+    setup.close()
+
+    def register(user_id):
+        session = session_factory()
+        try:
+            reserve_seat(session, user_id, meeting_id)
+            return 201
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            session.close()
+
+    # 같은 사용자가 두 번씩 동시에 신청하는 경우도 섞음
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(register, user_ids + user_ids[:50]))
+
+    check = session_factory()
+    meeting = check.query(Meeting).filter(Meeting.id == meeting_id).one()
+    confirmed_rows = check.query(UserMeeting).filter(
+        UserMeeting.meeting_id == meeting_id,
+        UserMeeting.status == STATUS_CONFIRMED
+    ).count()
+    check.close()
+
+    assert results.count(201) == capacity
+    assert confirmed_rows == capacity
+    assert meeting.confirmed_count == capacity
+    assert set(results) <= {201, 403, 409}
+
+
+def test_register_endpoint(client, session_factory):
+    db = session_factory()
+    meeting = make_meeting(db, capacity=1)
+    first, second = make_user(db, 1), make_user(db, 2)
+    headers_first, headers_second = auth_headers(first), auth_headers(second)
+    meeting_id = meeting.id
+    db.close()
+
+    response = client.post(f"/meetings/register?meeting_id={meeting_id}", headers=headers_first)
+    assert response.status_code == 201
+    assert response.json()["status"] == STATUS_CONFIRMED
+
+    assert client.post(f"/meetings/register?meeting_id={meeting_id}", headers=headers_first).status_code == 409
+    assert client.post(f"/meetings/register_interest?meeting_id={meeting_id}", headers=headers_second).status_code == 403
+
+
+# --------------------
+# 대기자 명단 (Waitlist)
+# --------------------
+def test_full_meeting_waitlists_and_cancellation_promotes_next(db):
+    meeting = make_meeting(db, capacity=1)
+    users = [make_user(db, i) for i in range(4)]
+    reserve_seat(db, users[0].id, meeting.id, waitlist=True)
+
+    second, _ = reserve_seat(db, users[1].id, meeting.id, waitlist=True)
+    third, _ = reserve_seat(db, users[2].id, meeting.id, waitlist=True)
+    assert second.status == third.status == STATUS_WAITLISTED
+    assert get_waitlist_position(db, users[2].id, meeting.id)[1:] == (2, 2)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserve_seat(db, users[1].id, meeting.id, waitlist=True)
+    assert exc_info.value.status_code == 409
+
+    # 대기자 취소는 승격을 일으키지 않음
+    _, promoted = cancel_registration(db, users[1].id, meeting.id)
+    assert promoted is None
+    assert get_waitlist_position(db, users[2].id, meeting.id)[1:] == (1, 1)
+
+    # 확정자 취소 -> 다음 대기자 승격, 확정 인원은 그대로
+    cancelled, promoted = cancel_registration(db, users[0].id, meeting.id)
+    assert cancelled.status == STATUS_CANCELLED
+    assert promoted.user_id == users[2].id and promoted.status == STATUS_CONFIRMED
+    assert promoted.waitlist_position is None
+    db.refresh(meeting)
+    assert meeting.confirmed_count == 1
+
+    # 취소했던 사용자가 다시 신청하면 대기열 맨 뒤로
+    registration, reactivated = reserve_seat(db, users[0].id, meeting.id, waitlist=True)
+    assert reactivated and registration.status == STATUS_WAITLISTED
+
+
+def test_cancel_without_registration_is_404(db):
+    meeting = make_meeting(db, capacity=1)
+    user = make_user(db)
+    with pytest.raises(HTTPException) as exc_info:
+        cancel_registration(db, user.id, meeting.id)
+    assert exc_info.value.status_code == 404
+
+
+def test_concurrent_cancellations_promote_in_order(session_factory):
+    capacity, applicants = 10, 40
+    setup = session_factory()
+    meeting_id = make_meeting(setup, capacity=capacity).id
+    user_ids = [make_user(setup, i).id for i in range(applicants)]
+    setup.close()
+
+    for user_id in user_ids:
+        session = session_factory()
+        reserve_seat(session, user_id, meeting_id, waitlist=True)
+        session.close()
+
+    def cancel(user_id):
+        session = session_factory()
+        try:
+            cancel_registration(session, user_id, meeting_id)
+        finally:
+            session.close()
+
+    # 확정자 전원이 동시에 취소
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        list(pool.map(cancel, user_ids[:capacity]))
+
+    check = session_factory()
+    confirmed = [
+        user_id for (user_id,) in check.query(UserMeeting.user_id).filter(
+            UserMeeting.meeting_id == meeting_id, UserMeeting.status == STATUS_CONFIRMED
+        ).all()
+    ]
+    meeting = check.query(Meeting).filter(Meeting.id == meeting_id).one()
+    check.close()
+
+    # 대기 1~10번이 정확히 승격됨
+    assert sorted(confirmed) == user_ids[capacity:2 * capacity]
+    assert meeting.confirmed_count == capacity
+
+
+def test_waitlist_endpoints(client, session_factory):
+    db = session_factory()
+    meeting_id = make_meeting(db, capacity=1).id
+    first, second = make_user(db, 1), make_user(db, 2)
+    headers_first, headers_second = auth_headers(first), auth_headers(second)
+    db.close()
+
+    assert client.post(f"/meetings/register?meeting_id={meeting_id}", headers=headers_first).status_code == 201
+    response = client.post(f"/meetings/register?meeting_id={meeting_id}", headers=headers_second)
+    assert response.status_code == 202
+    assert response.json()["status"] == STATUS_WAITLISTED
+    assert response.json()["waitlist_position"] == 1
+
+    position = client.get(f"/meetings/{meeting_id}/waitlist/position", headers=headers_second).json()
+    assert position == {"meeting_id": meeting_id, "status": STATUS_WAITLISTED, "position": 1, "waitlist_size": 1}
+
+    response = client.post(f"/meetings/cancel?meeting_id={meeting_id}", headers=headers_first)
+    assert response.status_code == 200
+    assert response.json()["waitlist_promoted"] is True
+
+    position = client.get(f"/meetings/{meeting_id}/waitlist/position", headers=headers_second).json()
+    assert position["status"] == STATUS_CONFIRMED and position["position"] is None
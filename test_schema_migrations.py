@@ -0,0 +1,160 @@
+"""
+버전 기반 스키마 마이그레이션 테스트
+
+- 빈 DB / 구버전(create_all 이전 스키마) DB 모두 최신 스키마로 올라가는지
+- 배치 백필 결과, dry-run 무변경, 멱등성, 시작 시 빠른 경로(쿼리 1회)
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, inspect
+
+from database import Base
+from db_backends import create_db_engine
+from schema_migrations import LATEST_VERSION, MIGRATIONS, current_version, ensure_schema, migrate
+
+LEGACY_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, phone_number VARCHAR UNIQUE, email VARCHAR NOT NULL UNIQUE,
+    gender VARCHAR NOT NULL, chess_experience VARCHAR NOT NULL, total_visits INTEGER, created_at DATETIME
+);
+CREATE TABLE verification_codes (
+    id INTEGER PRIMARY KEY, phone_number VARCHAR NOT NULL, code VARCHAR NOT NULL,
+    created_at DATETIME, expires_at DATETIME NOT NULL
+);
+CREATE INDEX ix_verification_codes_phone_number ON verification_codes (phone_number);
+CREATE TABLE meetings (
+    id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description VARCHAR, date_time DATETIME NOT NULL,
+    location VARCHAR NOT NULL, capacity INTEGER NOT NULL, created_at DATETIME
+);
+CREATE INDEX ix_meetings_date_time ON meetings (date_time);
+CREATE TABLE user_meetings (
+    id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id),
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id), status VARCHAR NOT NULL, registered_at DATETIME
+);
+"""
+
+
+def quiet(message):
+    pass
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/migrate.db")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """migrate_database.py 이전 스키마 + 데이터 (모임 5개, 모임마다 확정 2 / 대기 1)"""
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    created = datetime(2024, 1, 1).isoformat(sep=" ")
+    for i in range(1, 4):
+        conn.execute("INSERT INTO users (id, name, phone_number, email, gender, chess_experience) "
+                     "VALUES (?, ?, ?, ?, 'OTHER', 'KNOW_RULES_ONLY')", (i, f"User {i}", f"010-{i:08d}", f"u{i}@x.com"))
+    for meeting_id in range(1, 6):
+        conn.execute("INSERT INTO meetings (id, title, date_time, location, capacity, created_at) "
+                     "VALUES (?, ?, ?, 'Seoul', 2, ?)", (meeting_id, f"Meeting {meeting_id}", created, created))
+        for user_id, status in ((1, "CONFIRMED"), (2, "CONFIRMED"), (3, "PENDING")):
+            conn.execute("INSERT INTO user_meetings (user_id, meeting_id, status) VALUES (?, ?, ?)",
+                         (user_id, meeting_id, status))
+    conn.commit()
+    conn.close()
+
+    engine = create_db_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def schema_snapshot(engine):
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in inspector.get_table_names()
+    }
+
+
+def test_fresh_database_migrates_to_latest(engine):
+    applied = migrate(engine, log=quiet)
+
+    assert applied == [migration.version for migration in MIGRATIONS]
+    with engine.connect() as conn:
+        assert current_version(conn) == LATEST_VERSION
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+
+
+def test_legacy_database_gets_columns_indexes_and_backfill(legacy_engine):
+    migrate(legacy_engine, batch_size=2, log=quiet)
+
+    snapshot = schema_snapshot(legacy_engine)
+    meeting_columns, meeting_indexes = snapshot["meetings"]
+    assert {"confirmed_count", "pending_count", "waitlist_seq", "updated_at"} <= set(meeting_columns)
+    assert "ix_meetings_date_time_id" in meeting_indexes
+    assert "ix_meetings_date_time" not in meeting_indexes
+    assert {"social_provider", "social_id"} <= set(snapshot["users"][0])
+    assert "ix_users_social_provider_id" in snapshot["users"][1]
+    assert {"ix_verification_codes_phone_code", "ix_verification_codes_expires_at"} <= set(snapshot["verification_codes"][1])
+    assert "uq_user_meetings_user_meeting" in snapshot["user_meetings"][1]
+
+    # 배치 크기(2)보다 많은 행도 모두 백필
+    with legacy_engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT confirmed_count, pending_count, updated_at = created_at FROM meetings"
+        ).fetchall()
+    assert rows == [(2, 1, 1)] * 5
+
+    # 회원 통계 롤업: 기존 회원 재집계 (total_visits NULL은 첫 방문 구간)
+    assert {"ix_users_name", "ix_users_total_visits_id", "ix_users_created_at_id"} <= set(snapshot["users"][1])
+    with legacy_engine.connect() as conn:
+        stats = set(conn.exec_driver_sql("SELECT dimension, bucket, count FROM user_stats").fetchall())
+    assert stats == {("total", "all", 3), ("gender", "OTHER", 3), ("chess_experience", "KNOW_RULES_ONLY", 3),
+                     ("chess_rating", "UNRATED", 3), ("total_visits", "1", 3)}
+
+    # 가입일이 없던 회원도 키셋 커서로 이어지도록 created_at 백필
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM users WHERE created_at IS NULL").scalar() == 0
+
+
+def test_dry_run_changes_nothing(legacy_engine):
+    before = schema_snapshot(legacy_engine)
+    planned = migrate(legacy_engine, dry_run=True, log=quiet)
+
+    assert planned == [migration.version for migration in MIGRATIONS]
+    assert schema_snapshot(legacy_engine) == before
+    with legacy_engine.connect() as conn:
+        assert current_version(conn) == 0
+
+
+def test_target_stops_at_version(legacy_engine):
+    assert migrate(legacy_engine, target=2, log=quiet) == [1, 2]
+    assert migrate(legacy_engine, log=quiet) == [3, 4, 5, 6, 7, 8, 9]
+    assert migrate(legacy_engine, log=quiet) == []
+
+
+def test_duplicate_registrations_skip_unique_index(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user_meetings (user_id, meeting_id, status) VALUES (1, 1, 'CONFIRMED')")
+
+    messages = []
+    migrate(legacy_engine, log=messages.append)
+
+    assert "uq_user_meetings_user_meeting" not in schema_snapshot(legacy_engine)["user_meetings"][1]
+    assert any("Skipping uq_user_meetings_user_meeting" in message for message in messages)
+
+
+def test_ensure_schema_fast_path_is_single_query(engine):
+    assert ensure_schema(engine, log=quiet) == [migration.version for migration in MIGRATIONS]
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    assert ensure_schema(engine, log=quiet) == []
+    assert statements == ["SELECT MAX(version) FROM schema_version"]
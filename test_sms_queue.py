@@ -0,0 +1,197 @@
+"""
+SMS 비동기 발송 큐 테스트 (가짜 공급자 / httpx.MockTransport로 Twilio API 대체)
+"""
+import asyncio
+
+import httpx
+import pytest
+
+import sms_queue
+from database import SMSDelivery, VerificationCode
+from sms_queue import (STATUS_FAILED, STATUS_SENT, DeliveryRecorder, FakeProvider, SMSDeliveryError, SMSQueue,
+                       SMSQueueFull, TwilioProvider)
+
+
+class FlakyProvider(FakeProvider):
+    """처음 failures번은 지정한 오류로 실패"""
+
+    def __init__(self, failures: int, retryable: bool = True, **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.failures = failures
+        self.retryable = retryable
+
+    async def send(self, to, body):
+        if self.failures > 0:
+            self.failures -= 1
+            self.calls += 1
+            raise SMSDeliveryError("temporary failure", retryable=self.retryable)
+        return await super().send(to, body)
+
+
+def make_queue(session_factory, provider, **kwargs):
+    recorder = DeliveryRecorder(session_factory, batch_size=kwargs.pop("batch_size", 100), flush_interval=0.05)
+    kwargs.setdefault("backoff_base", 0.001)
+    return SMSQueue(provider=provider, recorder=recorder, **kwargs)
+
+
+def run_queue(queue, messages, timeout=5.0):
+    async def run():
+        queue.start()
+        for to, body in messages:
+            queue.enqueue(to, body)
+        assert await queue.drain(timeout)
+        await queue.stop()
+
+    asyncio.run(run())
+
+
+def deliveries(session_factory):
+    db = session_factory()
+    try:
+        return db.query(SMSDelivery).order_by(SMSDelivery.id).all()
+    finally:
+        db.close()
+
+
+def test_delivers_with_provider_concurrency_limit(session_factory):
+    provider = FakeProvider(latency=0.01, max_concurrency=3)
+    queue = make_queue(session_factory, provider, workers=8, batch_size=4)
+    run_queue(queue, [(f"+8210{i:08d}", f"code {i}") for i in range(20)])
+
+    assert len(provider.sent) == 20
+    assert provider.max_in_flight <= 3
+    assert queue.stats()["sent"] == 20 and queue.stats()["pending"] == 0
+    rows = deliveries(session_factory)
+    assert len(rows) == 20
+    assert {row.status for row in rows} == {STATUS_SENT}
+    assert all(row.provider_message_id.startswith("FAKE") for row in rows)
+    assert queue.recorder.flushes < 20  # 배치 INSERT
+
+
+def test_retries_transient_failures(session_factory):
+    provider = FlakyProvider(failures=2)
+    queue = make_queue(session_factory, provider, max_attempts=4)
+    run_queue(queue, [("+821000000001", "hello")])
+
+    [row] = deliveries(session_factory)
+    assert row.status == STATUS_SENT and row.attempts == 3 and row.error is None
+    assert queue.retries == 2
+
+
+def test_gives_up_after_max_attempts(session_factory):
+    queue = make_queue(session_factory, FlakyProvider(failures=10), max_attempts=3)
+    run_queue(queue, [("+821000000001", "hello")])
+
+    [row] = deliveries(session_factory)
+    assert row.status == STATUS_FAILED and row.attempts == 3
+    assert row.error == "temporary failure"
+
+
+def test_non_retryable_failure_is_not_retried(session_factory):
+    provider = FlakyProvider(failures=1, retryable=False)
+    queue = make_queue(session_factory, provider)
+    run_queue(queue, [("+821000000001", "hello")])
+
+    [row] = deliveries(session_factory)
+    assert row.status == STATUS_FAILED and row.attempts == 1
+    assert provider.calls == 1
+
+
+def test_queue_full(session_factory):
+    queue = make_queue(session_factory, FakeProvider(latency=0), max_size=2)
+
+    async def run():
+        queue.enqueue("+821000000001", "a")
+        queue.enqueue("+821000000002", "b")
+        with pytest.raises(SMSQueueFull):
+            queue.enqueue("+821000000003", "c")
+
+    asyncio.run(run())
+    assert queue.stats()["rejected"] == 1
+
+
+def test_stop_records_undelivered_messages_as_failed(session_factory):
+    """종료 시 큐 대기 / 재시도 대기 / 발송 중인 메시지도 FAILED로 남김"""
+    provider = FlakyProvider(failures=1)
+    provider.latency = 10  # 첫 실패 이후 발송은 종료까지 끝나지 않음
+    queue = make_queue(session_factory, provider, workers=1, backoff_base=60)
+
+    async def run():
+        queue.start()
+        queue.enqueue("+821000000001", "retrying")  # 1차 실패 → 재시도 대기
+        await asyncio.sleep(0.05)
+        queue.enqueue("+821000000002", "in flight")  # 발송 중 (워커 1개 점유)
+        queue.enqueue("+821000000003", "queued")  # 큐 대기
+        await asyncio.sleep(0.05)
+        await queue.stop(drain_timeout=0.05)
+
+    asyncio.run(run())
+    rows = deliveries(session_factory)
+    assert sorted(row.phone_number for row in rows) == ["+821000000001", "+821000000002", "+821000000003"]
+    assert {(row.status, row.error) for row in rows} == {(STATUS_FAILED, sms_queue.SHUTDOWN_ERROR)}
+    assert queue.stats()["pending"] == 0 and queue.stats()["failed"] == 3
+
+
+def test_message_body_is_not_recorded(session_factory):
+    queue = make_queue(session_factory, FakeProvider(latency=0))
+    run_queue(queue, [("+821000000001", "인증번호 [123456]")])
+    row = deliveries(session_factory)[0]
+    assert "123456" not in " ".join(str(value) for value in vars(row).values())
+
+
+def test_twilio_provider_status_mapping():
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        to = dict(httpx.QueryParams(request.content.decode()))["To"]
+        if to.endswith("1"):
+            return httpx.Response(201, json={"sid": "SM123"})
+        if to.endswith("2"):
+            return httpx.Response(503)
+        return httpx.Response(400, json={"message": "invalid number"})
+
+    provider = TwilioProvider("AC1", "secret", "+15550000000")
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), auth=("AC1", "secret"))
+
+    async def run():
+        assert await provider.send("+821000000001", "hi") == "SM123"
+        with pytest.raises(SMSDeliveryError) as retryable:
+            await provider.send("+821000000002", "hi")
+        with pytest.raises(SMSDeliveryError) as permanent:
+            await provider.send("+821000000003", "hi")
+        await provider.aclose()
+        return retryable.value, permanent.value
+
+    retryable, permanent = asyncio.run(run())
+    assert retryable.retryable and not permanent.retryable
+    assert requests[0].url.path == "/2010-04-01/Accounts/AC1/Messages.json"
+    assert requests[0].headers["Authorization"].startswith("Basic ")
+
+
+def test_sms_request_enqueues_without_sending(client, db, monkeypatch):
+    assert client.post("/sms/request", json={"phone_number": "010-5000-0001"}).status_code == 200
+
+    queue = sms_queue.get_sms_queue()
+    assert queue.stats()["enqueued"] == 1 and queue.stats()["pending"] == 1
+    message = queue._queue.get_nowait()
+    code = db.query(VerificationCode).filter(VerificationCode.phone_number == "010-5000-0001").one().code
+    assert message.to == "+821050000001"
+    assert code in message.body
+
+    import main
+
+    monkeypatch.setattr(main, "ADMIN_ACCESS_CODE", "admin-secret")
+    assert client.get("/sms/queue_stats").status_code == 401
+    assert client.get("/sms/queue_stats", headers={"X-Admin-Code": "admin-secret"}).json()["enqueued"] == 1
+
+
+def test_sms_request_returns_503_when_queue_is_full(client):
+    queue = sms_queue.get_sms_queue()
+    queue.max_size = 0
+    response = client.post("/sms/request", json={"phone_number": "010-5000-0002"})
+    assert response.status_code == 503
+
+    # 코드를 보내지 못했으므로 쿨다운(429) 없이 바로 재요청 가능
+    queue.max_size = 10
+    assert client.post("/sms/request", json={"phone_number": "010-5000-0002"}).status_code == 200
@@ -0,0 +1,194 @@
+"""
+Apple JWKS 캐시 (social_auth.JWKSCache, verify_apple_token) 테스트
+
+로컬 가짜 JWKS 서버와 테스트용 RSA 키로 Apple 네트워크 없이 검증합니다.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jwt.algorithms import RSAAlgorithm
+
+import social_auth
+from social_auth import APPLE_CLIENT_ID, APPLE_ISSUER, JWKSCache, verify_apple_token
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+
+def make_identity_token(private_key, kid, **claims):
+    payload = {"iss": APPLE_ISSUER, "aud": APPLE_CLIENT_ID, "sub": "apple-user", "exp": int(time.time()) + 600}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeJWKSHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.delay)
+        if server.fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = json.dumps({"keys": server.keys}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def jwks_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeJWKSHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.delay = 0.0
+    server.fail = False
+    server.keys = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.url = f"http://{host}:{port}/auth/keys"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def apple_jwks(jwks_server, monkeypatch):
+    cache = JWKSCache(jwks_server.url, ttl_seconds=3600, min_refresh_interval=0)
+    monkeypatch.setattr(social_auth, "_apple_jwks", cache)
+    return cache
+
+
+def test_keys_fetched_once_and_reused(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+    token = make_identity_token(private_key, "k1")
+
+    async def run():
+        for _ in range(5):
+            assert (await verify_apple_token(token))["sub"] == "apple-user"
+
+    asyncio.run(run())
+    assert jwks_server.requests == 1
+
+
+def test_unknown_kid_triggers_refresh(jwks_server, apple_jwks):
+    old_key, old_jwk = make_key("old")
+    new_key, new_jwk = make_key("new")
+    jwks_server.keys = [old_jwk]
+
+    async def run():
+        await verify_apple_token(make_identity_token(old_key, "old"))
+        jwks_server.keys = [old_jwk, new_jwk]  # Apple 키 교체
+        return await verify_apple_token(make_identity_token(new_key, "new"))
+
+    assert asyncio.run(run())["sub"] == "apple-user"
+    assert jwks_server.requests == 2
+
+
+def test_concurrent_refreshes_are_single_flight(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+    jwks_server.delay = 0.2
+    token = make_identity_token(private_key, "k1")
+
+    async def run():
+        return await asyncio.gather(*(verify_apple_token(token) for _ in range(20)))
+
+    assert len(asyncio.run(run())) == 20
+    assert jwks_server.requests == 1
+
+
+def test_unknown_kid_refresh_is_rate_limited(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+    apple_jwks.min_refresh_interval = 60
+    forged = make_identity_token(private_key, "missing")
+
+    async def run():
+        await verify_apple_token(make_identity_token(private_key, "k1"))
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_apple_token(forged)
+            assert exc_info.value.status_code == 401
+
+    asyncio.run(run())
+    assert jwks_server.requests == 1
+
+
+def test_stale_keys_survive_failed_refresh(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+    token = make_identity_token(private_key, "k1")
+
+    async def run():
+        await verify_apple_token(token)
+        apple_jwks.ttl_seconds = 0
+        jwks_server.fail = True
+        return await verify_apple_token(token)
+
+    assert asyncio.run(run())["sub"] == "apple-user"
+    assert jwks_server.requests == 2
+
+
+def test_wrong_audience_rejected(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(verify_apple_token(make_identity_token(private_key, "k1", aud="com.other.app")))
+    assert exc_info.value.status_code == 401
+
+
+def test_failed_refreshes_are_rate_limited(jwks_server, apple_jwks):
+    """갱신 실패도 시도 시각으로 기록되어 재시도 간격 동안 Apple을 다시 호출하지 않음"""
+    private_key, jwk = make_key("k1")
+    jwks_server.keys = [jwk]
+    token = make_identity_token(private_key, "k1")
+
+    async def run():
+        await verify_apple_token(token)
+        apple_jwks.ttl_seconds = 0
+        jwks_server.fail = True
+        assert (await verify_apple_token(token))["sub"] == "apple-user"  # 갱신 실패, 이전 키 사용
+        apple_jwks.min_refresh_interval = 60
+        for _ in range(5):
+            assert (await verify_apple_token(token))["sub"] == "apple-user"
+
+    asyncio.run(run())
+    assert jwks_server.requests == 2
+
+
+def test_cold_cache_failure_is_not_retried_per_request(jwks_server, apple_jwks):
+    private_key, jwk = make_key("k1")
+    jwks_server.fail = True
+    apple_jwks.min_refresh_interval = 60
+    token = make_identity_token(private_key, "k1")
+
+    async def run():
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_apple_token(token)
+            assert exc_info.value.status_code == 500
+
+    asyncio.run(run())
+    assert jwks_server.requests == 1
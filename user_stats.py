@@ -0,0 +1,182 @@
+"""
+회원 통계 롤업 (user_stats 테이블)
+
+관리자 대시보드의 성별 / 체스 경험 / 레이팅 / 방문 횟수 구간별 회원 수를
+매번 users 전체를 GROUP BY 하지 않고 작은 user_stats 테이블 한 번 조회로 가져옵니다.
+
+- ORM으로 User를 추가/수정/삭제하면 flush 직전(before_flush)에 구간 변화량을 계산하고
+  flush가 성공한 뒤(after_flush) 같은 트랜잭션에서 UPSERT (count = count + 변화량)로 반영
+  (AsyncSession도 내부적으로 동기 Session을 쓰므로 같은 리스너로 처리됨)
+- 구간이 바뀌지 않는 수정(예: total_visits 3 → 4)은 SQL을 실행하지 않음
+- Core 대량 INSERT/UPDATE나 외부 도구로 users를 바꿨다면 rebuild()로 다시 집계
+  (마이그레이션 8과 POST /admin/dashboard/stats/rebuild가 같은 SQL 사용)
+"""
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from database import User, UserStat
+
+DIMENSION_TOTAL = "total"
+DIMENSIONS = ("gender", "chess_experience", "chess_rating", "total_visits")
+UNRATED = "UNRATED"
+# (하한, 구간 이름) - 큰 구간부터
+VISIT_BUCKETS = ((10, "10+"), (5, "5-9"), (2, "2-4"))
+FIRST_VISIT = "1"
+
+_VISITS_CASE = " ".join(f"WHEN total_visits >= {low} THEN '{name}'" for low, name in VISIT_BUCKETS)
+
+# 전체 재집계 (users 한 번 스캔, 마이그레이션에서도 사용)
+REBUILD_STATEMENTS = (
+    "DELETE FROM user_stats",
+    f"""INSERT INTO user_stats (dimension, bucket, count)
+        SELECT '{DIMENSION_TOTAL}', 'all', COUNT(*) FROM users
+        UNION ALL SELECT 'gender', gender, COUNT(*) FROM users GROUP BY gender
+        UNION ALL SELECT 'chess_experience', chess_experience, COUNT(*) FROM users GROUP BY chess_experience
+        UNION ALL SELECT 'chess_rating', rating, COUNT(*) FROM (
+            SELECT COALESCE(NULLIF(chess_rating, ''), '{UNRATED}') AS rating FROM users) AS ratings GROUP BY rating
+        UNION ALL SELECT 'total_visits', visits, COUNT(*) FROM (
+            SELECT CASE {_VISITS_CASE} ELSE '{FIRST_VISIT}' END AS visits FROM users) AS visits GROUP BY visits""",
+)
+
+
+def visits_bucket(total_visits: Optional[int]) -> str:
+    for low, name in VISIT_BUCKETS:
+        if total_visits is not None and total_visits >= low:
+            return name
+    return FIRST_VISIT
+
+
+def _bucket(dimension: str, value) -> str:
+    value = getattr(value, "value", value)  # 요청 스키마의 str Enum이 그대로 대입된 경우
+    if dimension == "total_visits":
+        return visits_bucket(value)
+    if dimension == "chess_rating":
+        return value or UNRATED
+    return str(value)
+
+
+def user_buckets(values: Dict[str, object]) -> Iterable[Tuple[str, str]]:
+    """사용자 한 명이 속한 (dimension, bucket) 목록"""
+    yield DIMENSION_TOTAL, "all"
+    for dimension in DIMENSIONS:
+        yield dimension, _bucket(dimension, values.get(dimension))
+
+
+def _values(user: User, committed: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """
+    flush 후 값 (committed가 있으면 바뀌지 않은 컬럼은 그 값을 사용해 만료된 속성을 다시 읽지 않음)
+    """
+    state = inspect(user)
+    values = {}
+    for dimension in DIMENSIONS:
+        history = state.attrs[dimension].history
+        if history.added:
+            values[dimension] = history.added[0]
+        elif committed is not None:
+            values[dimension] = committed[dimension]
+        else:
+            values[dimension] = getattr(user, dimension)
+    return values
+
+
+def _previous_values(user: User) -> Optional[Dict[str, object]]:
+    """flush 전 DB 값 (바뀐 컬럼의 이전 값이 로드되지 않은 경우 None)"""
+    state = inspect(user)
+    values = {}
+    for dimension in DIMENSIONS:
+        history = state.attrs[dimension].history
+        if history.added and not history.deleted:
+            return None  # 커밋 후 만료된 속성에 바로 대입: 이전 값을 모름
+        values[dimension] = history.deleted[0] if history.deleted else getattr(user, dimension)
+    return values
+
+
+def _collect_deltas(session: Session, flush_context, instances):
+    deltas = session.info.setdefault("user_stats_deltas", Counter())
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, User):
+                deltas.update(user_buckets(_values(obj)))
+        for obj in session.deleted:
+            if isinstance(obj, User):
+                deltas.subtract(user_buckets(_previous_values(obj) or _values(obj)))
+
+        changed = [
+            obj for obj in session.dirty
+            if isinstance(obj, User) and obj not in session.deleted
+            and any(inspect(obj).attrs[dimension].history.has_changes() for dimension in DIMENSIONS)
+        ]
+        previous = {id(obj): _previous_values(obj) for obj in changed}
+        unknown = [obj.id for obj in changed if previous[id(obj)] is None]
+        if unknown:
+            # 이전 값을 모르는 사용자는 DB에서 한 번에 읽음
+            columns = [getattr(User, dimension) for dimension in DIMENSIONS]
+            rows = session.execute(select(User.id, *columns).where(User.id.in_(unknown)))
+            stored = {row[0]: dict(zip(DIMENSIONS, row[1:])) for row in rows}
+            for obj in changed:
+                if previous[id(obj)] is None:
+                    previous[id(obj)] = stored[obj.id]
+        for obj in changed:
+            deltas.subtract(user_buckets(previous[id(obj)]))
+            deltas.update(user_buckets(_values(obj, previous[id(obj)])))
+
+
+def _upsert(dialect_name: str, rows):
+    insert = postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+    statement = insert(UserStat).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[UserStat.dimension, UserStat.bucket],
+        set_={"count": UserStat.count + statement.excluded.count},
+    )
+
+
+def _apply_deltas(session: Session, flush_context):
+    deltas = session.info.pop("user_stats_deltas", None)
+    rows = [{"dimension": dimension, "bucket": bucket, "count": count}
+            for (dimension, bucket), count in sorted(deltas.items()) if count] if deltas else []
+    if rows:
+        connection = session.connection()
+        connection.execute(_upsert(connection.dialect.name, rows))
+
+
+def _discard_deltas(session: Session, previous_transaction=None):
+    session.info.pop("user_stats_deltas", None)
+
+
+event.listen(Session, "before_flush", _collect_deltas)
+event.listen(Session, "after_flush", _apply_deltas)
+# flush가 실패하면 after_flush가 호출되지 않으므로 롤백 때 변화량을 버림
+event.listen(Session, "after_soft_rollback", _discard_deltas)
+
+
+def rebuild(db: Session):
+    """users 전체를 다시 집계해 user_stats를 교체 (커밋 포함)"""
+    for sql in REBUILD_STATEMENTS:
+        db.execute(text(sql))
+    db.commit()
+
+
+def read_stats(db: Session) -> Dict[str, object]:
+    """
+    롤업 테이블에서 통계 조회 (작은 테이블 한 번 읽기)
+
+    Returns:
+        {"total": 회원 수, "gender": {값: 수}, "chess_experience": {...}, "chess_rating": {...}, "total_visits": {...}}
+    """
+    stats: Dict[str, object] = {"total": 0, **{dimension: {} for dimension in DIMENSIONS}}
+    rows = db.execute(
+        select(UserStat.dimension, UserStat.bucket, UserStat.count).order_by(UserStat.dimension, UserStat.bucket)
+    )
+    for dimension, bucket, count in rows:
+        if not count:
+            continue
+        if dimension == DIMENSION_TOTAL:
+            stats["total"] = count
+        elif dimension in stats:
+            stats[dimension][bucket] = count
+    return stats